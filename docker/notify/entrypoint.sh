@@ -33,7 +33,7 @@ END
 SERVICE_TYPE=${SERVICE_TYPE:-app}
 
 case "$SERVICE_TYPE" in
-  app|celery_worker|celery_beat|migration)
+  app|celery_worker|celery_beat|outbox_relay|migration)
     wait_for_postgres
     ;;
   flower)
@@ -48,6 +48,14 @@ esac
 # === Выполняем действия в зависимости от типа сервиса ===
 case "$SERVICE_TYPE" in
   app)
+    if [ "${APP_SERVER:-wsgi}" = "asgi" ]; then
+      echo "Старт Uvicorn (ASGI)"
+      exec uvicorn config.asgi:application \
+          --host "${GUNICORN_HOST}" \
+          --port "${GUNICORN_PORT}" \
+          --workers "${UVICORN_WORKERS:-3}" \
+          --no-access-log
+    fi
     echo "Старт Gunicorn"
     exec gunicorn config.wsgi:application \
         --bind "${GUNICORN_HOST}:${GUNICORN_PORT}" \
@@ -56,13 +64,32 @@ case "$SERVICE_TYPE" in
         --preload
     ;;
   celery_worker)
-    echo "Запуск Celery Worker"
-    exec celery -A config worker --loglevel=info --concurrency=1 --max-tasks-per-child=1
+    # По умолчанию воркер обслуживает служебные очереди и очереди всех включенных каналов
+    if [ -z "${CELERY_WORKER_QUEUES}" ]; then
+      CELERY_WORKER_QUEUES="${CELERY_QUEUE_ORCHESTRATE:-notify.orchestrate},${CELERY_QUEUE_HIGH:-notify.high}"
+      enabled_channels=${NOTIFY_ENABLED_CHANNELS:-email,telegram}
+      for channel in ${enabled_channels//,/ }; do
+        queue_variable="CELERY_QUEUE_${channel^^}"
+        CELERY_WORKER_QUEUES="${CELERY_WORKER_QUEUES},${!queue_variable:-notify.${channel}}"
+      done
+    fi
+    echo "Запуск Celery Worker (очереди: ${CELERY_WORKER_QUEUES}, пул: ${CELERY_WORKER_POOL:-prefork})"
+    exec celery -A config worker --loglevel=info \
+        --queues="${CELERY_WORKER_QUEUES}" \
+        --pool="${CELERY_WORKER_POOL:-prefork}" \
+        --concurrency="${CELERY_WORKER_CONCURRENCY:-1}" \
+        --prefetch-multiplier="${CELERY_WORKER_PREFETCH_MULTIPLIER:-4}" \
+        --hostname="${CELERY_WORKER_NAME:-worker}@%h" \
+        --max-tasks-per-child="${CELERY_WORKER_MAX_TASKS_PER_CHILD:-1000}"
     ;;
   celery_beat)
     echo "Запуск Celery Beat"
     exec celery -A config beat --loglevel=info --scheduler django_celery_beat.schedulers:DatabaseScheduler
     ;;
+  outbox_relay)
+    echo "Запуск публикации задач из outbox"
+    exec python3 manage.py relay_outbox
+    ;;
   flower)
     echo "Запуск Flower"
     exec celery -A config flower --port=${CELERY_FLOWER_PORT} --broker=${CELERY_BROKER_URL}
@@ -72,6 +99,8 @@ case "$SERVICE_TYPE" in
     python3 manage.py makemigrations --noinput
     echo "Выполнение миграций"
     python3 manage.py migrate --noinput
+    echo "Обслуживание секций лога доставки"
+    python3 manage.py maintain_partitions
     echo "Миграции выполнены успешно"
     ;;
 esac
\ No newline at end of file
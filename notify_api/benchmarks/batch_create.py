@@ -0,0 +1,78 @@
+"""
+Бенчмарк пакетного создания уведомлений.
+
+Сравнивает N запросов POST /api/notify/ с пакетами POST /api/notify/batch/
+и публикацию задач в брокер по одной (как .delay на каждое уведомление)
+с публикацией пачками через relay_outbox.
+
+    python benchmarks/batch_create.py --count 1000 --broker redis://localhost:6379/0
+"""
+
+import argparse
+import os
+
+from common import measure, print_table, setup_django
+
+URL = "/api/notify/"
+BATCH_URL = "/api/notify/batch/"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000, help="Количество уведомлений")
+    parser.add_argument("--recipients", type=int, default=2, help="Получателей в уведомлении")
+    parser.add_argument("--broker", default="memory://", help="URL брокера Celery")
+    args = parser.parse_args()
+    setup_django()
+
+    from django.conf import settings
+    from rest_framework.test import APIClient
+
+    from config.celery import app
+    from notify.constants import MAX_BATCH_SIZE
+    from notify.models import OutboxMessage
+    from notify.outbox import relay_outbox
+
+    # Celery читает CELERY_BROKER_URL из окружения при подключении, раньше настроек приложения
+    os.environ["CELERY_BROKER_URL"] = args.broker
+    client = APIClient()
+    items = [
+        {
+            "message": f"Сообщение {index % 10}",
+            "recipient": [f"user{index}.{number}@example.com" for number in range(args.recipients)],
+        }
+        for index in range(args.count)
+    ]
+
+    def create_single() -> None:
+        for item in items:
+            assert client.post(URL, item, format="json").status_code == 201
+
+    def create_batch() -> None:
+        for start in range(0, len(items), MAX_BATCH_SIZE):
+            assert client.post(BATCH_URL, items[start : start + MAX_BATCH_SIZE], format="json").status_code == 201
+
+    def publish_single() -> None:
+        messages = list(OutboxMessage.objects.order_by("id")[: args.count])
+        for message in messages:
+            app.tasks[message.task_name].apply_async(args=message.args, kwargs=message.kwargs, **message.options)
+        OutboxMessage.objects.filter(id__in=[message.id for message in messages]).delete()
+
+    def publish_batch() -> None:
+        while relay_outbox(settings.NOTIFY_OUTBOX_BATCH_SIZE):
+            pass
+
+    rows = []
+    for name, function in (
+        ("POST /api/notify/", create_single),
+        ("POST /api/notify/batch/", create_batch),
+        ("публикация по одной задаче", publish_single),
+        ("relay_outbox", publish_batch),
+    ):
+        elapsed, queries = measure(function)
+        rows.append([name, args.count, elapsed, round(args.count / elapsed), queries])
+    print_table(["сценарий", "уведомлений", "секунд", "в секунду", "запросов к БД"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import atexit
+import logging
+import os
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import django
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+PERCENTILES = (50, 90, 99)
+
+
+def setup_django(database: bool = True) -> None:
+    """
+    Настройка Django для бенчмарка.
+
+    Используются настройки тестов (config.settings_test): без POSTGRES_HOST -
+    SQLite в памяти. Таблицы создаются без миграций во временной тестовой БД,
+    которая удаляется при выходе, запросы выполняются тестовым клиентом DRF.
+    """
+    sys.path.insert(0, str(SRC))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings_test")
+    django.setup()
+    # Запись логов в файлы не относится к измеряемому пути
+    logging.disable(logging.INFO)
+    if database:
+        from django.apps import apps
+        from django.conf import settings
+        from django.db import connection
+        from django.test.utils import setup_test_environment
+
+        setup_test_environment()
+        # Как pytest --nomigrations: таблицы по моделям, миграции не хранятся в репозитории
+        settings.MIGRATION_MODULES = {config.label: None for config in apps.get_app_configs()}
+        name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, serialize=False)
+        atexit.register(connection.creation.destroy_test_db, name, verbosity=0)
+
+
+def measure(function: Callable[..., Any], *args: Any) -> tuple[float, int]:
+    """Время выполнения в секундах и количество запросов к БД."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - started
+    return elapsed, len(queries)
+
+
+def percentile(values: list[float], rank: int) -> float:
+    """Перцентиль отсортированного списка (nearest rank)."""
+    index = max(0, -(-len(values) * rank // 100) - 1)
+    return values[index]
+
+
+def print_table(headers: list[str], rows: list[list[Any]]) -> None:
+    """Вывод результатов таблицей с выравниванием по ширине колонок."""
+    cells = [headers, *([f"{value:.4f}" if isinstance(value, float) else str(value) for value in row] for row in rows)]
+    widths = [max(len(row[column]) for row in cells) for column in range(len(headers))]
+    for row in cells:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths, strict=True)))
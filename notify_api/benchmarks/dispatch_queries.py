@@ -0,0 +1,72 @@
+"""
+Бенчмарк запросов к БД при отправке уведомления.
+
+Для каждого числа получателей создает уведомление и измеряет количество
+запросов и время send_notification_task (захват, чтение получателей,
+разбиение на пачки, без запуска chord) и finalize_notification_task
+(логи доставки, статистика, статус). Число запросов не должно расти
+с числом получателей, кроме INSERT логов по BULK_CREATE_BATCH_SIZE строк.
+Индекс списка подавления читается из Redis.
+
+    python benchmarks/dispatch_queries.py --sizes 10 2500 100000 --redis redis://localhost:6379/0
+"""
+
+import argparse
+import os
+
+from common import measure, print_table, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 2500, 25000], help="Получателей в уведомлении")
+    parser.add_argument("--redis", default="redis://localhost:6379/0", help="URL Redis индекса подавления")
+    args = parser.parse_args()
+    os.environ["CELERY_BROKER_URL"] = args.redis
+    setup_django()
+
+    from django.utils import timezone
+
+    from notify import tasks
+    from notify.choices import RecipientTypeChoices
+    from notify.constants import BULK_CREATE_BATCH_SIZE
+    from notify.models import Notification, Recipient
+
+    # Пачки доставки не запускаются: измеряется только оркестрация
+    tasks.chord = lambda header: lambda callback: None
+
+    def measure_size(size: int) -> list:
+        notification = Notification.objects.create(message=f"Сообщение {size}", scheduled_for=timezone.now())
+        addresses = [f"+7999{index:07d}" for index in range(size)]
+        Recipient.objects.bulk_create(
+            (
+                Recipient(notification=notification, address=address, recipient_type=RecipientTypeChoices.SMS)
+                for address in addresses
+            ),
+            batch_size=BULK_CREATE_BATCH_SIZE,
+        )
+        dispatch, dispatch_queries = measure(tasks.send_notification_task, notification.id)
+        run_token = str(Notification.objects.values_list("run_token", flat=True).get(id=notification.id))
+        results = [tasks.build_chunk_result("sms", [tasks.build_outcome(address, 1, "", 10) for address in addresses])]
+        finalize, finalize_queries = measure(
+            tasks.finalize_notification_task, results, notification.id, None, run_token
+        )
+        per_recipient = (dispatch + finalize) * 1_000_000 / size
+        return [size, dispatch_queries, dispatch * 1000, finalize_queries, finalize * 1000, per_recipient]
+
+    rows = [measure_size(size) for size in args.sizes]
+    print_table(
+        [
+            "получателей",
+            "запросов отправки",
+            "отправка, мс",
+            "запросов финализации",
+            "финализация, мс",
+            "мкс/получатель",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Бенчмарк глубоких страниц списка уведомлений.
+
+Заполняет таблицу уведомлений и сравнивает время выборки страницы
+на разной глубине через KeysetPagination (как GET /api/notify/ по ссылке
+next) и через OFFSET с тем же порядком (created_at, id). Для проверки
+на PostgreSQL задайте переменные POSTGRES_*, таблицы создаются
+во временной тестовой БД.
+
+    python benchmarks/list_pages.py --rows 10000000 --depths 0 1000 10000 100000
+"""
+
+import argparse
+
+from common import measure, print_table, setup_django
+
+URL = "/api/notify/"
+INSERT_BATCH_SIZE = 10_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="Уведомлений в таблице")
+    parser.add_argument("--limit", type=int, default=50, help="Размер страницы")
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 100, 1000, 3000], help="Номера страниц")
+    args = parser.parse_args()
+    setup_django()
+
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from notify.models import Notification
+    from notify.pagination import KeysetPagination
+
+    for start in range(0, args.rows, INSERT_BATCH_SIZE):
+        Notification.objects.bulk_create(
+            Notification(message=f"Сообщение {index}")
+            for index in range(start, min(start + INSERT_BATCH_SIZE, args.rows))
+        )
+    queryset = Notification.objects.select_related("body")
+    ordered = queryset.order_by("-created_at", "-id")
+    factory = APIRequestFactory()
+
+    def keyset_page(cursor: str) -> None:
+        params = {"limit": args.limit, **({"cursor": cursor} if cursor else {})}
+        KeysetPagination(ordering=("created_at", "id")).paginate_queryset(queryset, Request(factory.get(URL, params)))
+
+    def offset_page(offset: int) -> None:
+        list(ordered[offset : offset + args.limit])
+
+    rows = []
+    for depth in args.depths:
+        offset = depth * args.limit
+        if offset >= args.rows:
+            continue
+        # Курсор страницы - позиция последней строки предыдущей страницы, вычисляется без замера
+        cursor = KeysetPagination(ordering=("created_at", "id"))._encode_cursor(ordered[offset - 1]) if offset else ""
+        keyset, _ = measure(keyset_page, cursor)
+        by_offset, _ = measure(offset_page, offset)
+        rows.append([depth, offset, keyset * 1000, by_offset * 1000])
+    print_table(["страница", "пропущено строк", "курсор, мс", "OFFSET, мс"], rows)
+
+
+if __name__ == "__main__":
+    main()
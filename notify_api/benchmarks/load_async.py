@@ -0,0 +1,67 @@
+"""
+Нагрузочный тест создания уведомлений.
+
+Отправляет --requests запросов не более чем по --concurrency одновременно
+и выводит запросов в секунду и перцентили задержки. Для сравнения
+синхронного и асинхронного пути запустите сервис с одинаковым числом
+процессов (GUNICORN_WORKERS / UVICORN_WORKERS) и CPU:
+
+    APP_SERVER=wsgi  ->  python benchmarks/load_async.py --url http://localhost:8000/api/notify/
+    APP_SERVER=asgi  ->  python benchmarks/load_async.py --url http://localhost:8000/api/notify/async/
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+from common import PERCENTILES, percentile, print_table
+
+
+async def run(url: str, requests: int, concurrency: int, recipients: int) -> tuple[float, list[float], Counter[int]]:
+    """Время прогона, задержки успешных запросов и количество ответов по статусам."""
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    counter = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for index in counter:
+            payload = {
+                "message": f"Нагрузочный тест {index % 10}",
+                "recipient": [f"load{index}.{number}@example.com" for number in range(recipients)],
+            }
+            started = time.perf_counter()
+            try:
+                response = await client.post(url, json=payload)
+            except httpx.HTTPError:
+                statuses[0] += 1
+                continue
+            statuses[response.status_code] += 1
+            if response.is_success:
+                latencies.append(time.perf_counter() - started)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, sorted(latencies), statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/api/notify/async/")
+    parser.add_argument("--requests", type=int, default=2000, help="Количество запросов")
+    parser.add_argument("--concurrency", type=int, default=50, help="Одновременных запросов")
+    parser.add_argument("--recipients", type=int, default=1, help="Получателей в уведомлении")
+    args = parser.parse_args()
+    elapsed, latencies, statuses = asyncio.run(run(args.url, args.requests, args.concurrency, args.recipients))
+    row: list = [args.url, args.requests, round(len(latencies) / elapsed)]
+    row += [percentile(latencies, rank) * 1000 if latencies else 0.0 for rank in PERCENTILES]
+    print_table(["url", "запросов", "успешных в секунду", *(f"p{rank}, мс" for rank in PERCENTILES)], [row])
+    print("Ответы по статусам (0 - ошибка соединения):", dict(sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Задержка доставки уведомлений высокого приоритета под массовой нагрузкой.
+
+Против запущенного сервиса (API, relay_outbox и воркеры всех очередей):
+сначала публикуется --bulk уведомлений обычного приоритета пакетами,
+затем каждые --interval секунд отправляются пробные уведомления высокого
+и обычного приоритета. Для каждого пробного уведомления измеряется время
+от создания до финального статуса (completed/failed) по GET /api/notify/{id}/.
+
+Получатели пробных и массовых уведомлений задаются параметрами, используйте
+тестовые адреса (например, SMTP заглушку или тестовый webhook).
+
+    python benchmarks/priority_latency.py --base-url http://localhost:8000 \\
+        --recipient qa@example.com --bulk 50000 --probes 50
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from common import PERCENTILES, percentile, print_table
+
+FINAL_STATUSES = ("completed", "failed")
+POLL_INTERVAL = 0.05
+
+
+async def publish_bulk(client: httpx.AsyncClient, count: int, batch_size: int, recipient: str) -> None:
+    """Публикация массовой нагрузки пакетами POST /api/notify/batch/."""
+    for start in range(0, count, batch_size):
+        items = [
+            {"message": f"Массовая рассылка {index}", "recipient": [recipient], "priority": "normal"}
+            for index in range(start, min(start + batch_size, count))
+        ]
+        response = await client.post("/api/notify/batch/", json=items)
+        response.raise_for_status()
+
+
+async def probe(client: httpx.AsyncClient, priority: str, recipient: str, timeout: float) -> float | None:
+    """Время от создания пробного уведомления до финального статуса, None - не дождались."""
+    started = time.perf_counter()
+    response = await client.post(
+        "/api/notify/", json={"message": f"Проверка {priority}", "recipient": [recipient], "priority": priority}
+    )
+    response.raise_for_status()
+    notification_id = response.json()["notification_id"]
+    while time.perf_counter() - started < timeout:
+        status = (await client.get(f"/api/notify/{notification_id}/")).json()["status"]
+        if status in FINAL_STATUSES:
+            return time.perf_counter() - started
+        await asyncio.sleep(POLL_INTERVAL)
+    return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, list[float | None]]:
+    """Задержки пробных уведомлений по приоритетам."""
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        await publish_bulk(client, args.bulk, args.batch_size, args.recipient)
+        probes = []
+        for _ in range(args.probes):
+            for priority in ("high", "normal"):
+                probes.append((priority, asyncio.create_task(probe(client, priority, args.recipient, args.timeout))))
+            await asyncio.sleep(args.interval)
+        latencies: dict[str, list[float | None]] = {"high": [], "normal": []}
+        for priority, task in probes:
+            latencies[priority].append(await task)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--recipient", required=True, help="Тестовый адрес получателя")
+    parser.add_argument("--bulk", type=int, default=10_000, help="Массовых уведомлений")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Уведомлений в пакете массовой нагрузки")
+    parser.add_argument("--probes", type=int, default=20, help="Пробных уведомлений каждого приоритета")
+    parser.add_argument("--interval", type=float, default=1.0, help="Интервал между пробами, секунд")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Ожидание финального статуса, секунд")
+    args = parser.parse_args()
+    latencies = asyncio.run(run(args))
+    rows = []
+    for priority, values in latencies.items():
+        done = sorted(value for value in values if value is not None)
+        row: list = [priority, len(done), len(values) - len(done)]
+        row += [percentile(done, rank) if done else 0.0 for rank in PERCENTILES]
+        rows.append(row)
+    print_table(["приоритет", "доставлено", "не дождались", *(f"p{rank}, с" for rank in PERCENTILES)], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Микробенчмарки разбора, валидации и рендеринга запроса создания уведомления.
+
+Для 1, 100 и 10 000 получателей сравнивает:
+- валидацию NotificationRequestSerializer с быстрым RecipientListField
+  и со стандартной проверкой элементов ListField через CharField,
+  отдельно - проверку адресов RecipientValidator;
+- разбор тела запроса ORJSONParser и стандартным JSONParser;
+- рендеринг ответа ORJSONRenderer и стандартным JSONRenderer.
+
+Схемы на msgspec или pydantic-core не используются: ошибки валидации
+пришлось бы воспроизводить вручную, чтобы ответы 400 совпадали с DRF,
+а основная стоимость валидации (проверка каждого адреса) от этого
+не меняется. Бенчмарк показывает, какая часть времени приходится
+на поля DRF, а какая - на проверку адресов.
+
+    python benchmarks/validation.py --sizes 1 100 10000
+"""
+
+import argparse
+import io
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from common import print_table, setup_django
+
+
+def per_call(function: Callable[[], Any]) -> float:
+    """Среднее время вызова в микросекундах."""
+    number, elapsed = timeit.Timer(function).autorange()
+    return elapsed / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000], help="Количество получателей")
+    args = parser.parse_args()
+    setup_django(database=False)
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.serializers import CharField, ListField
+
+    from notify.constants import MAX_LENGTH_ADDRESS
+    from notify.parsers import HAS_ORJSON, ORJSONParser
+    from notify.renderers import ORJSONRenderer
+    from notify.serializers import NotificationRequestSerializer, RecipientListField
+    from notify.validators import RecipientValidator
+
+    class DRFRecipientListField(RecipientListField):
+        """Список получателей с проверкой каждого элемента через CharField."""
+
+        run_child_validation = ListField.run_child_validation
+
+    class DRFRequestSerializer(NotificationRequestSerializer):
+        recipient = DRFRecipientListField(child=CharField(max_length=MAX_LENGTH_ADDRESS), allow_empty=False)
+
+    def measure_size(size: int) -> list[list]:
+        payload = {
+            "message": "Сообщение",
+            "recipient": [f"user{index}@example.com" if index % 2 else str(100_000 + index) for index in range(size)],
+        }
+        body = JSONRenderer().render(payload)
+        for serializer_class in (NotificationRequestSerializer, DRFRequestSerializer):
+            serializer = serializer_class(data=payload)
+            assert serializer.is_valid(), serializer.errors
+        cases: list[tuple[str, Callable[[], Any]]] = [
+            ("валидация RecipientListField", lambda: NotificationRequestSerializer(data=payload).is_valid()),
+            ("валидация ListField + CharField", lambda: DRFRequestSerializer(data=payload).is_valid()),
+            ("проверка адресов", lambda: RecipientValidator.validate_recipients(payload["recipient"])),
+            ("разбор JSONParser", lambda: JSONParser().parse(io.BytesIO(body))),
+            ("рендеринг JSONRenderer", lambda: JSONRenderer().render(payload)),
+        ]
+        if HAS_ORJSON:
+            cases += [
+                ("разбор ORJSONParser", lambda: ORJSONParser().parse(io.BytesIO(body))),
+                ("рендеринг ORJSONRenderer", lambda: ORJSONRenderer().render(payload)),
+            ]
+        return [[name, size, per_call(function)] for name, function in cases]
+
+    rows = [row for size in args.sizes for row in measure_size(size)]
+    print_table(["операция", "получателей", "мкс на вызов"], rows)
+    if not HAS_ORJSON:
+        print("orjson не установлен (poetry install --extras fast), ORJSONParser и ORJSONRenderer не измерены")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+from typing import Any
 
 from celery import Celery
 
@@ -7,14 +8,61 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 app = Celery("config")
 app.config_from_object("django.conf:settings", namespace="CELERY__")
 
+CHANNELS = ("email", "telegram", "sms", "webhook")
+
+
+def channel_queue(channel: str) -> str:
+    """Очередь задач доставки канала: CELERY_QUEUE_<КАНАЛ> или notify.<канал>."""
+    return os.getenv(f"CELERY_QUEUE_{channel.upper()}", f"notify.{channel}")
+
+
+def route_channel_task(name: str, args: Any, kwargs: Any, options: Any, task: Any = None, **kw: Any) -> dict | None:
+    """Маршрутизация задачи доставки в очередь ее канала."""
+    if name != "notify.tasks.send_channel_task" or not kwargs or "channel" not in kwargs:
+        return None
+    queue = channel_queue(kwargs["channel"])
+    return {"queue": queue, "routing_key": queue}
+
+
+QUEUE_ORCHESTRATE = os.getenv("CELERY_QUEUE_ORCHESTRATE", "notify.orchestrate")
+QUEUE_HIGH = os.getenv("CELERY_QUEUE_HIGH", "notify.high")
+
 app.conf.task_queues = {
-    "notify": {
+    queue: {
         "exchange": "notify",
-        "routing_key": "notify",
+        "routing_key": queue,
     }
+    for queue in (QUEUE_ORCHESTRATE, QUEUE_HIGH, *(channel_queue(channel) for channel in CHANNELS))
 }
-app.conf.task_default_queue = "notify"
+app.conf.task_default_queue = QUEUE_ORCHESTRATE
 app.conf.task_default_exchange = "notify"
-app.conf.task_default_routing_key = "notify"
+app.conf.task_default_routing_key = QUEUE_ORCHESTRATE
+# Уведомления высокого приоритета публикуются в QUEUE_HIGH явно, см. notify.tasks.priority_options
+app.conf.task_routes = (
+    route_channel_task,
+    {"notify.tasks.*": {"queue": QUEUE_ORCHESTRATE, "routing_key": QUEUE_ORCHESTRATE}},
+)
 
 app.autodiscover_tasks()
+
+
+@app.on_after_finalize.connect
+def setup_periodic_tasks(sender: Celery, **kwargs: Any) -> None:
+    """Регистрация периодических задач сервиса."""
+    from django.conf import settings
+
+    sender.add_periodic_task(
+        settings.NOTIFY_SCHEDULER_INTERVAL,
+        sender.signature("notify.tasks.dispatch_due_notifications_task"),
+        name="dispatch-due-notifications",
+    )
+    sender.add_periodic_task(
+        settings.NOTIFY_REAPER_INTERVAL,
+        sender.signature("notify.tasks.reap_stale_notifications_task"),
+        name="reap-stale-notifications",
+    )
+    sender.add_periodic_task(
+        settings.NOTIFY_PARTITION_MAINTENANCE_INTERVAL,
+        sender.signature("notify.tasks.maintain_partitions_task"),
+        name="maintain-partitions",
+    )
@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "drf_spectacular",
+    "django_filters",
     "django_celery_beat",
     "notify",
 ]
@@ -103,10 +104,10 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "notify.renderers.ORJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "notify.parsers.ORJSONParser",
     ],
 }
 
@@ -136,11 +137,44 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", "30"))
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+EMAIL_POOL_MAX_CONNECTIONS = int(os.getenv("EMAIL_POOL_MAX_CONNECTIONS", "2"))
+EMAIL_POOL_HEALTHCHECK_INTERVAL = int(os.getenv("EMAIL_POOL_HEALTHCHECK_INTERVAL", "30"))
+EMAIL_POOL_MAX_IDLE = int(os.getenv("EMAIL_POOL_MAX_IDLE", "240"))
+EMAIL_PER_RECIPIENT = os.getenv("EMAIL_PER_RECIPIENT", "True").lower() == "true"
 
 EMAIL_TASK_RETRY_DELAY = 60
 EMAIL_TASK_STATE_TIMEOUT = 600
 EMAIL_TASK_MAX_RETRIES = 3
-EMAIL_TASK_LOCK_TIMEOUT = 300
+
+NOTIFY_CHUNK_SIZE = int(os.getenv("NOTIFY_CHUNK_SIZE", "500"))
+NOTIFY_ENABLED_CHANNELS = [
+    channel.strip() for channel in os.getenv("NOTIFY_ENABLED_CHANNELS", "email,telegram").split(",") if channel.strip()
+]
+NOTIFY_CHANNEL_BACKENDS = {
+    "email": os.getenv("NOTIFY_EMAIL_BACKEND", "notify.mail.EmailChannel"),
+    "telegram": os.getenv("NOTIFY_TELEGRAM_BACKEND", "notify.telegram.TelegramChannel"),
+    "sms": os.getenv("NOTIFY_SMS_BACKEND", "notify.sms.ConsoleSMSChannel"),
+    "webhook": os.getenv("NOTIFY_WEBHOOK_BACKEND", "notify.webhook.WebhookChannel"),
+}
+NOTIFY_SCHEDULER_INTERVAL = int(os.getenv("NOTIFY_SCHEDULER_INTERVAL", "10"))
+NOTIFY_SCHEDULER_BATCH_SIZE = int(os.getenv("NOTIFY_SCHEDULER_BATCH_SIZE", "500"))
+NOTIFY_SCHEDULER_MAX_BATCHES = int(os.getenv("NOTIFY_SCHEDULER_MAX_BATCHES", "20"))
+NOTIFY_QUEUED_TIMEOUT = int(os.getenv("NOTIFY_QUEUED_TIMEOUT", "600"))
+NOTIFY_LEASE_TIMEOUT = int(os.getenv("NOTIFY_LEASE_TIMEOUT", "3600"))
+NOTIFY_REAPER_INTERVAL = int(os.getenv("NOTIFY_REAPER_INTERVAL", "60"))
+NOTIFY_OUTBOX_BATCH_SIZE = int(os.getenv("NOTIFY_OUTBOX_BATCH_SIZE", "500"))
+NOTIFY_OUTBOX_POLL_INTERVAL = float(os.getenv("NOTIFY_OUTBOX_POLL_INTERVAL", "0.5"))
+NOTIFY_BODY_COMPRESS_MIN_SIZE = int(os.getenv("NOTIFY_BODY_COMPRESS_MIN_SIZE", "256"))
+NOTIFY_PARTITION_MAINTENANCE_INTERVAL = int(os.getenv("NOTIFY_PARTITION_MAINTENANCE_INTERVAL", "3600"))
+NOTIFY_PARTITIONS_AHEAD = int(os.getenv("NOTIFY_PARTITIONS_AHEAD", "3"))
+NOTIFY_LOG_RETENTION_DAYS = int(os.getenv("NOTIFY_LOG_RETENTION_DAYS", "180"))
+NOTIFY_LOG_ARCHIVE_DIR = os.getenv("NOTIFY_LOG_ARCHIVE_DIR", str(BASE_DIR / "archive"))
+
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+IDEMPOTENCY_DELIVERY_TTL = int(os.getenv("IDEMPOTENCY_DELIVERY_TTL", "604800"))
+NOTIFY_DELIVERY_CLAIM_TTL = int(os.getenv("NOTIFY_DELIVERY_CLAIM_TTL", "600"))
+NOTIFY_SUPPRESSION_WINDOW = int(os.getenv("NOTIFY_SUPPRESSION_WINDOW", "0"))
+NOTIFY_SUPPRESSION_CACHE_TTL = int(os.getenv("NOTIFY_SUPPRESSION_CACHE_TTL", "3600"))
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
@@ -150,6 +184,24 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+TELEGRAM_CONCURRENCY = int(os.getenv("TELEGRAM_CONCURRENCY", "20"))
+# Лимит действует на процесс воркера: при нескольких процессах лимит бота делится между ними
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))
+TELEGRAM_PER_CHAT_INTERVAL = float(os.getenv("TELEGRAM_PER_CHAT_INTERVAL", "1"))
+TELEGRAM_TIMEOUT = float(os.getenv("TELEGRAM_TIMEOUT", "10"))
+TELEGRAM_MAX_THROTTLE_RETRIES = int(os.getenv("TELEGRAM_MAX_THROTTLE_RETRIES", "5"))
+
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+WEBHOOK_HTTP2 = os.getenv("WEBHOOK_HTTP2", "True").lower() == "true"
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "100"))
+WEBHOOK_PER_HOST_CONCURRENCY = int(os.getenv("WEBHOOK_PER_HOST_CONCURRENCY", "10"))
+WEBHOOK_BACKOFF_BASE = float(os.getenv("WEBHOOK_BACKOFF_BASE", "5"))
+WEBHOOK_BACKOFF_MAX = float(os.getenv("WEBHOOK_BACKOFF_MAX", "600"))
+# Пустой список - любой хост с публичным адресом, иначе только перечисленные (".example.com" - с поддоменами)
+WEBHOOK_ALLOWED_HOSTS = [host.strip() for host in os.getenv("WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()]
+WEBHOOK_ALLOW_PRIVATE = os.getenv("WEBHOOK_ALLOW_PRIVATE", "False").lower() == "true"
 
 
 LOG_DIR = BASE_DIR / "logs"
@@ -0,0 +1,12 @@
+import os
+
+os.environ.setdefault("CELERY_BROKER_URL", "redis://localhost:6379/0")
+
+from .settings import *  # noqa: E402, F403
+
+# Без POSTGRES_HOST тесты выполняются на SQLite, тесты PostgreSQL пропускаются
+if not os.getenv("POSTGRES_HOST"):
+    DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+
+NOTIFY_ENABLED_CHANNELS = ["email", "telegram", "sms", "webhook"]
+REST_FRAMEWORK = {**REST_FRAMEWORK, "TEST_REQUEST_DEFAULT_FORMAT": "json"}  # noqa: F405
@@ -0,0 +1,20 @@
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any
+
+_local = threading.local()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Event loop потока воркера, живущий между задачами."""
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _local.loop = loop
+    return loop
+
+
+def run_sync[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Выполнение корутины из синхронной задачи на постоянном event loop."""
+    return get_event_loop().run_until_complete(coro)
@@ -0,0 +1,52 @@
+import zlib
+from collections.abc import Iterable
+from functools import lru_cache
+
+from django.conf import settings
+
+from .constants import BODY_CACHE_SIZE
+from .idempotency import content_hash
+from .models import MessageBody
+
+
+def encode_body(text: str) -> tuple[bytes, bool]:
+    """
+    Содержимое текста для хранения и признак сжатия.
+
+    Тексты от NOTIFY_BODY_COMPRESS_MIN_SIZE байт сжимаются zlib,
+    если сжатие уменьшает размер (0 - не сжимать).
+    """
+    content = text.encode()
+    min_size = settings.NOTIFY_BODY_COMPRESS_MIN_SIZE
+    if min_size and len(content) >= min_size:
+        compressed = zlib.compress(content)
+        if len(compressed) < len(content):
+            return compressed, True
+    return content, False
+
+
+def store_bodies(texts: Iterable[str]) -> dict[str, str]:
+    """
+    Сохранение текстов сообщений по хешу содержимого.
+
+    Уже сохраненные тексты не перезаписываются (INSERT ... ON CONFLICT DO NOTHING),
+    пакет текстов сохраняется одним запросом. Возвращает хеш каждого текста.
+    """
+    digests = {text: content_hash(text) for text in texts}
+    bodies = []
+    for text, digest in digests.items():
+        content, compressed = encode_body(text)
+        bodies.append(MessageBody(digest=digest, content=content, compressed=compressed, size=len(text.encode())))
+    MessageBody.objects.bulk_create(bodies, ignore_conflicts=True)
+    return digests
+
+
+@lru_cache(maxsize=BODY_CACHE_SIZE)
+def get_body(digest: str) -> str:
+    """
+    Текст сообщения по хешу из LRU кеша процесса воркера.
+
+    Текст по хешу неизменяем, поэтому запись кеша не устаревает:
+    пачки одной рассылки читают текст из БД один раз на процесс.
+    """
+    return str(MessageBody.objects.get(digest=digest).text)
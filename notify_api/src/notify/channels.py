@@ -0,0 +1,109 @@
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_backends: dict[str, "ChannelBackend"] = {}
+
+
+class DeliveryError(Exception):
+    """
+    Ошибка доставки сообщения получателю.
+
+    retryable - временная ошибка, отправка повторяется,
+    permanent - постоянная ошибка адреса, адрес попадает в список подавления,
+    retry_after - через сколько секунд адрес можно повторить (пауза endpoint'а, Retry-After).
+    """
+
+    def __init__(
+        self,
+        message: str,
+        retryable: bool = False,
+        permanent: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+        self.permanent = permanent
+        self.retry_after = retry_after
+
+
+class RenderedMessage(NamedTuple):
+    """Сообщение получателю, отрисованное по шаблону."""
+
+    body: str
+    subject: str = ""
+    html: str = ""
+
+
+class ChannelBackend(ABC):
+    """
+    Бэкенд канала доставки.
+
+    Создается один раз на процесс воркера и держит долгоживущие клиенты
+    (пулы HTTP и SMTP соединений) между задачами.
+    """
+
+    @abstractmethod
+    def send_many(self, message: str, addresses: list[str], scope: str = "") -> dict[str, int | DeliveryError]:
+        """
+        Отправка сообщения пачке адресов.
+
+        scope - область доставки (уведомление и запуск), одинаковая при повторах
+        задачи: из нее и адреса канал может построить идентификатор события.
+        Возвращает по каждому адресу длительность отправки в миллисекундах или ошибку.
+        """
+
+    def send_rendered(
+        self,
+        messages: dict[str, RenderedMessage],
+        scope: str = "",
+    ) -> dict[str, int | DeliveryError]:
+        """
+        Отправка персональных сообщений: адрес -> сообщение.
+
+        По умолчанию адреса с одинаковым текстом отправляются одной пачкой
+        через send_many, тема и HTML версия не используются.
+        """
+        groups: dict[str, list[str]] = defaultdict(list)
+        for address, message in messages.items():
+            groups[message.body].append(address)
+        results: dict[str, int | DeliveryError] = {}
+        for body, addresses in groups.items():
+            results.update(self.send_many(body, addresses, scope))
+        return results
+
+
+def enabled_channels() -> list[str]:
+    """Включенные каналы доставки."""
+    return list(settings.NOTIFY_ENABLED_CHANNELS)
+
+
+def get_backend(channel: str) -> ChannelBackend:
+    """
+    Бэкенд канала, загружаемый при первом обращении.
+
+    Модуль бэкенда импортируется только для включенного канала,
+    экземпляр кешируется на время жизни процесса.
+    """
+    backend = _backends.get(channel)
+    if backend is not None:
+        return backend
+    with _lock:
+        if channel not in _backends:
+            if channel not in settings.NOTIFY_ENABLED_CHANNELS:
+                raise ImproperlyConfigured(f"Канал доставки {channel} не включен")
+            path = settings.NOTIFY_CHANNEL_BACKENDS.get(channel)
+            if not path:
+                raise ImproperlyConfigured(f"Для канала доставки {channel} не задан бэкенд")
+            _backends[channel] = import_string(path)()
+            logger.info(f"Загружен бэкенд канала {channel}: {path}")
+        return _backends[channel]
@@ -13,16 +13,26 @@ class StatusChoices(models.TextChoices):
     """Выбор статуса уведомления."""
 
     PENDING = "pending", "Ожидает отправки"
+    QUEUED = "queued", "В очереди на отправку"
     PROCESSING = "processing", "В процессе отправки"
     COMPLETED = "completed", "Завершено"
     FAILED = "failed", "Ошибка"
 
 
+class PriorityChoices(models.TextChoices):
+    """Выбор приоритета уведомления."""
+
+    HIGH = "high", "Высокий (транзакционные)"
+    NORMAL = "normal", "Обычный (массовые)"
+
+
 class RecipientTypeChoices(models.TextChoices):
     """Выбор способа уведомления."""
 
     EMAIL = "email", "Email"
     TELEGRAM = "telegram", "Telegram"
+    SMS = "sms", "SMS"
+    WEBHOOK = "webhook", "Webhook"
 
 
 class StatusDeliveryChoices(models.TextChoices):
@@ -30,3 +40,5 @@ class StatusDeliveryChoices(models.TextChoices):
 
     SUCCESS = "success", "Успешно"
     FAILED = "failed", "Ошибка"
+    SKIPPED = "skipped", "Пропущено (повтор в окне подавления)"
+    SUPPRESSED = "suppressed", "Пропущено (адрес в списке подавления)"
@@ -11,10 +11,32 @@ DELAY_MAPPING = {
 }
 MIN_LENGTH_MESSAGE = 1
 MAX_LENGTH_MESSAGE = 1024
-MAX_LENGTH_ADDRESS = 150
+MAX_LENGTH_ADDRESS = 500
 MIN_VALUE_DELAY = 0
 MAX_VALUE_DELAY = 2
+MIN_RECURRENCE_INTERVAL = 60
+MAX_LENGTH_CRON = 100
+MAX_BATCH_SIZE = 1000
+MAX_LENGTH_IDEMPOTENCY_KEY = 255
+MAX_LENGTH_TASK_NAME = 255
+MAX_LENGTH_TEMPLATE_NAME = 100
+MAX_LENGTH_SUBJECT = 255
+MAX_LENGTH_TEMPLATE_BODY = 65536
+TEMPLATE_CACHE_SIZE = 256
+MAX_LENGTH_BODY_DIGEST = 32
+BODY_CACHE_SIZE = 1024
+BULK_CREATE_BATCH_SIZE = 1000
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STATS_INTERVALS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+DEFAULT_STATS_PERIOD = timedelta(hours=1)
+MAX_STATS_BUCKETS = 1440
 
 # Константы для валидации
 EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
-TELEGRAM_ID_REGEX = re.compile(r"^\d+$")
+PHONE_REGEX = re.compile(r"^\+[1-9]\d{7,14}$")
+WEBHOOK_SCHEMES = ("https", "http")
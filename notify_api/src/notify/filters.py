@@ -0,0 +1,53 @@
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django_filters import CharFilter, ChoiceFilter, FilterSet, IsoDateTimeFilter
+
+from .choices import PriorityChoices, RecipientTypeChoices, StatusChoices, StatusDeliveryChoices
+from .models import DeliveryLog, Notification, Recipient
+from .validators import RecipientValidator
+
+
+class NotificationFilter(FilterSet):
+    """Фильтры списка уведомлений."""
+
+    status = ChoiceFilter(choices=StatusChoices.choices, help_text="Статус уведомления")
+    priority = ChoiceFilter(choices=PriorityChoices.choices, help_text="Приоритет уведомления")
+    created_after = IsoDateTimeFilter(field_name="created_at", lookup_expr="gte", help_text="Создано не раньше")
+    created_before = IsoDateTimeFilter(field_name="created_at", lookup_expr="lt", help_text="Создано раньше")
+    recipient = CharFilter(method="filter_recipient", help_text="Адрес получателя")
+
+    class Meta:
+        model = Notification
+        fields = ["status", "priority", "created_after", "created_before", "recipient"]
+
+    def filter_recipient(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        """
+        Уведомления с указанным получателем без дублирования строк.
+
+        Адрес приводится к форме, в которой он сохраняется при создании,
+        тип получателя определяется по адресу, поэтому поиск идет
+        по индексу (recipient_type, address). Нераспознанный адрес
+        не совпадает ни с одним получателем.
+        """
+        try:
+            recipient_type = RecipientValidator.validate_recipient(value)
+        except ValidationError:
+            return queryset.none()
+        address = RecipientValidator.normalize_recipient(value, recipient_type)
+        recipients = Recipient.objects.filter(recipient_type=recipient_type, address=address)
+        return queryset.filter(id__in=recipients.values("notification_id"))
+
+
+class DeliveryLogFilter(FilterSet):
+    """Фильтры логов доставки уведомления."""
+
+    status = ChoiceFilter(choices=StatusDeliveryChoices.choices, help_text="Статус отправки")
+    recipient_type = ChoiceFilter(
+        field_name="recipient__recipient_type",
+        choices=RecipientTypeChoices.choices,
+        help_text="Тип получателя",
+    )
+
+    class Meta:
+        model = DeliveryLog
+        fields = ["status", "recipient_type"]
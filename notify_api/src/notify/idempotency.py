@@ -0,0 +1,172 @@
+import hashlib
+import json
+from typing import Any
+
+from django.conf import settings
+from redis import Redis
+
+redis_client = Redis.from_url(settings.CELERY_BROKER_URL)
+
+REQUEST_KEY_PREFIX = "idempotency:request"
+DELIVERY_KEY_PREFIX = "idempotency:delivery"
+SUPPRESSION_KEY_PREFIX = "idempotency:suppression"
+STATE_PROCESSING = "processing"
+STATE_DONE = "done"
+MARKER_SENDING = b"sending"
+MARKER_SENT = b"sent"
+
+
+def content_hash(*parts: Any) -> str:
+    """Стабильный между процессами хеш содержимого (blake2b)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+class IdempotencyConflictError(Exception):
+    """Ключ идемпотентности уже используется."""
+
+
+class IdempotencyStore:
+    """
+    Хранилище ключей идемпотентности запросов в Redis.
+
+    Первый запрос с ключом занимает его, повторный запрос с тем же телом
+    получает сохраненный ответ в течение IDEMPOTENCY_TTL секунд.
+    """
+
+    def __init__(self, client: Redis, ttl: int) -> None:
+        self.client = client
+        self.ttl = ttl
+
+    def _key(self, idempotency_key: str) -> str:
+        return f"{REQUEST_KEY_PREFIX}:{content_hash(idempotency_key)}"
+
+    def begin(self, idempotency_key: str, fingerprint: str) -> dict | None:
+        """
+        Занятие ключа перед обработкой запроса.
+
+        Возвращает сохраненный ответ, если запрос уже выполнен, иначе None.
+        """
+        key = self._key(idempotency_key)
+        state = json.dumps({"state": STATE_PROCESSING, "fingerprint": fingerprint})
+        if self.client.set(key, state, nx=True, ex=self.ttl):
+            return None
+        stored = self.client.get(key)
+        if stored is None:
+            return self.begin(idempotency_key, fingerprint)
+        record = json.loads(stored)
+        if record["fingerprint"] != fingerprint:
+            raise IdempotencyConflictError("Ключ идемпотентности использован с другим телом запроса")
+        if record["state"] != STATE_DONE:
+            raise IdempotencyConflictError("Запрос с этим ключом идемпотентности уже обрабатывается")
+        return dict(record["response"])
+
+    def complete(self, idempotency_key: str, fingerprint: str, response: dict) -> None:
+        """Сохранение ответа выполненного запроса."""
+        record = {"state": STATE_DONE, "fingerprint": fingerprint, "response": response}
+        self.client.set(self._key(idempotency_key), json.dumps(record, default=str), ex=self.ttl)
+
+    def release(self, idempotency_key: str) -> None:
+        """Освобождение ключа после неуспешной обработки."""
+        self.client.delete(self._key(idempotency_key))
+
+
+class DeliveryMarkers:
+    """
+    Маркеры доставки получателям для отправки ровно один раз.
+
+    Маркер ставится атомарно (SET NX) перед отправкой и подтверждается после
+    успеха, поэтому повторная доставка задачи брокером или параллельный
+    воркер не отправят сообщение получателю второй раз. Маркер отправки
+    живет claim_ttl секунд, чтобы упавший воркер не блокировал получателя.
+    """
+
+    def __init__(self, client: Redis, ttl: int, claim_ttl: int) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.claim_ttl = claim_ttl
+
+    def _key(self, scope: str, address: str) -> str:
+        return f"{DELIVERY_KEY_PREFIX}:{scope}:{content_hash(address)}"
+
+    def claim(self, scope: str, addresses: list[str]) -> tuple[list[str], list[str], list[str]]:
+        """
+        Захват получателей перед отправкой.
+
+        Возвращает захваченных, уже получивших сообщение и отправляемых другим воркером.
+        """
+        pipeline = self.client.pipeline(transaction=False)
+        for address in addresses:
+            pipeline.set(self._key(scope, address), MARKER_SENDING, nx=True, ex=self.claim_ttl)
+        claimed_flags = pipeline.execute()
+        busy = [address for address, claimed in zip(addresses, claimed_flags, strict=True) if not claimed]
+        if not busy:
+            return addresses, [], []
+        pipeline = self.client.pipeline(transaction=False)
+        for address in busy:
+            pipeline.get(self._key(scope, address))
+        markers = dict(zip(busy, pipeline.execute(), strict=True))
+        claimed = [address for address in addresses if address not in markers]
+        sent = [address for address in busy if markers[address] == MARKER_SENT]
+        in_flight = [address for address in busy if markers[address] != MARKER_SENT]
+        return claimed, sent, in_flight
+
+    def confirm(self, scope: str, addresses: list[str]) -> None:
+        """Подтверждение успешной отправки."""
+        if not addresses:
+            return
+        pipeline = self.client.pipeline(transaction=False)
+        for address in addresses:
+            pipeline.set(self._key(scope, address), MARKER_SENT, ex=self.ttl)
+        pipeline.execute()
+
+    def release(self, scope: str, addresses: list[str]) -> None:
+        """Снятие маркеров неуспешной отправки, чтобы повтор мог их захватить."""
+        if addresses:
+            self.client.delete(*(self._key(scope, address) for address in addresses))
+
+
+class SuppressionWindow:
+    """
+    Окно подавления повторной отправки одного и того же сообщения получателю.
+
+    Получатель, которому сообщение с тем же содержимым уже отправлялось в
+    течение window секунд, пропускается даже в другом уведомлении.
+    При window = 0 подавление выключено.
+    """
+
+    def __init__(self, client: Redis, window: int) -> None:
+        self.client = client
+        self.window = window
+
+    def _key(self, content_key: str, address: str) -> str:
+        return f"{SUPPRESSION_KEY_PREFIX}:{content_key}:{content_hash(address)}"
+
+    def acquire(self, content_key: str, addresses: list[str]) -> tuple[list[str], list[str]]:
+        """Отметка получателей в окне: возвращает разрешенных и подавленных."""
+        if not self.window or not addresses:
+            return addresses, []
+        pipeline = self.client.pipeline(transaction=False)
+        for address in addresses:
+            pipeline.set(self._key(content_key, address), 1, nx=True, ex=self.window)
+        acquired = pipeline.execute()
+        allowed = [address for address, ok in zip(addresses, acquired, strict=True) if ok]
+        suppressed = [address for address, ok in zip(addresses, acquired, strict=True) if not ok]
+        return allowed, suppressed
+
+    def release(self, content_key: str, addresses: list[str]) -> None:
+        """Снятие отметок получателей, которым отправка не удалась."""
+        if self.window and addresses:
+            self.client.delete(*(self._key(content_key, address) for address in addresses))
+
+
+idempotency_store = IdempotencyStore(redis_client, settings.IDEMPOTENCY_TTL)
+delivery_markers = DeliveryMarkers(
+    redis_client,
+    settings.IDEMPOTENCY_DELIVERY_TTL,
+    settings.NOTIFY_DELIVERY_CLAIM_TTL,
+)
+suppression_window = SuppressionWindow(redis_client, settings.NOTIFY_SUPPRESSION_WINDOW)
@@ -0,0 +1,273 @@
+import logging
+import smtplib
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .channels import ChannelBackend, DeliveryError, RenderedMessage
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+PERMANENT_SMTP_CODE = 500
+EMAIL_SUBJECT = "Уведомление"
+
+
+class SMTPConnectionPool:
+    """Пул SMTP соединений на время жизни процесса воркера."""
+
+    def __init__(self, max_connections: int, healthcheck_interval: int, max_idle: int) -> None:
+        self.max_connections = max_connections
+        self.healthcheck_interval = healthcheck_interval
+        self.max_idle = max_idle
+        self._idle: deque[tuple[BaseEmailBackend, float]] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def _open(self) -> BaseEmailBackend:
+        """Открытие нового соединения через бэкенд Django."""
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        logger.debug("Открыто новое SMTP соединение")
+        return connection
+
+    def _close(self, connection: BaseEmailBackend) -> None:
+        """Закрытие соединения без выброса ошибок."""
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug(f"Ошибка закрытия SMTP соединения: {e}")
+
+    def _is_alive(self, connection: BaseEmailBackend, last_used: float) -> bool:
+        """Проверка простаивающего соединения командой NOOP."""
+        idle = time.monotonic() - last_used
+        if idle > self.max_idle:
+            return False
+        if idle < self.healthcheck_interval:
+            return True
+        smtp = getattr(connection, "connection", None)
+        if smtp is None:
+            return True
+        try:
+            status, _ = smtp.noop()
+        except (smtplib.SMTPException, OSError):
+            return False
+        return bool(status == 250)
+
+    def acquire(self) -> BaseEmailBackend:
+        """Получение живого соединения из пула или открытие нового."""
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    item = self._idle.pop() if self._idle else None
+                if item is None:
+                    return self._open()
+                connection, last_used = item
+                if self._is_alive(connection, last_used):
+                    return connection
+                logger.debug("SMTP соединение не прошло проверку, переподключение")
+                self._close(connection)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection: BaseEmailBackend, broken: bool = False) -> None:
+        """Возврат соединения в пул, сломанные соединения закрываются."""
+        try:
+            if broken:
+                self._close(connection)
+            else:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Generator[BaseEmailBackend, None, None]:
+        """
+        Context manager для работы с соединением из пула.
+
+        После ответа сервера с ошибкой SMTP соединение возвращается в пул,
+        после обрыва и любой другой ошибки (например, ssl.SSLError) закрывается.
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        except smtplib.SMTPException as e:
+            self.release(connection, broken=isinstance(e, RECONNECT_ERRORS))
+            raise
+        except Exception:
+            self.release(connection, broken=True)
+            raise
+        else:
+            self.release(connection)
+
+    def send_messages(self, messages: Sequence[EmailMessage]) -> int:
+        """
+        Отправка сообщений в рамках одной SMTP сессии с переподключением при обрыве.
+
+        Сообщения отправляются по одному, после обрыва повторно отправляются
+        только сообщения, которые сервер еще не принял.
+        """
+        accepted = 0
+        sent = 0
+        try:
+            with self.connection() as connection:
+                for message in messages:
+                    sent += connection.send_messages([message]) or 0
+                    accepted += 1
+                return sent
+        except RECONNECT_ERRORS as e:
+            logger.warning(
+                f"SMTP соединение оборвано после {accepted} из {len(messages)} сообщений, повторная попытка: {e}"
+            )
+        with self.connection() as connection:
+            for message in messages[accepted:]:
+                sent += connection.send_messages([message]) or 0
+        return sent
+
+    def send_each(self, messages: Sequence[EmailMessage]) -> list[tuple[str, int, bool]]:
+        """
+        Отправка каждого сообщения отдельной транзакцией в одной SMTP сессии.
+
+        Возвращает по каждому сообщению текст ошибки (пустая строка - успех),
+        длительность отправки в миллисекундах и признак постоянной ошибки
+        (сервер отклонил всех получателей с кодом 5xx).
+        После обрыва соединения или другой ошибки сокета (OSError, например ssl.SSLError)
+        оставшиеся сообщения помечаются ошибкой, а соединение закрывается.
+        """
+        results = []
+        broken = False
+        connection = self.acquire()
+        try:
+            for message in messages:
+                if broken:
+                    results.append(("SMTP соединение оборвано", 0, False))
+                    continue
+                started = time.monotonic()
+                error = ""
+                permanent = False
+                try:
+                    connection.send_messages([message])
+                except RECONNECT_ERRORS as e:
+                    broken = True
+                    error = str(e) or e.__class__.__name__
+                except smtplib.SMTPRecipientsRefused as e:
+                    error = str(e) or e.__class__.__name__
+                    permanent = all(code >= PERMANENT_SMTP_CODE for code, _ in e.recipients.values())
+                except smtplib.SMTPException as e:
+                    error = str(e) or e.__class__.__name__
+                except OSError as e:
+                    broken = True
+                    error = str(e) or e.__class__.__name__
+                results.append((error, int((time.monotonic() - started) * 1000), permanent))
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(connection, broken=broken)
+        return results
+
+    def close_all(self) -> None:
+        """Закрытие всех простаивающих соединений."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection, _ in idle:
+            self._close(connection)
+
+
+smtp_pool = SMTPConnectionPool(
+    max_connections=settings.EMAIL_POOL_MAX_CONNECTIONS,
+    healthcheck_interval=settings.EMAIL_POOL_HEALTHCHECK_INTERVAL,
+    max_idle=settings.EMAIL_POOL_MAX_IDLE,
+)
+
+
+@worker_process_shutdown.connect
+def close_smtp_pool(**kwargs: Any) -> None:
+    """Закрытие SMTP соединений при остановке процесса воркера."""
+    smtp_pool.close_all()
+
+
+class EmailChannel(ChannelBackend):
+    """
+    Канал email через пул SMTP соединений процесса.
+
+    В режиме EMAIL_PER_RECIPIENT каждый адрес получает отдельное письмо в общей
+    SMTP сессии, иначе одно письмо отправляется всем адресам пачки
+    (при отправке по шаблону - всем адресам с одинаковым сообщением).
+    """
+
+    def __init__(self, subject: str = EMAIL_SUBJECT) -> None:
+        self.subject = subject
+        self.pool = smtp_pool
+
+    def _build(self, message: str, addresses: list[str], subject: str = "", html: str = "") -> EmailMultiAlternatives:
+        email = EmailMultiAlternatives(
+            subject=subject or self.subject,
+            body=message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=addresses,
+        )
+        if html:
+            email.attach_alternative(html, "text/html")
+        return email
+
+    def _send_each(self, emails: dict[str, EmailMultiAlternatives]) -> dict[str, int | DeliveryError]:
+        """Отправка отдельного письма каждому адресу в общей SMTP сессии."""
+        addresses = list(emails)
+        try:
+            results = self.pool.send_each(list(emails.values()))
+        except Exception as e:
+            logger.error(f"Ошибка отправки email -> {addresses}: {e}")
+            return {address: DeliveryError(str(e), retryable=True) for address in addresses}
+        return {
+            address: DeliveryError(error, retryable=not permanent, permanent=permanent) if error else latency_ms
+            for address, (error, latency_ms, permanent) in zip(addresses, results, strict=True)
+        }
+
+    def _send_shared(self, email: EmailMultiAlternatives) -> dict[str, int | DeliveryError]:
+        """Отправка одного письма всем его адресам."""
+        started = time.monotonic()
+        try:
+            self.pool.send_messages([email])
+        except Exception as e:
+            logger.error(f"Ошибка отправки email -> {email.to}: {e}")
+            return {address: DeliveryError(str(e), retryable=True) for address in email.to}
+        latency_ms = int((time.monotonic() - started) * 1000)
+        return dict.fromkeys(email.to, latency_ms)
+
+    def send_many(self, message: str, addresses: list[str], scope: str = "") -> dict[str, int | DeliveryError]:
+        if settings.EMAIL_PER_RECIPIENT:
+            return self._send_each({address: self._build(message, [address]) for address in addresses})
+        return self._send_shared(self._build(message, addresses))
+
+    def send_rendered(
+        self,
+        messages: dict[str, RenderedMessage],
+        scope: str = "",
+    ) -> dict[str, int | DeliveryError]:
+        if settings.EMAIL_PER_RECIPIENT:
+            return self._send_each(
+                {
+                    address: self._build(message.body, [address], message.subject, message.html)
+                    for address, message in messages.items()
+                }
+            )
+        groups: dict[RenderedMessage, list[str]] = defaultdict(list)
+        for address, message in messages.items():
+            groups[message].append(address)
+        results: dict[str, int | DeliveryError] = {}
+        for message, addresses in groups.items():
+            results.update(self._send_shared(self._build(message.body, addresses, message.subject, message.html)))
+        return results
@@ -0,0 +1,30 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from notify.partitions import maintain_partitions
+
+
+class Command(BaseCommand):
+    """Обслуживание секций лога доставки."""
+
+    help = "Секционирует лог доставки по времени, создает будущие секции и удаляет секции старше срока хранения"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--ahead", type=int, default=settings.NOTIFY_PARTITIONS_AHEAD)
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.NOTIFY_LOG_RETENTION_DAYS,
+            help="Срок хранения лога доставки в днях, 0 - хранить бессрочно",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=settings.NOTIFY_LOG_ARCHIVE_DIR,
+            help="Каталог архива удаляемых секций, пустое значение - удалять без архива",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        result = maintain_partitions(options["ahead"], options["retention_days"], options["archive_dir"])
+        self.stdout.write(f"Создано секций: {len(result['created'])}, удалено секций: {len(result['dropped'])}")
@@ -0,0 +1,42 @@
+import signal
+import time
+from types import FrameType
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from notify.outbox import relay_outbox
+
+
+class Command(BaseCommand):
+    """Процесс публикации задач из outbox в брокер."""
+
+    help = "Публикует задачи из таблицы outbox в брокер Celery"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=settings.NOTIFY_OUTBOX_BATCH_SIZE)
+        parser.add_argument("--poll-interval", type=float, default=settings.NOTIFY_OUTBOX_POLL_INTERVAL)
+        parser.add_argument("--once", action="store_true", help="Опубликовать накопленные задачи и завершиться")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        batch_size = options["batch_size"]
+        self.stdout.write("Запуск публикации задач из outbox")
+        while self.running:
+            try:
+                published = relay_outbox(batch_size)
+            except Exception as e:
+                self.stderr.write(f"Ошибка публикации задач из outbox: {e}")
+                published = 0
+            if options["once"] and published < batch_size:
+                break
+            if published < batch_size:
+                time.sleep(options["poll_interval"])
+        self.stdout.write("Публикация задач из outbox остановлена")
+
+    def stop(self, signum: int, frame: FrameType | None) -> None:
+        """Завершение после публикации текущей пачки."""
+        self.running = False
@@ -1,17 +1,154 @@
+import zlib
+
 from django.core.validators import MaxLengthValidator, MinLengthValidator
 from django.db import models
+from django.utils import timezone
+
+from .choices import DelayChoices, PriorityChoices, RecipientTypeChoices, StatusChoices, StatusDeliveryChoices
+from .constants import (
+    MAX_LENGTH_ADDRESS,
+    MAX_LENGTH_BODY_DIGEST,
+    MAX_LENGTH_CRON,
+    MAX_LENGTH_MESSAGE,
+    MAX_LENGTH_SUBJECT,
+    MAX_LENGTH_TASK_NAME,
+    MAX_LENGTH_TEMPLATE_NAME,
+    MIN_LENGTH_MESSAGE,
+)
+
+
+class MessageTemplate(models.Model):
+    """
+    Модель версии шаблона сообщения.
+
+    Версия не изменяется после создания: правка шаблона создает новую версию,
+    поэтому скомпилированный шаблон кешируется воркерами по id версии.
+    """
+
+    name = models.CharField(
+        max_length=MAX_LENGTH_TEMPLATE_NAME,
+        verbose_name="Имя шаблона",
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Версия",
+    )
+    subject = models.CharField(
+        max_length=MAX_LENGTH_SUBJECT,
+        blank=True,
+        verbose_name="Тема",
+        help_text="Тема сообщения (шаблон)",
+    )
+    body = models.TextField(
+        verbose_name="Текст",
+        help_text="Текст сообщения (шаблон Django)",
+    )
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Варианты по каналам",
+        help_text="Варианты по каналам: {канал: {subject, body, html}}",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Создано",
+    )
+
+    class Meta:
+        verbose_name = "Шаблон сообщения"
+        verbose_name_plural = "Шаблоны сообщений"
+        ordering = ["name", "-version"]
+        constraints = [
+            models.UniqueConstraint(fields=["name", "version"], name="unique_message_template_version"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} v{self.version}"
+
+    def variant(self, channel: str) -> dict[str, str]:
+        """Тема, текст и HTML версия шаблона для канала с откатом на общие тему и текст."""
+        variant = self.variants.get(channel, {})
+        return {
+            "subject": variant.get("subject", self.subject),
+            "body": variant.get("body", self.body),
+            "html": variant.get("html", ""),
+        }
+
+
+class MessageBody(models.Model):
+    """
+    Модель текста сообщения, адресуемого хешем содержимого.
+
+    Одинаковый текст хранится один раз для всех уведомлений,
+    задачи доставки передают только хеш.
+    """
+
+    digest = models.CharField(
+        max_length=MAX_LENGTH_BODY_DIGEST,
+        primary_key=True,
+        verbose_name="Хеш текста",
+        help_text="blake2b хеш текста сообщения",
+    )
+    content = models.BinaryField(
+        verbose_name="Содержимое",
+        help_text="Текст в UTF-8, сжатый zlib при compressed",
+    )
+    compressed = models.BooleanField(
+        default=False,
+        verbose_name="Сжато",
+    )
+    size = models.PositiveIntegerField(
+        verbose_name="Размер текста, байт",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Создано",
+    )
+
+    class Meta:
+        verbose_name = "Текст сообщения"
+        verbose_name_plural = "Тексты сообщений"
+
+    def __str__(self) -> str:
+        return f"Текст {self.digest}"
 
-from .choices import DelayChoices, RecipientTypeChoices, StatusChoices, StatusDeliveryChoices
-from .constants import MAX_LENGTH_ADDRESS, MAX_LENGTH_MESSAGE, MIN_LENGTH_MESSAGE
+    @property
+    def text(self) -> str:
+        content = bytes(self.content)
+        return (zlib.decompress(content) if self.compressed else content).decode()
 
 
 class Notification(models.Model):
     """Модель для хранения уведомлений."""
 
     message = models.TextField(
+        blank=True,
         validators=[MinLengthValidator(MIN_LENGTH_MESSAGE), MaxLengthValidator(MAX_LENGTH_MESSAGE)],
         verbose_name="Текст сообщения",
-        help_text="Текст сообщения",
+        help_text="Текст сообщения уведомлений, созданных до хранения текстов в MessageBody",
+    )
+    body = models.ForeignKey(
+        MessageBody,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="notifications",
+        verbose_name="Текст",
+        help_text="Текст сообщения, пустой при отправке по шаблону",
+    )
+    template = models.ForeignKey(
+        MessageTemplate,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="notifications",
+        verbose_name="Шаблон",
+    )
+    context = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Переменные шаблона",
+        help_text="Общие переменные шаблона для всех получателей",
     )
     status = models.CharField(
         choices=StatusChoices.choices,
@@ -25,6 +162,12 @@ class Notification(models.Model):
         verbose_name="Задержка отправки",
         help_text="Задержка отправки",
     )
+    priority = models.CharField(
+        choices=PriorityChoices.choices,
+        default=PriorityChoices.NORMAL,
+        verbose_name="Приоритет",
+        help_text="Приоритет: высокий обслуживается отдельной очередью и воркером",
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Создано",
@@ -34,6 +177,59 @@ class Notification(models.Model):
         blank=True,
         verbose_name="Запланировано на",
     )
+    recurrence_interval = models.DurationField(
+        null=True,
+        blank=True,
+        verbose_name="Интервал повторения",
+        help_text="Интервал между повторными отправками",
+    )
+    recurrence_cron = models.CharField(
+        max_length=MAX_LENGTH_CRON,
+        blank=True,
+        verbose_name="Расписание повторения",
+        help_text="Cron выражение из пяти полей",
+    )
+    recurrence_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Повторять до",
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Захвачено до",
+        help_text="Окончание аренды уведомления в очереди или в обработке",
+    )
+    run_token = models.UUIDField(
+        null=True,
+        blank=True,
+        verbose_name="Токен запуска",
+        help_text="Идентификатор захвата уведомления воркером, финализация записывает результаты только своего запуска",
+    )
+    recipients_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Получателей",
+    )
+    sent_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Отправлено",
+        help_text="Успешных доставок за все запуски",
+    )
+    failed_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Ошибок",
+        help_text="Неуспешных доставок за все запуски",
+    )
+    skipped_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Пропущено",
+        help_text="Получателей, пропущенных окном повторов или списком подавления",
+    )
+    pending_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Ожидают отправки",
+        help_text="Получателей текущего запуска без результата доставки",
+    )
 
     class Meta:
         verbose_name = "Уведомление"
@@ -41,12 +237,21 @@ class Notification(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["created_at", "id"]),
             models.Index(fields=["scheduled_for", "status"]),
+            models.Index(fields=["status", "locked_until"]),
         ]
 
     def __str__(self) -> str:
         return f"Уведомление #{self.id} - {self.status}"
 
+    @property
+    def text(self) -> str:
+        """Текст сообщения из MessageBody или из поля message старых уведомлений."""
+        if self.body_id:
+            return str(self.body.text)
+        return str(self.message)
+
 
 class Recipient(models.Model):
     """Модель получателей уведомления."""
@@ -66,6 +271,12 @@ class Recipient(models.Model):
         verbose_name="Тип получателя",
         help_text="Тип получателя",
     )
+    context = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name="Переменные шаблона",
+        help_text="Персональные переменные шаблона получателя",
+    )
 
     class Meta:
         verbose_name = "Получатель"
@@ -79,7 +290,12 @@ class Recipient(models.Model):
 
 
 class DeliveryLog(models.Model):
-    """Модель логирования отправки уведомлений."""
+    """
+    Модель логирования отправки уведомлений.
+
+    В PostgreSQL таблица секционируется по sent_at помесячно
+    (notify.partitions), первичный ключ в БД - (id, sent_at).
+    """
 
     recipient = models.ForeignKey(
         Recipient,
@@ -97,8 +313,18 @@ class DeliveryLog(models.Model):
         blank=True,
         verbose_name="Сообщение об ошибке",
     )
+    attempt = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name="Номер попытки",
+        help_text="Номер попытки, на которой получен результат",
+    )
+    latency_ms = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Длительность отправки, мс",
+    )
     sent_at = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
         verbose_name="Время отправки",
     )
 
@@ -106,6 +332,113 @@ class DeliveryLog(models.Model):
         verbose_name = "Лог доставки"
         verbose_name_plural = "Логи доставки"
         ordering = ["-sent_at"]
+        indexes = [
+            models.Index(fields=["sent_at"]),
+            models.Index(fields=["status", "sent_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"Лог #{self.id} - {self.status}"
+
+
+class SuppressedRecipient(models.Model):
+    """Модель списка подавления: адреса с постоянной ошибкой доставки."""
+
+    address = models.CharField(
+        max_length=MAX_LENGTH_ADDRESS,
+        verbose_name="Адрес получателя",
+    )
+    recipient_type = models.CharField(
+        choices=RecipientTypeChoices.choices,
+        verbose_name="Тип получателя",
+        help_text="Тип получателя",
+    )
+    reason = models.TextField(
+        blank=True,
+        verbose_name="Причина",
+        help_text="Ошибка, после которой адрес добавлен в список",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Добавлено",
+    )
+
+    class Meta:
+        verbose_name = "Подавленный получатель"
+        verbose_name_plural = "Подавленные получатели"
+        constraints = [
+            models.UniqueConstraint(fields=["recipient_type", "address"], name="unique_suppressed_recipient"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.recipient_type}: {self.address}"
+
+
+class OutboxMessage(models.Model):
+    """Модель исходящих задач, ожидающих публикации в брокер."""
+
+    task_name = models.CharField(
+        max_length=MAX_LENGTH_TASK_NAME,
+        verbose_name="Имя задачи",
+    )
+    args = models.JSONField(
+        default=list,
+        verbose_name="Позиционные аргументы",
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        verbose_name="Именованные аргументы",
+    )
+    options = models.JSONField(
+        default=dict,
+        verbose_name="Параметры публикации",
+        help_text="Параметры apply_async, например очередь",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Создано",
+    )
+
+    class Meta:
+        verbose_name = "Исходящая задача"
+        verbose_name_plural = "Исходящие задачи"
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"Задача #{self.id} - {self.task_name}"
+
+
+class DeliveryStats(models.Model):
+    """Модель поминутной статистики доставки по каналам и статусам."""
+
+    bucket = models.DateTimeField(
+        verbose_name="Минута",
+        help_text="Начало минуты отправки",
+    )
+    channel = models.CharField(
+        choices=RecipientTypeChoices.choices,
+        verbose_name="Канал",
+    )
+    status = models.CharField(
+        choices=StatusDeliveryChoices.choices,
+        verbose_name="Статус отправки",
+    )
+    deliveries = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Доставок",
+    )
+    latency_sum_ms = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Суммарная длительность отправки, мс",
+    )
+
+    class Meta:
+        verbose_name = "Статистика доставки"
+        verbose_name_plural = "Статистика доставки"
+        ordering = ["-bucket"]
+        constraints = [
+            models.UniqueConstraint(fields=["bucket", "channel", "status"], name="unique_delivery_stats_bucket"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.bucket:%Y-%m-%d %H:%M} {self.channel} {self.status}: {self.deliveries}"
@@ -1,6 +1,18 @@
-from drf_spectacular.utils import OpenApiExample, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse
 
-from .serializers import NotificationResponseSerializer
+from .choices import PriorityChoices, StatusChoices, StatusDeliveryChoices
+from .constants import MAX_PAGE_SIZE
+from .serializers import (
+    DeliveryLogListSerializer,
+    MessageTemplateListSerializer,
+    MessageTemplateSerializer,
+    NotificationBatchResponseSerializer,
+    NotificationListSerializer,
+    NotificationResponseSerializer,
+    NotificationStatusSerializer,
+    StatsResponseSerializer,
+)
 
 # Настройки сваггера
 NOTIFY_SETTINGS = {
@@ -8,6 +20,102 @@ NOTIFY_SETTINGS = {
     "description": "Микросервис для отправки уведомлений по email и Telegram",
 }
 
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name="Idempotency-Key",
+    type=str,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description="Ключ идемпотентности запроса: повтор с тем же ключом не создает уведомление повторно",
+)
+
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        name="cursor",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Курсор следующей страницы из поля next",
+    ),
+    OpenApiParameter(
+        name="limit",
+        type=int,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description=f"Размер страницы, не более {MAX_PAGE_SIZE}",
+    ),
+]
+
+NOTIFY_LIST_PARAMETERS = [
+    OpenApiParameter(
+        name="status",
+        type=str,
+        enum=StatusChoices.values,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Статус уведомления",
+    ),
+    OpenApiParameter(
+        name="priority",
+        type=str,
+        enum=PriorityChoices.values,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Приоритет уведомления",
+    ),
+    OpenApiParameter(
+        name="created_after",
+        type=OpenApiTypes.DATETIME,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Создано не раньше",
+    ),
+    OpenApiParameter(
+        name="created_before",
+        type=OpenApiTypes.DATETIME,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Создано раньше",
+    ),
+    OpenApiParameter(
+        name="recipient",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Адрес получателя",
+    ),
+    *PAGINATION_PARAMETERS,
+]
+
+NOTIFY_LOGS_PARAMETERS = [
+    OpenApiParameter(
+        name="status",
+        type=str,
+        enum=StatusDeliveryChoices.values,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Статус отправки",
+    ),
+    OpenApiParameter(
+        name="recipient_type",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Тип получателя",
+    ),
+    *PAGINATION_PARAMETERS,
+]
+
+TEMPLATE_LIST_PARAMETERS = [
+    OpenApiParameter(
+        name="name",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Имя шаблона",
+    ),
+    *PAGINATION_PARAMETERS,
+]
+
 # Response схемы
 NOTIFY_201 = OpenApiResponse(
     response=NotificationResponseSerializer,
@@ -43,6 +151,92 @@ NOTIFY_400 = OpenApiResponse(
     ],
 )
 
+NOTIFY_409 = OpenApiResponse(
+    description="Ключ идемпотентности уже используется",
+    examples=[
+        OpenApiExample(
+            name="Запрос с ключом еще обрабатывается",
+            value={
+                "error": "Idempotency conflict",
+                "details": "Запрос с этим ключом идемпотентности уже обрабатывается",
+            },
+            response_only=True,
+        )
+    ],
+)
+
+NOTIFY_404 = OpenApiResponse(
+    description="Уведомление не найдено",
+    examples=[
+        OpenApiExample(
+            name="Уведомление не найдено",
+            value={"error": "Not found"},
+            response_only=True,
+        )
+    ],
+)
+
+NOTIFY_LIST_200 = OpenApiResponse(
+    response=NotificationListSerializer,
+    description="Страница уведомлений, следующая страница - по ссылке next",
+)
+
+NOTIFY_DETAIL_200 = OpenApiResponse(
+    response=NotificationStatusSerializer,
+    description="Статус уведомления",
+    examples=[
+        OpenApiExample(
+            name="Уведомление отправлено",
+            value={
+                "notification_id": 1,
+                "message": "Текст уведомления",
+                "status": "completed",
+                "priority": "normal",
+                "created_at": "2024-01-15T14:30:00Z",
+                "scheduled_for": "2024-01-15T14:30:00Z",
+                "recipients_count": 2,
+                "sent_count": 1,
+                "failed_count": 1,
+                "skipped_count": 0,
+                "pending_count": 0,
+            },
+            response_only=True,
+        )
+    ],
+)
+
+NOTIFY_LOGS_200 = OpenApiResponse(
+    response=DeliveryLogListSerializer,
+    description="Страница лога доставки, следующая страница - по ссылке next",
+)
+
+NOTIFY_STATS_200 = OpenApiResponse(
+    response=StatsResponseSerializer,
+    description="Статистика доставки за период",
+    examples=[
+        OpenApiExample(
+            name="Статистика за минуту",
+            value={
+                "since": "2024-01-15T14:00:00Z",
+                "until": "2024-01-15T14:01:00Z",
+                "interval": "minute",
+                "totals": {"success": 98, "failed": 2},
+                "buckets": [
+                    {
+                        "bucket": "2024-01-15T14:00:00Z",
+                        "channel": "email",
+                        "counts": {"success": 98, "failed": 2},
+                        "total": 100,
+                        "success_rate": 0.98,
+                        "avg_latency_ms": 120,
+                    }
+                ],
+            },
+            response_only=True,
+        )
+    ],
+)
+
 NOTIFY_500 = OpenApiResponse(
     description="Внутренняя ошибка сервера при создании уведомления",
     examples=[
@@ -54,6 +248,99 @@ NOTIFY_500 = OpenApiResponse(
     ],
 )
 
+NOTIFY_BATCH_201 = OpenApiResponse(
+    response=NotificationBatchResponseSerializer,
+    description="Все уведомления пакета созданы и запланированы",
+    examples=[
+        OpenApiExample(
+            name="Успешное создание пакета",
+            value={
+                "accepted": 1,
+                "rejected": 0,
+                "results": [
+                    {
+                        "index": 0,
+                        "status": "scheduled",
+                        "notification_id": 1,
+                        "scheduled_for": "2024-01-15T14:30:00Z",
+                        "recipients_count": 2,
+                    }
+                ],
+            },
+            response_only=True,
+        )
+    ],
+)
+
+NOTIFY_BATCH_207 = OpenApiResponse(
+    response=NotificationBatchResponseSerializer,
+    description="Часть уведомлений пакета отклонена при валидации",
+    examples=[
+        OpenApiExample(
+            name="Частичное создание пакета",
+            value={
+                "accepted": 1,
+                "rejected": 1,
+                "results": [
+                    {
+                        "index": 0,
+                        "status": "scheduled",
+                        "notification_id": 1,
+                        "scheduled_for": "2024-01-15T14:30:00Z",
+                        "recipients_count": 2,
+                    },
+                    {
+                        "index": 1,
+                        "status": "rejected",
+                        "errors": {"message": ["Это поле обязательно."]},
+                    },
+                ],
+            },
+            response_only=True,
+        )
+    ],
+)
+
+TEMPLATE_EXAMPLE = {
+    "id": 3,
+    "name": "booking-confirmed",
+    "version": 2,
+    "subject": "Бронирование {{ booking_id }}",
+    "body": "{{ name }}, ваше бронирование {{ booking_id }} подтверждено",
+    "variants": {
+        "email": {"html": "<p>{{ name }}, ваше бронирование <b>{{ booking_id }}</b> подтверждено</p>"},
+        "telegram": {"body": "<b>{{ name }}</b>, бронирование {{ booking_id }} подтверждено"},
+    },
+    "created_at": "2024-01-15T14:30:00Z",
+}
+
+TEMPLATE_201 = OpenApiResponse(
+    response=MessageTemplateSerializer,
+    description="Создана новая версия шаблона",
+    examples=[OpenApiExample(name="Версия шаблона", value=TEMPLATE_EXAMPLE, response_only=True)],
+)
+
+TEMPLATE_LIST_200 = OpenApiResponse(
+    response=MessageTemplateListSerializer,
+    description="Страница версий шаблонов",
+    examples=[
+        OpenApiExample(
+            name="Список версий шаблонов",
+            value={"next": None, "results": [TEMPLATE_EXAMPLE]},
+            response_only=True,
+        )
+    ],
+)
+
+TEMPLATE_EXM = [
+    OpenApiExample(
+        "Пример шаблона",
+        value={key: TEMPLATE_EXAMPLE[key] for key in ("name", "subject", "body", "variants")},
+        request_only=True,
+        description="Шаблон с HTML версией письма и вариантом для Telegram",
+    ),
+]
+
 NOTIFY_EXM = [
     OpenApiExample(
         "Пример уведомления",
@@ -64,5 +351,48 @@ NOTIFY_EXM = [
         },
         request_only=True,
         description="Пример отправки email и Telegram уведомления",
+    ),
+    OpenApiExample(
+        "Пример повторяющегося уведомления",
+        value={
+            "message": "Ежедневная сводка",
+            "recipient": ["client@example.com"],
+            "send_at": "2024-01-15T09:00:00+03:00",
+            "cron": "0 9 * * *",
+            "until": "2024-02-15T09:00:00+03:00",
+        },
+        request_only=True,
+        description="Отправка в точное время с повтором по cron расписанию",
+    ),
+    OpenApiExample(
+        "Пример уведомления по шаблону",
+        value={
+            "template": "booking-confirmed",
+            "context": {"booking_id": "A-1024"},
+            "recipient": ["client@example.com", "123456789"],
+            "recipient_context": {"client@example.com": {"name": "Анна"}, "123456789": {"name": "Иван"}},
+        },
+        request_only=True,
+        description="Персональные сообщения по последней версии шаблона",
+    ),
+]
+
+NOTIFY_BATCH_EXM = [
+    OpenApiExample(
+        "Пример пакета уведомлений",
+        value=[
+            {
+                "message": "Ваше бронирование подтверждено",
+                "recipient": ["client@example.com", "123456789"],
+                "delay": 0,
+            },
+            {
+                "message": "Напоминание о бронировании",
+                "recipient": ["client@example.com"],
+                "delay": 2,
+            },
+        ],
+        request_only=True,
+        description="Пакет уведомлений в виде JSON массива (или NDJSON потока)",
     )
 ]
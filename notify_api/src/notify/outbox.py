@@ -0,0 +1,38 @@
+import logging
+
+from celery import current_app
+from django.db import transaction
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def relay_outbox(batch_size: int) -> int:
+    """
+    Публикация пачки исходящих задач в брокер.
+
+    Строки выбираются через SELECT ... FOR UPDATE SKIP LOCKED, публикуются
+    через одно соединение с брокером и удаляются в той же транзакции.
+    При ошибке брокера транзакция откатывается и пачка публикуется повторно,
+    поэтому задачи должны быть идемпотентными.
+    """
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .order_by("id")
+            .only("id", "task_name", "args", "kwargs", "options")[:batch_size]
+        )
+        if not messages:
+            return 0
+        with current_app.producer_or_acquire() as producer:
+            for message in messages:
+                current_app.tasks[message.task_name].apply_async(
+                    args=message.args,
+                    kwargs=message.kwargs,
+                    producer=producer,
+                    **message.options,
+                )
+        OutboxMessage.objects.filter(id__in=[message.id for message in messages]).delete()
+    logger.info(f"Опубликовано задач из outbox: {len(messages)}")
+    return len(messages)
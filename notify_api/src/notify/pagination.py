@@ -0,0 +1,94 @@
+import base64
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная пагинация по ключу сортировки.
+
+    Следующая страница выбирается условием по значениям последней строки
+    (created_at, id) < (курсор), а не OFFSET, поэтому запрос глубоких страниц
+    читает из индекса столько же строк, сколько первая страница.
+    Поля сортировки убывают, последнее поле должно быть уникальным.
+    """
+
+    ordering: Sequence[str] = ("created_at", "id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = DEFAULT_PAGE_SIZE
+    max_page_size = MAX_PAGE_SIZE
+
+    def __init__(self, ordering: Sequence[str] | None = None) -> None:
+        if ordering is not None:
+            self.ordering = ordering
+        self.next_cursor: str | None = None
+        self.request: Request | None = None
+
+    def _get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def _decode_cursor(self, queryset: QuerySet, cursor: str) -> list[Any]:
+        """Разбор курсора в значения полей сортировки."""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            fields = [queryset.model._meta.get_field(name) for name in self.ordering]
+            if len(values) != len(fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(fields, values, strict=True)]
+        except Exception as e:
+            raise NotFound("Некорректный курсор") from e
+
+    def _encode_cursor(self, instance: Model) -> str:
+        values = [getattr(instance, name) for name in self.ordering]
+        position = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value for value in values])
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def _after(self, values: list[Any]) -> Q:
+        """
+        Условие строк после курсора: f1 <= v1 AND ((f1 < v1) OR (f1 = v1 AND f2 < v2) ...).
+
+        Отдельное условие f1 <= v1 дает планировщику границу диапазона по индексу.
+        """
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            equal = dict(zip(self.ordering[:index], values, strict=False))
+            condition |= Q(**equal, **{f"{name}__lt": values[index]})
+        return Q(**{f"{self.ordering[0]}__lte": values[0]}) & condition
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> list:
+        self.request = request
+        page_size = self._get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self._after(self._decode_cursor(queryset, cursor)))
+        queryset = queryset.order_by(*(f"-{name}" for name in self.ordering))
+        page = list(queryset[: page_size + 1])
+        self.next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            self.next_cursor = self._encode_cursor(page[-1])
+        return page
+
+    def get_next_link(self) -> str | None:
+        if self.next_cursor is None or self.request is None:
+            return None
+        link: str = replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+        return link
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
@@ -0,0 +1,346 @@
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import DeliveryLog, Recipient
+
+logger = logging.getLogger(__name__)
+
+PARTITION_LOCK_ID = 7_310_023
+PARTITION_LOCK_TIMEOUT = "10s"
+LEGACY_SUFFIX = "_legacy"
+# Запас до границы секции прежних строк: запись не упирается в CHECK на стыке месяцев
+LEGACY_MARGIN = timedelta(days=1)
+ARCHIVE_FETCH_SIZE = 5000
+ARCHIVE_COLUMNS = (
+    "id",
+    "notification_id",
+    "address",
+    "recipient_type",
+    "status",
+    "error_message",
+    "attempt",
+    "latency_ms",
+    "sent_at",
+)
+BOUND_REGEX = re.compile(r"FROM \((?:MINVALUE|'(?P<lower>[^']+)')\) TO \((?:MAXVALUE|'(?P<upper>[^']+)')\)")
+UNIQUE_REGEX = re.compile(r"^(?P<head>UNIQUE (?:NULLS NOT DISTINCT )?\()(?P<columns>[^)]*)\)(?P<tail>.*)$")
+KEY_REGEX = re.compile(r"^(?P<kind>PRIMARY KEY|UNIQUE) \((?P<columns>[^)]*)\)$")
+
+
+class Partition(NamedTuple):
+    """Секция таблицы и ее границы по времени (None - без границы)."""
+
+    name: str
+    lower: datetime | None
+    upper: datetime | None
+
+
+def quote(name: str) -> str:
+    return str(connection.ops.quote_name(name))
+
+
+def month_start(value: datetime, months: int = 0) -> datetime:
+    """Начало месяца в UTC со сдвигом на months месяцев."""
+    value = value.astimezone(UTC)
+    month = value.year * 12 + value.month - 1 + months
+    return datetime(month // 12, month % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(table: str, lower: datetime) -> str:
+    return f"{table}_p{lower:%Y%m}"
+
+
+def is_partitioned(table: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def list_partitions(table: str) -> list[Partition]:
+    """Секции таблицы в порядке границ."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(%s)",
+            [table],
+        )
+        rows = cursor.fetchall()
+    partitions = []
+    for name, bound in rows:
+        match = BOUND_REGEX.search(bound)
+        if match is None:
+            continue
+        lower, upper = match.group("lower"), match.group("upper")
+        partitions.append(
+            Partition(
+                name,
+                datetime.fromisoformat(lower) if lower else None,
+                datetime.fromisoformat(upper) if upper else None,
+            )
+        )
+    return sorted(partitions, key=lambda p: p.lower or datetime.min.replace(tzinfo=UTC))
+
+
+def partition_key_unique(definition: str) -> str:
+    """Уникальное ограничение секционированной таблицы должно включать ключ секционирования sent_at."""
+    match = UNIQUE_REGEX.match(definition)
+    if match is None or "sent_at" in match.group("columns").split(", "):
+        return definition
+    return f"{match.group('head')}{match.group('columns')}, sent_at){match.group('tail')}"
+
+
+def validate_upper_bound(table: str, check: str, upper: datetime) -> None:
+    """
+    Проверенное ограничение CHECK (sent_at < upper) на таблице.
+
+    Ограничение добавляется как NOT VALID (без чтения таблицы) и проверяется
+    отдельно под SHARE UPDATE EXCLUSIVE, которая не блокирует запись.
+    По нему ATTACH PARTITION пропускает проверку строк под блокировкой.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT set_config('lock_timeout', %s, true)", [PARTITION_LOCK_TIMEOUT])
+        cursor.execute(f"ALTER TABLE {quote(table)} DROP CONSTRAINT IF EXISTS {quote(check)}")
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(check)} "
+            "CHECK (sent_at IS NOT NULL AND sent_at < %s) NOT VALID",
+            [upper.isoformat()],
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(table)} VALIDATE CONSTRAINT {quote(check)}")
+
+
+def build_partition_key_indexes(table: str) -> list[tuple[str, str, str]]:
+    """
+    Уникальные индексы (столбцы ключа, sent_at) для первичного ключа и уникальных ограничений таблицы.
+
+    Индексы строятся CREATE UNIQUE INDEX CONCURRENTLY без блокировки записи,
+    индекс, оставшийся невалидным после прерванного построения, пересоздается.
+    CONCURRENTLY нельзя выполнить внутри транзакции, в ней индекс строится
+    обычным CREATE UNIQUE INDEX. Возвращает (ограничение, вид ключа, индекс).
+    """
+    concurrently = "" if connection.in_atomic_block else " CONCURRENTLY"
+    if not concurrently:
+        logger.warning(f"Индексы ключа секционирования {table} строятся в транзакции с блокировкой записи")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u')",
+            [table],
+        )
+        constraints = cursor.fetchall()
+    built = []
+    for name, definition in constraints:
+        match = KEY_REGEX.match(definition)
+        if match is None or "sent_at" in match.group("columns").split(", "):
+            continue
+        index = f"{name[:48]}_sent_at"
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", [index])
+            row = cursor.fetchone()
+            if row is not None and not row[0]:
+                cursor.execute(f"DROP INDEX{concurrently} {quote(index)}")
+            if row is None or not row[0]:
+                cursor.execute(
+                    f"CREATE UNIQUE INDEX{concurrently} {quote(index)} "
+                    f"ON {quote(table)} ({match.group('columns')}, sent_at)"
+                )
+        built.append((name, match.group("kind"), index))
+    return built
+
+
+def convert_to_partitioned(table: str) -> str:
+    """
+    Перевод таблицы лога доставки в секционированную по sent_at.
+
+    Существующая таблица переименовывается в <table>_legacy и подключается
+    секцией (MINVALUE, начало следующего месяца), строки не копируются.
+    Граница заранее закрепляется проверенным ограничением CHECK, поэтому
+    подключение секции не читает таблицу. Первичный ключ секционированной
+    таблицы - (id, sent_at), к уникальным ограничениям добавляется sent_at,
+    нумерация id продолжается. Уникальные индексы с sent_at строятся заранее
+    без блокировки записи (build_partition_key_indexes), под блокировкой
+    ограничения таблицы переводятся на них (USING INDEX), и ATTACH PARTITION
+    использует готовые индексы вместо построения по всем строкам.
+    Под блокировкой изменяется только каталог, ожидание блокировки
+    не дольше PARTITION_LOCK_TIMEOUT. Вызывается вне транзакции.
+    """
+    legacy = f"{table}{LEGACY_SUFFIX}"
+    check = f"{table[:48]}_sent_at_upper"
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MAX(sent_at) FROM {quote(table)}")
+        max_sent_at = cursor.fetchone()[0]
+    now = timezone.now()
+    upper = month_start(max(max_sent_at or now, now + LEGACY_MARGIN), 1)
+    validate_upper_bound(table, check, upper)
+    key_indexes = build_partition_key_indexes(table)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT set_config('lock_timeout', %s, true)", [PARTITION_LOCK_TIMEOUT])
+        cursor.execute(f"LOCK TABLE {quote(table)} IN ACCESS EXCLUSIVE MODE")
+        for name, kind, index in key_indexes:
+            cursor.execute(
+                f"ALTER TABLE {quote(table)} DROP CONSTRAINT {quote(name)}, "
+                f"ADD CONSTRAINT {quote(name)} {kind} USING INDEX {quote(index)}"
+            )
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+            [table],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f')",
+            [table],
+        )
+        constraints = cursor.fetchall()
+        constraint_indexes = {name for name, kind, _ in constraints if kind in ("p", "u")}
+        cursor.execute(f"SELECT MAX(id) FROM {quote(table)}")
+        max_id = cursor.fetchone()[0]
+
+        cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}")
+        for name, _ in indexes:
+            cursor.execute(f"ALTER INDEX {quote(name)} RENAME TO {quote(name[:56] + LEGACY_SUFFIX)}")
+        cursor.execute(f"ALTER TABLE {quote(legacy)} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+        cursor.execute(
+            f"CREATE TABLE {quote(table)} (LIKE {quote(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            "PARTITION BY RANGE (sent_at)"
+        )
+        cursor.execute(f"ALTER TABLE {quote(table)} DROP CONSTRAINT {quote(check)}")
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY (START WITH %s)",
+            [(max_id or 0) + 1],
+        )
+        cursor.execute(f"ALTER TABLE {quote(table)} ADD PRIMARY KEY (id, sent_at)")
+        for name, kind, definition in constraints:
+            if kind == "u":
+                definition = partition_key_unique(definition)
+            if kind in ("u", "f"):
+                cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+        for name, definition in indexes:
+            if name not in constraint_indexes:
+                cursor.execute(definition)
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(legacy)} FOR VALUES FROM (MINVALUE) TO (%s)",
+            [upper.isoformat()],
+        )
+        cursor.execute(f"ALTER TABLE {quote(legacy)} DROP CONSTRAINT {quote(check)}")
+    logger.info(f"Таблица {table} секционирована по sent_at, прежние строки в секции {legacy} до {upper}")
+    return legacy
+
+
+def create_partitions(table: str, ahead: int) -> list[str]:
+    """Создание месячных секций с текущего месяца на ahead месяцев вперед."""
+    covered = max((p.upper for p in list_partitions(table) if p.upper), default=None)
+    created = []
+    for offset in range(ahead + 1):
+        lower = month_start(timezone.now(), offset)
+        if covered is not None and lower < covered:
+            continue
+        name = partition_name(table, lower)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(table)} FOR VALUES FROM (%s) TO (%s)",
+                [lower.isoformat(), month_start(lower, 1).isoformat()],
+            )
+        created.append(name)
+    if created:
+        logger.info(f"Созданы секции {table}: {', '.join(created)}")
+    return created
+
+
+def archive_partition(name: str, archive_dir: str) -> Path:
+    """
+    Выгрузка секции лога доставки в <archive_dir>/<секция>.jsonl.gz.
+
+    Строки читаются серверным курсором пачками и дополняются адресом
+    получателя и id уведомления. Файл пишется во временный и переименовывается
+    после записи, поэтому неполный архив не принимается за готовый.
+    """
+    path = Path(archive_dir) / f"{name}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.tmp")
+    rows = 0
+    with (
+        transaction.atomic(),
+        connection.chunked_cursor() as cursor,
+        gzip.open(temporary, "wt", encoding="utf-8", compresslevel=6) as archive,
+    ):
+        cursor.execute(
+            "SELECT l.id, r.notification_id, r.address, r.recipient_type, l.status, l.error_message, "
+            f"l.attempt, l.latency_ms, l.sent_at FROM {quote(name)} l "
+            f"JOIN {quote(Recipient._meta.db_table)} r ON r.id = l.recipient_id ORDER BY l.id"
+        )
+        while batch := cursor.fetchmany(ARCHIVE_FETCH_SIZE):
+            for row in batch:
+                archive.write(json.dumps(dict(zip(ARCHIVE_COLUMNS, row, strict=True)), cls=DjangoJSONEncoder))
+                archive.write("\n")
+            rows += len(batch)
+    os.replace(temporary, path)
+    logger.info(f"Секция {name} выгружена в {path}: {rows} строк")
+    return path
+
+
+def drop_expired_partitions(table: str, retention_days: int, archive_dir: str = "") -> list[str]:
+    """
+    Удаление секций, целиком старше срока хранения.
+
+    Если задан archive_dir, секция перед удалением выгружается в архив,
+    при ошибке выгрузки секция остается. Секция отключается от таблицы
+    и удаляется без построчного DELETE и последующего VACUUM.
+    """
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    dropped = []
+    for partition in list_partitions(table):
+        if partition.upper is None or partition.upper > cutoff:
+            continue
+        if archive_dir:
+            archive_partition(partition.name, archive_dir)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", [PARTITION_LOCK_TIMEOUT])
+            cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(partition.name)}")
+            cursor.execute(f"DROP TABLE {quote(partition.name)}")
+        dropped.append(partition.name)
+        logger.info(f"Удалена секция {partition.name} (до {partition.upper})")
+    return dropped
+
+
+def maintain_partitions(ahead: int, retention_days: int, archive_dir: str = "") -> dict[str, list[str]]:
+    """
+    Обслуживание секций лога доставки.
+
+    При первом запуске таблица переводится в секционированную, затем
+    создаются секции на ahead месяцев вперед и удаляются секции старше
+    retention_days дней (0 - хранить бессрочно). Одновременно выполняется
+    один запуск (advisory lock). Работает только на PostgreSQL.
+    """
+    result: dict[str, list[str]] = {"created": [], "dropped": []}
+    if connection.vendor != "postgresql":
+        logger.warning("Секционирование лога доставки поддерживается только на PostgreSQL")
+        return result
+    table = DeliveryLog._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [PARTITION_LOCK_ID])
+        if not cursor.fetchone()[0]:
+            logger.info("Обслуживание секций уже выполняется")
+            return result
+    try:
+        if not is_partitioned(table):
+            convert_to_partitioned(table)
+        result["created"] = create_partitions(table, ahead)
+        if retention_days:
+            result["dropped"] = drop_expired_partitions(table, retention_days, archive_dir)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [PARTITION_LOCK_ID])
+    return result
@@ -0,0 +1,27 @@
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Рендерер JSON на orjson с откатом на стандартный JSONRenderer."""
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        """Сериализация ответа в компактный UTF-8 JSON."""
+        if not HAS_ORJSON or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            rendered: bytes = super().render(data, accepted_media_type, renderer_context)
+            return rendered
+        return orjson.dumps(data, default=JSONEncoder().default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,86 @@
+import json
+from functools import lru_cache
+
+from django.template import Context, Engine, Template
+
+from .channels import RenderedMessage
+from .constants import TEMPLATE_CACHE_SIZE
+
+# Текст Telegram отправляется с parse_mode=HTML, поэтому переменные в нем экранируются
+HTML_BODY_CHANNELS = ("telegram",)
+
+engine = Engine()
+
+
+def compile_source(source: str) -> Template | None:
+    """Компиляция шаблона Django, пустой шаблон не компилируется."""
+    return engine.from_string(source) if source else None
+
+
+class CompiledTemplate:
+    """
+    Скомпилированный вариант шаблона для канала.
+
+    Тема и текст рендерятся без экранирования (кроме HTML каналов),
+    HTML версия - с экранированием переменных.
+    """
+
+    def __init__(self, subject: str, body: str, html: str, escape_body: bool) -> None:
+        self.subject = compile_source(subject)
+        self.body = compile_source(body)
+        self.html = compile_source(html)
+        self.escape_body = escape_body
+
+    def _render(self, template: Template | None, context: Context, autoescape: bool) -> str:
+        if template is None:
+            return ""
+        context.autoescape = autoescape
+        rendered: str = template.render(context)
+        return rendered.strip()
+
+    def render(self, context: Context) -> RenderedMessage:
+        return RenderedMessage(
+            body=self._render(self.body, context, self.escape_body),
+            subject=" ".join(self._render(self.subject, context, False).split()),
+            html=self._render(self.html, context, True),
+        )
+
+    def render_many(
+        self,
+        base_context: dict,
+        addresses: list[str],
+        contexts: dict[str, dict],
+    ) -> dict[str, RenderedMessage]:
+        """
+        Рендеринг сообщений пачке получателей за один проход.
+
+        Общий контекст создается один раз, персональные переменные получателя
+        накладываются на него через push. Получатели с одинаковыми
+        переменными (или без них) получают сообщение, отрисованное один раз.
+        """
+        context = Context(base_context)
+        rendered: dict[str, RenderedMessage] = {}
+        by_context: dict[str, RenderedMessage] = {}
+        for address in addresses:
+            personal = contexts.get(address) or {}
+            key = json.dumps(personal, sort_keys=True, default=str) if personal else ""
+            message = by_context.get(key)
+            if message is None:
+                with context.push(personal):
+                    message = by_context[key] = self.render(context)
+            rendered[address] = message
+        return rendered
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_compiled_template(template_id: int, version: int, channel: str) -> CompiledTemplate:
+    """
+    Скомпилированный шаблон канала из LRU кеша процесса воркера.
+
+    Версии шаблона неизменяемы, поэтому запись кеша по (id, версия, канал)
+    не устаревает, а шаблон читается из БД и компилируется один раз.
+    """
+    from .models import MessageTemplate
+
+    template = MessageTemplate.objects.only("subject", "body", "variants").get(id=template_id)
+    return CompiledTemplate(**template.variant(channel), escape_body=channel in HTML_BODY_CHANNELS)
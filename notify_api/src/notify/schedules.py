@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from celery import current_app
+from celery.schedules import crontab
+
+if TYPE_CHECKING:
+    from .models import Notification
+
+CRON_FIELDS_COUNT = 5
+
+
+def parse_cron(expression: str) -> crontab:
+    """Разбор cron выражения из пяти полей: минута, час, день месяца, месяц, день недели."""
+    fields = expression.split()
+    if len(fields) != CRON_FIELDS_COUNT:
+        raise ValueError(f"Ожидается {CRON_FIELDS_COUNT} полей, получено {len(fields)}")
+    minute, hour, day_of_month, month_of_year, day_of_week = fields
+    return crontab(
+        minute=minute,
+        hour=hour,
+        day_of_month=day_of_month,
+        month_of_year=month_of_year,
+        day_of_week=day_of_week,
+        app=current_app,
+    )
+
+
+def cron_occurrence(expression: str, after: datetime) -> datetime:
+    """Ближайшее время по cron выражению позже after."""
+    last_run_at, delta, _ = parse_cron(expression).remaining_delta(after)
+    next_run: datetime = last_run_at + delta
+    return next_run
+
+
+def next_occurrence(notification: "Notification", after: datetime) -> datetime | None:
+    """
+    Следующее время отправки повторяющегося уведомления позже after.
+
+    Пропущенные за время простоя запуски не догоняются.
+    Возвращает None, если уведомление не повторяется или расписание закончилось.
+    """
+    next_run: datetime
+    if notification.recurrence_interval:
+        interval = notification.recurrence_interval
+        next_run = notification.scheduled_for + interval
+        if next_run <= after:
+            next_run += interval * ((after - next_run) // interval + 1)
+    elif notification.recurrence_cron:
+        next_run = cron_occurrence(notification.recurrence_cron, after)
+    else:
+        return None
+    if notification.recurrence_until and next_run > notification.recurrence_until:
+        return None
+    return next_run
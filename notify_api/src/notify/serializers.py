@@ -1,9 +1,68 @@
-from rest_framework.serializers import CharField, DateTimeField, IntegerField, ListField, Serializer
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.template import TemplateSyntaxError
+from django.utils import timezone
+from rest_framework.serializers import (
+    CharField,
+    ChoiceField,
+    DateTimeField,
+    DictField,
+    FloatField,
+    IntegerField,
+    ListField,
+    Serializer,
+    SlugField,
+    ValidationError,
+)
 
-from .constants import MAX_LENGTH_ADDRESS, MAX_LENGTH_MESSAGE, MAX_VALUE_DELAY, MIN_LENGTH_MESSAGE, MIN_VALUE_DELAY
+from .choices import PriorityChoices, RecipientTypeChoices
+from .constants import (
+    DEFAULT_STATS_PERIOD,
+    MAX_LENGTH_ADDRESS,
+    MAX_LENGTH_CRON,
+    MAX_LENGTH_MESSAGE,
+    MAX_LENGTH_SUBJECT,
+    MAX_LENGTH_TEMPLATE_BODY,
+    MAX_LENGTH_TEMPLATE_NAME,
+    MAX_STATS_BUCKETS,
+    MAX_VALUE_DELAY,
+    MIN_LENGTH_MESSAGE,
+    MIN_RECURRENCE_INTERVAL,
+    MIN_VALUE_DELAY,
+    STATS_INTERVALS,
+)
+from .rendering import compile_source
+from .schedules import parse_cron
 from .validators import RecipientValidator
 
 
+class RecipientListField(ListField):
+    """
+    Список адресов получателей с быстрой проверкой типовых значений.
+
+    ASCII строки допустимой длины принимаются без вызова полей DRF,
+    остальные значения проверяются дочерним CharField с теми же ошибками.
+    """
+
+    def run_child_validation(self, data: list) -> list[str]:
+        """Проверка элементов списка."""
+        max_length = self.child.max_length
+        result = []
+        errors = {}
+        for index, item in enumerate(data):
+            if type(item) is str and item.isascii() and "\x00" not in item:
+                value = item.strip()
+                if value and len(value) <= max_length:
+                    result.append(value)
+                    continue
+            try:
+                result.append(self.child.run_validation(item))
+            except ValidationError as e:
+                errors[index] = e.detail
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+
 class NotificationRequestSerializer(Serializer):
     """Сериализатор для входящих уведомлений."""
 
@@ -11,12 +70,44 @@ class NotificationRequestSerializer(Serializer):
         max_length=MAX_LENGTH_MESSAGE,
         min_length=MIN_LENGTH_MESSAGE,
         trim_whitespace=True,
+        required=False,
     )
-    recipient = ListField(
+    template = SlugField(
+        max_length=MAX_LENGTH_TEMPLATE_NAME,
+        required=False,
+        help_text="Имя шаблона сообщения (вместо message)",
+    )
+    template_version = IntegerField(
+        min_value=1,
+        required=False,
+        help_text="Версия шаблона, по умолчанию последняя",
+    )
+    context = DictField(required=False, default=dict, help_text="Общие переменные шаблона")
+    recipient_context = DictField(
+        child=DictField(),
+        required=False,
+        default=dict,
+        help_text="Персональные переменные шаблона: {адрес: {переменная: значение}}",
+    )
+    recipient = RecipientListField(
         child=CharField(max_length=MAX_LENGTH_ADDRESS),
         allow_empty=False,
     )
-    delay = IntegerField(min_value=MIN_VALUE_DELAY, max_value=MAX_VALUE_DELAY)
+    delay = IntegerField(min_value=MIN_VALUE_DELAY, max_value=MAX_VALUE_DELAY, required=False, default=0)
+    send_at = DateTimeField(required=False, help_text="Точное время отправки")
+    interval = IntegerField(
+        min_value=MIN_RECURRENCE_INTERVAL,
+        required=False,
+        help_text="Интервал повторной отправки в секундах",
+    )
+    cron = CharField(max_length=MAX_LENGTH_CRON, required=False, help_text="Расписание повторной отправки (cron)")
+    until = DateTimeField(required=False, help_text="Время окончания повторных отправок")
+    priority = ChoiceField(
+        choices=PriorityChoices.choices,
+        required=False,
+        default=PriorityChoices.NORMAL,
+        help_text="Приоритет: high - транзакционные уведомления, normal - массовые",
+    )
 
     def validate_recipient(self, value: list[str] | str) -> dict[str, list[str]]:
         """Валидация получателей"""
@@ -24,6 +115,56 @@ class NotificationRequestSerializer(Serializer):
             value = [value]
         return RecipientValidator.validate_recipients(value)
 
+    def _normalize_contexts(self, contexts: dict[str, dict]) -> dict[str, dict]:
+        """
+        Приведение адресов персональных переменных к форме адресов получателей.
+
+        Нераспознанные адреса остаются как есть и отклоняются как отсутствующие среди получателей.
+        """
+        normalized = {}
+        for address, context in contexts.items():
+            try:
+                recipient_type = RecipientValidator.validate_recipient(address)
+                address = RecipientValidator.normalize_recipient(address, recipient_type)
+            except DjangoValidationError:
+                pass
+            normalized[address] = context
+        return normalized
+
+    def validate_cron(self, value: str) -> str:
+        """Валидация cron выражения"""
+        try:
+            parse_cron(value)
+        except ValueError as e:
+            raise ValidationError(f"Некорректное cron выражение: {e}") from e
+        return value
+
+    def validate(self, attrs: dict) -> dict:
+        """Проверка согласованности параметров расписания"""
+        if attrs.get("send_at") and attrs.get("delay"):
+            raise ValidationError({"send_at": ["Нельзя указывать одновременно send_at и delay"]})
+        if attrs.get("interval") and attrs.get("cron"):
+            raise ValidationError({"cron": ["Нельзя указывать одновременно interval и cron"]})
+        if attrs.get("until") and not (attrs.get("interval") or attrs.get("cron")):
+            raise ValidationError({"until": ["Параметр until допустим только для повторяющихся уведомлений"]})
+        if attrs.get("until") and attrs["until"] <= (attrs.get("send_at") or timezone.now()):
+            raise ValidationError({"until": ["Время окончания должно быть позже первой отправки"]})
+        if attrs.get("message") and attrs.get("template"):
+            raise ValidationError({"template": ["Нельзя указывать одновременно message и template"]})
+        if not attrs.get("message") and not attrs.get("template"):
+            raise ValidationError({"message": ["Укажите текст сообщения или шаблон"]})
+        if attrs.get("template_version") and not attrs.get("template"):
+            raise ValidationError({"template_version": ["Параметр template_version допустим только с template"]})
+        if attrs["recipient_context"]:
+            if not attrs.get("template"):
+                raise ValidationError({"recipient_context": ["Персональные переменные допустимы только с template"]})
+            addresses = {address for addresses in attrs["recipient"].values() for address in addresses}
+            attrs["recipient_context"] = self._normalize_contexts(attrs["recipient_context"])
+            unknown = [address for address in attrs["recipient_context"] if address not in addresses]
+            if unknown:
+                raise ValidationError({"recipient_context": [f"Адресов нет среди получателей: {', '.join(unknown)}"]})
+        return attrs
+
 
 class NotificationResponseSerializer(Serializer):
     """Сериализатор для исходящих ответов."""
@@ -32,3 +173,179 @@ class NotificationResponseSerializer(Serializer):
     status = CharField(help_text="Статус уведомления")
     scheduled_for = DateTimeField(help_text="Запланированное время отправки")
     recipients_count = IntegerField(help_text="Количество получателей")
+
+
+class NotificationStatusSerializer(Serializer):
+    """Сериализатор статуса уведомления."""
+
+    notification_id = IntegerField(source="id", help_text="ID уведомления")
+    message = CharField(source="text", help_text="Текст сообщения")
+    status = CharField(help_text="Статус уведомления")
+    priority = CharField(help_text="Приоритет уведомления")
+    created_at = DateTimeField(help_text="Время создания")
+    scheduled_for = DateTimeField(help_text="Запланированное время отправки")
+    recipients_count = IntegerField(help_text="Количество получателей")
+    sent_count = IntegerField(help_text="Успешных доставок за все запуски")
+    failed_count = IntegerField(help_text="Неуспешных доставок за все запуски")
+    skipped_count = IntegerField(help_text="Получателей, пропущенных окном повторов или списком подавления")
+    pending_count = IntegerField(help_text="Получателей текущего запуска без результата доставки")
+
+
+class DeliveryLogSerializer(Serializer):
+    """Сериализатор записи лога доставки."""
+
+    id = IntegerField(help_text="ID записи лога")
+    address = CharField(source="recipient.address", help_text="Адрес получателя")
+    recipient_type = CharField(source="recipient.recipient_type", help_text="Тип получателя")
+    status = CharField(help_text="Статус отправки")
+    error_message = CharField(help_text="Сообщение об ошибке")
+    attempt = IntegerField(help_text="Номер попытки")
+    latency_ms = IntegerField(allow_null=True, help_text="Длительность отправки, мс")
+    sent_at = DateTimeField(help_text="Время отправки")
+
+
+class NotificationListSerializer(Serializer):
+    """Сериализатор страницы списка уведомлений."""
+
+    next = CharField(allow_null=True, help_text="Ссылка на следующую страницу")
+    results = NotificationStatusSerializer(many=True, help_text="Уведомления страницы")
+
+
+class DeliveryLogListSerializer(Serializer):
+    """Сериализатор страницы лога доставки."""
+
+    next = CharField(allow_null=True, help_text="Ссылка на следующую страницу")
+    results = DeliveryLogSerializer(many=True, help_text="Записи лога страницы")
+
+
+class StatsQuerySerializer(Serializer):
+    """Сериализатор параметров запроса статистики доставки."""
+
+    since = DateTimeField(required=False, help_text="Начало периода, по умолчанию час назад")
+    until = DateTimeField(required=False, help_text="Конец периода, по умолчанию текущее время")
+    interval = ChoiceField(
+        choices=list(STATS_INTERVALS),
+        required=False,
+        default="minute",
+        help_text="Шаг агрегации: minute, hour, day",
+    )
+    channel = ChoiceField(choices=RecipientTypeChoices.choices, required=False, help_text="Канал доставки")
+
+    def validate(self, attrs: dict) -> dict:
+        """Период по умолчанию и ограничение числа интервалов."""
+        until = attrs.setdefault("until", timezone.now())
+        since = attrs.setdefault("since", until - DEFAULT_STATS_PERIOD)
+        if since >= until:
+            raise ValidationError({"since": "Начало периода должно быть раньше конца"})
+        if (until - since) / STATS_INTERVALS[attrs["interval"]] > MAX_STATS_BUCKETS:
+            raise ValidationError({"interval": f"Период содержит больше {MAX_STATS_BUCKETS} интервалов"})
+        return attrs
+
+
+class StatsBucketSerializer(Serializer):
+    """Сериализатор статистики доставки канала за интервал."""
+
+    bucket = DateTimeField(help_text="Начало интервала")
+    channel = CharField(help_text="Канал доставки")
+    counts = DictField(child=IntegerField(), help_text="Количество доставок по статусам")
+    total = IntegerField(help_text="Всего доставок")
+    success_rate = FloatField(allow_null=True, help_text="Доля успешных среди отправленных и неуспешных")
+    avg_latency_ms = IntegerField(allow_null=True, help_text="Средняя длительность успешной отправки, мс")
+
+
+class StatsResponseSerializer(Serializer):
+    """Сериализатор статистики доставки за период."""
+
+    since = DateTimeField(help_text="Начало периода")
+    until = DateTimeField(help_text="Конец периода")
+    interval = CharField(help_text="Шаг агрегации")
+    totals = DictField(child=IntegerField(), help_text="Количество доставок по статусам за период")
+    buckets = StatsBucketSerializer(many=True, help_text="Статистика по интервалам и каналам")
+
+
+class NotificationBatchItemSerializer(Serializer):
+    """Сериализатор результата обработки одного элемента пакета."""
+
+    index = IntegerField(help_text="Позиция уведомления в пакете")
+    status = CharField(help_text="Статус обработки элемента")
+    notification_id = IntegerField(source="id", required=False, help_text="ID созданного уведомления")
+    scheduled_for = DateTimeField(required=False, help_text="Запланированное время отправки")
+    recipients_count = IntegerField(required=False, help_text="Количество получателей")
+    errors = DictField(required=False, help_text="Ошибки валидации элемента")
+
+
+class NotificationBatchResponseSerializer(Serializer):
+    """Сериализатор ответа пакетного создания уведомлений."""
+
+    accepted = IntegerField(help_text="Количество принятых уведомлений")
+    rejected = IntegerField(help_text="Количество отклоненных уведомлений")
+    results = NotificationBatchItemSerializer(many=True, help_text="Результаты по каждому элементу пакета")
+
+
+class TemplateVariantSerializer(Serializer):
+    """Сериализатор варианта шаблона для канала."""
+
+    subject = CharField(max_length=MAX_LENGTH_SUBJECT, required=False, allow_blank=True, help_text="Тема")
+    body = CharField(max_length=MAX_LENGTH_TEMPLATE_BODY, required=False, help_text="Текст")
+    html = CharField(max_length=MAX_LENGTH_TEMPLATE_BODY, required=False, help_text="HTML версия (email)")
+
+
+class MessageTemplateRequestSerializer(Serializer):
+    """Сериализатор создания версии шаблона сообщения."""
+
+    name = SlugField(max_length=MAX_LENGTH_TEMPLATE_NAME, help_text="Имя шаблона")
+    subject = CharField(
+        max_length=MAX_LENGTH_SUBJECT,
+        required=False,
+        allow_blank=True,
+        default="",
+        help_text="Тема сообщения",
+    )
+    body = CharField(max_length=MAX_LENGTH_TEMPLATE_BODY, help_text="Текст сообщения (шаблон Django)")
+    variants = DictField(
+        child=TemplateVariantSerializer(),
+        required=False,
+        default=dict,
+        help_text="Варианты по каналам: {канал: {subject, body, html}}",
+    )
+
+    def validate_variants(self, value: dict) -> dict:
+        """Валидация каналов вариантов"""
+        unknown = [channel for channel in value if channel not in RecipientTypeChoices.values]
+        if unknown:
+            raise ValidationError(f"Неизвестные каналы: {', '.join(unknown)}")
+        return value
+
+    def validate(self, attrs: dict) -> dict:
+        """Проверка синтаксиса всех частей шаблона"""
+        parts = {"subject": attrs["subject"], "body": attrs["body"]}
+        for channel, variant in attrs["variants"].items():
+            parts.update({f"variants.{channel}.{part}": source for part, source in variant.items()})
+        errors = {}
+        for field, source in parts.items():
+            try:
+                compile_source(source)
+            except TemplateSyntaxError as e:
+                errors[field] = [f"Ошибка синтаксиса шаблона: {e}"]
+        if errors:
+            raise ValidationError(errors)
+        return attrs
+
+
+class MessageTemplateSerializer(Serializer):
+    """Сериализатор версии шаблона сообщения."""
+
+    id = IntegerField(help_text="ID версии шаблона")
+    name = CharField(help_text="Имя шаблона")
+    version = IntegerField(help_text="Версия шаблона")
+    subject = CharField(help_text="Тема сообщения")
+    body = CharField(help_text="Текст сообщения")
+    variants = DictField(child=TemplateVariantSerializer(), help_text="Варианты по каналам")
+    created_at = DateTimeField(help_text="Время создания")
+
+
+class MessageTemplateListSerializer(Serializer):
+    """Сериализатор страницы списка шаблонов."""
+
+    next = CharField(allow_null=True, help_text="Ссылка на следующую страницу")
+    results = MessageTemplateSerializer(many=True, help_text="Версии шаблонов страницы")
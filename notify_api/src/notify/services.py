@@ -1,73 +1,95 @@
 import logging
-from abc import ABC, abstractmethod
 
-logger = logging.getLogger(__name__)
-
-
-class NotificationSender(ABC):
-    """Абстрактный базовый класс для отправки уведомлений."""
-
-    @abstractmethod
-    def send(self, message: str, recipients: list[str]) -> bool:
-        pass
-
-
-class EmailSender(NotificationSender):
-    """Сервис отправки email уведомлений через Celery задачу."""
-
-    def send(self, message: str, recipients: list[str]) -> bool:
-        from .tasks import send_email_task
+from celery.canvas import Signature
 
-        try:
-            send_email_task.delay(
-                subject="Уведомление",
-                message=message,
-                to_email=recipients,
-            )
-            logger.info(f"Email задача поставлена в очередь для: {recipients}")
-            return True
-        except Exception as e:
-            logger.error(f"Ошибка постановки email задачи: {e}")
-            return False
+from .channels import enabled_channels
 
-
-class TelegramSender(NotificationSender):
-    """Сервис отправки telegram уведомлений через TeleBot."""
-
-    def send(self, message: str, recipients: list[str]) -> bool:
-        from .tasks import send_telegram_task
-
-        if not recipients:
-            logger.warning("Список получателей Telegram пуст")
-            return True
-        try:
-            send_telegram_task.delay(
-                message=message,
-                chat_ids=recipients,
-            )
-            logger.info(f"Telegram задача поставлена в очередь для: {recipients}")
-            return True
-        except Exception as e:
-            logger.error(f"Ошибка постановки Telegram задачи: {e}")
-            return False
+logger = logging.getLogger(__name__)
 
 
 class NotificationService:
-    """Фасад для отправки уведомлений через различные каналы."""
+    """
+    Фасад для отправки уведомлений через различные каналы.
 
-    def __init__(self) -> None:
-        self.senders = {
-            "email": EmailSender(),
-            "telegram": TelegramSender(),
-        }
+    Каналы берутся из реестра NOTIFY_ENABLED_CHANNELS, бэкенды каналов
+    загружаются только воркерами доставки, поэтому добавление канала
+    не требует изменения задач.
+    """
 
-    def send_notification(self, message: str, recipients_data: dict) -> dict:
-        """Отправка уведомлений по всем каналам."""
-        results = {}
+    def __init__(self) -> None:
+        self.channels = set(enabled_channels())
+
+    def signature(
+        self,
+        channel: str,
+        body: str,
+        recipients: list[str],
+        delivery_scope: str,
+        notification_id: int | None = None,
+        template: dict | None = None,
+        contexts: dict[str, dict] | None = None,
+        run_token: str | None = None,
+    ) -> Signature:
+        """
+        Подпись задачи доставки для пачки получателей канала.
+
+        body - хеш текста сообщения в MessageBody, задача не несет сам текст.
+        delivery_scope - стабильный идентификатор отправки, в пределах которого
+        каждый получатель получает сообщение ровно один раз.
+        notification_id - уведомление, счетчики которого обновляются по результатам пачки.
+        template - версия шаблона и общие переменные ({id, version, context}),
+        contexts - персональные переменные получателей пачки.
+        run_token - токен запуска уведомления, по которому пачка продлевает аренду.
+        """
+        from .tasks import send_channel_task
+
+        kwargs: dict = {}
+        if template is not None:
+            kwargs = {"template": template, "contexts": contexts or {}}
+        return send_channel_task.s(
+            channel=channel,
+            body=body,
+            recipients=recipients,
+            delivery_scope=delivery_scope,
+            notification_id=notification_id,
+            run_token=run_token,
+            **kwargs,
+        )
+
+    def build_delivery_tasks(
+        self,
+        body: str,
+        recipients_data: dict,
+        chunk_size: int,
+        delivery_scope: str,
+        notification_id: int | None = None,
+        template: dict | None = None,
+        contexts: dict[str, dict] | None = None,
+        run_token: str | None = None,
+    ) -> list[Signature]:
+        """
+        Разбиение получателей каждого канала на пачки задач доставки.
+
+        Пачка получает только персональные переменные своих получателей.
+        """
+        contexts = contexts or {}
+        tasks = []
         for recipient_type, recipients in recipients_data.items():
-            if recipients and recipient_type in self.senders:
-                sender = self.senders[recipient_type]
-                results[recipient_type] = sender.send(message, recipients)
+            if recipients and recipient_type in self.channels:
+                for start in range(0, len(recipients), chunk_size):
+                    chunk = recipients[start : start + chunk_size]
+                    tasks.append(
+                        self.signature(
+                            recipient_type,
+                            body,
+                            chunk,
+                            delivery_scope,
+                            notification_id,
+                            template,
+                            {address: contexts[address] for address in chunk if address in contexts},
+                            run_token,
+                        )
+                    )
             elif recipients:
-                logger.warning(f"Неизвестный тип получателя: {recipient_type}")
-        return results
+                logger.warning(f"Неизвестный или отключенный тип получателя: {recipient_type}")
+        return tasks
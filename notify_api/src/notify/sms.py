@@ -0,0 +1,23 @@
+import logging
+import time
+
+from .channels import ChannelBackend, DeliveryError
+
+logger = logging.getLogger(__name__)
+
+
+class ConsoleSMSChannel(ChannelBackend):
+    """
+    Локальная заглушка канала SMS.
+
+    Сообщения не отправляются, а пишутся в лог воркера. Используется для
+    разработки и проверки маршрутизации до подключения SMS провайдера.
+    """
+
+    def send_many(self, message: str, addresses: list[str], scope: str = "") -> dict[str, int | DeliveryError]:
+        results: dict[str, int | DeliveryError] = {}
+        for address in addresses:
+            started = time.monotonic()
+            logger.info(f"SMS {address}: {message}")
+            results[address] = int((time.monotonic() - started) * 1000)
+        return results
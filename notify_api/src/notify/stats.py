@@ -0,0 +1,112 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.db import connection
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest, Trunc
+
+from .choices import StatusDeliveryChoices
+from .models import DeliveryStats, Notification
+
+
+def delivery_status(outcome: dict) -> str:
+    """Статус записи лога доставки по результату отправки получателю."""
+    if outcome.get("suppressed"):
+        return str(StatusDeliveryChoices.SUPPRESSED)
+    if outcome.get("skipped"):
+        return str(StatusDeliveryChoices.SKIPPED)
+    if outcome["success"]:
+        return str(StatusDeliveryChoices.SUCCESS)
+    return str(StatusDeliveryChoices.FAILED)
+
+
+def update_counters(notification_id: int, statuses: Iterable[str]) -> None:
+    """Инкрементальное обновление счетчиков доставки уведомления по результатам пачки."""
+    counts = Counter(statuses)
+    total = sum(counts.values())
+    if not total:
+        return
+    Notification.objects.filter(id=notification_id).update(
+        sent_count=F("sent_count") + counts[str(StatusDeliveryChoices.SUCCESS)],
+        failed_count=F("failed_count") + counts[str(StatusDeliveryChoices.FAILED)],
+        skipped_count=F("skipped_count")
+        + counts[str(StatusDeliveryChoices.SKIPPED)]
+        + counts[str(StatusDeliveryChoices.SUPPRESSED)],
+        pending_count=Greatest(F("pending_count") - total, 0),
+    )
+
+
+def record_delivery_stats(entries: Iterable[tuple[datetime, str, str, int | None]]) -> None:
+    """
+    Добавление результатов доставки в поминутную статистику.
+
+    entries - время отправки, канал, статус и длительность отправки.
+    Строки статистики увеличиваются одним INSERT ... ON CONFLICT DO UPDATE
+    на минуту, канал и статус, в порядке ключа, чтобы параллельные
+    финализации не блокировали друг друга.
+    """
+    buckets: dict[tuple[datetime, str, str], list[int]] = defaultdict(lambda: [0, 0])
+    for sent_at, channel, status, latency_ms in entries:
+        bucket = buckets[(sent_at.replace(second=0, microsecond=0), channel, status)]
+        bucket[0] += 1
+        bucket[1] += latency_ms or 0
+    if not buckets:
+        return
+    table = connection.ops.quote_name(DeliveryStats._meta.db_table)
+    sql = (
+        f"INSERT INTO {table} (bucket, channel, status, deliveries, latency_sum_ms) "
+        "VALUES (%s, %s, %s, %s, %s) "
+        "ON CONFLICT (bucket, channel, status) DO UPDATE SET "
+        f"deliveries = {table}.deliveries + EXCLUDED.deliveries, "
+        f"latency_sum_ms = {table}.latency_sum_ms + EXCLUDED.latency_sum_ms"
+    )
+    params = [
+        (connection.ops.adapt_datetimefield_value(bucket), channel, status, deliveries, latency_sum_ms)
+        for (bucket, channel, status), (deliveries, latency_sum_ms) in sorted(buckets.items())
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def get_delivery_stats(since: datetime, until: datetime, interval: str, channel: str | None = None) -> dict:
+    """
+    Статистика доставки за период из поминутной таблицы DeliveryStats.
+
+    Строки агрегируются до interval (minute, hour, day) по каналам,
+    таблица логов доставки не читается.
+    """
+    rows = DeliveryStats.objects.filter(bucket__gte=since, bucket__lt=until)
+    if channel:
+        rows = rows.filter(channel=channel)
+    rows = (
+        rows.annotate(period=Trunc("bucket", interval))
+        .values("period", "channel", "status")
+        .annotate(count=Sum("deliveries"), latency=Sum("latency_sum_ms"))
+        .order_by("period", "channel")
+    )
+    buckets: dict[tuple[datetime, str], dict] = {}
+    totals: Counter[str] = Counter()
+    for row in rows:
+        bucket = buckets.setdefault(
+            (row["period"], row["channel"]),
+            {"bucket": row["period"], "channel": row["channel"], "counts": {}, "latency_sum_ms": 0},
+        )
+        bucket["counts"][row["status"]] = row["count"]
+        if row["status"] == StatusDeliveryChoices.SUCCESS:
+            bucket["latency_sum_ms"] = row["latency"]
+        totals[row["status"]] += row["count"]
+    for bucket in buckets.values():
+        counts = bucket["counts"]
+        success = counts.get(StatusDeliveryChoices.SUCCESS, 0)
+        attempted = success + counts.get(StatusDeliveryChoices.FAILED, 0)
+        bucket["total"] = sum(counts.values())
+        bucket["success_rate"] = round(success / attempted, 4) if attempted else None
+        bucket["avg_latency_ms"] = bucket.pop("latency_sum_ms") // success if success else None
+    return {
+        "since": since,
+        "until": until,
+        "interval": interval,
+        "totals": dict(totals),
+        "buckets": list(buckets.values()),
+    }
@@ -0,0 +1,106 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from redis import Redis
+
+from .choices import RecipientTypeChoices
+from .constants import BULK_CREATE_BATCH_SIZE
+from .idempotency import redis_client
+from .models import SuppressedRecipient
+
+logger = logging.getLogger(__name__)
+
+SUPPRESSION_SET_PREFIX = "suppression:recipients"
+SUPPRESSION_LOADED_KEY = "suppression:loaded"
+# Запас по времени для адресов, добавленных во время чтения БД при перестроении индекса
+SUPPRESSION_RELOAD_OVERLAP = timedelta(minutes=1)
+
+
+class SuppressionList:
+    """
+    Список подавления получателей с индексом в Redis.
+
+    Источник истины - таблица SuppressedRecipient, в Redis хранится по одному
+    множеству на тип получателя. Проверка пачки адресов выполняется одной
+    командой SMISMEMBER. Если индекс потерян, он восстанавливается из БД.
+    """
+
+    def __init__(self, client: Redis, cache_ttl: int) -> None:
+        self.client = client
+        self.cache_ttl = cache_ttl
+
+    def _key(self, recipient_type: str) -> str:
+        return f"{SUPPRESSION_SET_PREFIX}:{recipient_type}"
+
+    def _ensure_loaded(self) -> None:
+        """Перестроение индекса из БД раз в cache_ttl секунд или после его потери."""
+        if self.client.set(SUPPRESSION_LOADED_KEY, 1, nx=True, ex=self.cache_ttl):
+            self.reload()
+
+    def reload(self) -> int:
+        """
+        Перестроение индекса из БД через временные множества без пустого окна.
+
+        Адреса, добавленные методом add после чтения БД, попадают только в прежние
+        множества и теряются при их замене, поэтому после замены в индекс повторно
+        добавляются записи, созданные с начала перестроения (с запасом).
+        """
+        started = timezone.now() - SUPPRESSION_RELOAD_OVERLAP
+        counts = dict.fromkeys(RecipientTypeChoices.values, 0)
+        pipeline = self.client.pipeline(transaction=False)
+        for recipient_type in counts:
+            pipeline.delete(f"{self._key(recipient_type)}:rebuild")
+        entries = SuppressedRecipient.objects.values_list("recipient_type", "address").iterator(
+            chunk_size=BULK_CREATE_BATCH_SIZE
+        )
+        for index, (recipient_type, address) in enumerate(entries, start=1):
+            pipeline.sadd(f"{self._key(recipient_type)}:rebuild", address)
+            counts[recipient_type] = counts.get(recipient_type, 0) + 1
+            if index % BULK_CREATE_BATCH_SIZE == 0:
+                pipeline.execute()
+        for recipient_type, count in counts.items():
+            if count:
+                pipeline.rename(f"{self._key(recipient_type)}:rebuild", self._key(recipient_type))
+            else:
+                pipeline.delete(self._key(recipient_type))
+        pipeline.execute()
+        recent = SuppressedRecipient.objects.filter(created_at__gte=started).values_list("recipient_type", "address")
+        for recipient_type, address in recent:
+            pipeline.sadd(self._key(recipient_type), address)
+        pipeline.execute()
+        total = sum(counts.values())
+        logger.info(f"Индекс списка подавления загружен из БД: {total} адресов")
+        return total
+
+    def split(self, recipient_type: str, addresses: list[str]) -> tuple[list[str], list[str]]:
+        """Разделение адресов на разрешенные и подавленные."""
+        if not addresses:
+            return [], []
+        self._ensure_loaded()
+        flags = self.client.smismember(self._key(recipient_type), addresses)
+        allowed = [address for address, flag in zip(addresses, flags, strict=True) if not flag]
+        suppressed = [address for address, flag in zip(addresses, flags, strict=True) if flag]
+        return allowed, suppressed
+
+    def add(self, entries: list[tuple[str, str, str]]) -> None:
+        """Добавление адресов (тип, адрес, причина) в БД и индекс."""
+        if not entries:
+            return
+        SuppressedRecipient.objects.bulk_create(
+            [
+                SuppressedRecipient(recipient_type=recipient_type, address=address, reason=reason)
+                for recipient_type, address, reason in entries
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        pipeline = self.client.pipeline(transaction=False)
+        for recipient_type, address, _ in entries:
+            pipeline.sadd(self._key(recipient_type), address)
+        pipeline.execute()
+        logger.warning(f"В список подавления добавлено адресов: {len(entries)}")
+
+
+suppression_list = SuppressionList(redis_client, settings.NOTIFY_SUPPRESSION_CACHE_TTL)
@@ -1,172 +1,515 @@
 import logging
-from collections.abc import Generator
-from contextlib import contextmanager
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
 from typing import Any
 
-from celery import shared_task
+from celery import chord, shared_task
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from redis import Redis
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
-from .choices import StatusChoices, StatusDeliveryChoices
-from .models import DeliveryLog, Notification
+from config.celery import QUEUE_HIGH
+
+from .bodies import get_body, store_bodies
+from .channels import DeliveryError, get_backend
+from .choices import PriorityChoices, StatusChoices
+from .constants import BULK_CREATE_BATCH_SIZE
+from .idempotency import content_hash, delivery_markers, suppression_window
+from .models import DeliveryLog, Notification, Recipient
+from .partitions import maintain_partitions
+from .rendering import get_compiled_template
+from .schedules import next_occurrence
 from .services import NotificationService
+from .stats import delivery_status, record_delivery_stats, update_counters
+from .suppression import suppression_list
 
 logger = logging.getLogger(__name__)
 
-redis_client = Redis.from_url(settings.CELERY_BROKER_URL)
 
+def priority_options(priority: PriorityChoices | str) -> dict:
+    """
+    Параметры публикации задач уведомления с учетом приоритета.
 
-def acquire_lock(lock_key: str) -> bool:
-    """Установка блокировки для задачи."""
-    if not redis_client:
-        return True
-    result = redis_client.set(
-        lock_key,
-        "processing",
-        ex=settings.EMAIL_TASK_LOCK_TIMEOUT,
-        nx=True,
-    )
-    return bool(result)
+    Задачи высокого приоритета идут в отдельную очередь с выделенным воркером
+    и не ждут за массовыми рассылками. Повторы задач сохраняют очередь.
+    """
+    if priority == PriorityChoices.HIGH:
+        return {"queue": QUEUE_HIGH, "routing_key": QUEUE_HIGH}
+    return {}
+
+
+def build_outcome(
+    address: str,
+    attempt: int,
+    error: str = "",
+    latency_ms: int | None = None,
+    skipped: bool = False,
+    permanent: bool = False,
+    suppressed: bool = False,
+) -> dict:
+    """
+    Фактический результат доставки одному получателю.
+
+    permanent - постоянная ошибка адреса, после которой он попадает в список подавления,
+    suppressed - адрес из списка подавления, отправка не выполнялась.
+    """
+    return {
+        "address": address,
+        "success": not error,
+        "skipped": skipped,
+        "permanent": permanent,
+        "suppressed": suppressed,
+        "error": error,
+        "latency_ms": latency_ms,
+        "attempt": attempt,
+        "sent_at": timezone.now().isoformat(),
+    }
 
 
-def release_lock(lock_key: str) -> None:
-    """Снятие блокировки задачи."""
-    if redis_client:
-        redis_client.delete(lock_key)
+def build_chunk_result(channel: str, outcomes: list[dict]) -> dict:
+    """Результат доставки пачки получателей для агрегации в chord."""
+    return {
+        "channel": channel,
+        "outcomes": outcomes,
+    }
 
 
-@contextmanager
-def task_lock(lock_key: str, timeout: int | None = None) -> Generator[bool, None, None]:
+def claim_recipients(
+    scope: str,
+    content_key: str,
+    addresses: list[str],
+    attempt: int,
+) -> tuple[list[str], list[dict]]:
     """
-    Context manager для работы с блокировками задач.
+    Захват получателей пачки маркерами доставки и окном подавления.
+
+    Возвращает адреса для отправки и результаты по адресам, которые уже
+    получили сообщение, отправляются другим воркером или получали сообщение
+    с тем же содержимым в окне подавления.
     """
-    if timeout is None:
-        timeout = settings.EMAIL_TASK_LOCK_TIMEOUT
-    is_locked = acquire_lock(lock_key)
-    try:
-        yield is_locked
-    finally:
-        if is_locked:
-            release_lock(lock_key)
+    claimed, sent, in_flight = delivery_markers.claim(scope, addresses)
+    if sent or in_flight:
+        logger.info(f"Повторная доставка пропущена ({scope}): отправлено {sent}, в обработке {in_flight}")
+    allowed, suppressed = suppression_window.acquire(content_key, claimed)
+    if suppressed:
+        delivery_markers.confirm(scope, suppressed)
+        logger.info(f"Отправка подавлена окном повторов ({scope}): {suppressed}")
+    skipped = [build_outcome(address, attempt) for address in sent]
+    skipped += [build_outcome(address, attempt, "Отправка выполняется другим воркером") for address in in_flight]
+    skipped += [build_outcome(address, attempt, skipped=True) for address in suppressed]
+    return allowed, skipped
+
+
+def extend_lease(notification_id: int | None, run_token: str | None) -> bool:
+    """Продление аренды уведомления в обработке, если его захват принадлежит запуску run_token."""
+    if notification_id is None:
+        return False
+    return bool(
+        Notification.objects.filter(id=notification_id, status=StatusChoices.PROCESSING, run_token=run_token).update(
+            locked_until=timezone.now() + timedelta(seconds=settings.NOTIFY_LEASE_TIMEOUT)
+        )
+    )
+
+
+def settle_recipients(scope: str, content_key: str, outcomes: list[dict]) -> None:
+    """Подтверждение маркеров успешных отправок и снятие маркеров ошибок."""
+    failed = [outcome["address"] for outcome in outcomes if not outcome["success"]]
+    delivery_markers.confirm(scope, [outcome["address"] for outcome in outcomes if outcome["success"]])
+    delivery_markers.release(scope, failed)
+    suppression_window.release(content_key, failed)
 
 
 @shared_task(
     bind=True,
-    queue="notify",
     autoretry_for=(Exception,),
     retry_backoff=settings.EMAIL_TASK_RETRY_DELAY,
     max_retries=settings.EMAIL_TASK_MAX_RETRIES,
 )
-def send_email_task(self: Any, subject: str, message: str, to_email: str | list[str]) -> bool:
-    """Задача для отправки email."""
-    if not isinstance(to_email, list):
-        to_email = [to_email]
-    lock_key = f"email_lock:{subject}:{hash(frozenset(to_email))}"
-    with task_lock(lock_key) as is_locked:
-        if not is_locked:
-            logger.info(f"Email задача пропущена (блокировка): {to_email}")
-            return False
+def send_channel_task(
+    self: Any,
+    channel: str,
+    recipients: list[str],
+    message: str = "",
+    delivery_scope: str = "",
+    outcomes: list[dict] | None = None,
+    notification_id: int | None = None,
+    template: dict | None = None,
+    contexts: dict[str, dict] | None = None,
+    body: str = "",
+    run_token: str | None = None,
+) -> dict:
+    """
+    Задача доставки сообщения пачке получателей через бэкенд канала.
+
+    Бэкенд канала загружается из реестра при первом обращении и живет до конца
+    процесса воркера. Повторная попытка выполняется только для адресов
+    с временной ошибкой, результаты прошлых попыток передаются в outcomes.
+    Если ошибки указали retry_after (пауза endpoint'а, Retry-After), повтор
+    откладывается на наибольшую из них, чтобы не тратить попытки до конца паузы.
+    Маркеры доставки в рамках delivery_scope исключают повторную отправку адресу.
+    После завершения пачки обновляются счетчики доставки уведомления notification_id,
+    после каждой попытки продлевается аренда запуска run_token, чтобы долгая рассылка
+    не была возвращена в ожидание, пока ее пачки еще выполняются.
+    При отправке по шаблону template ({id, version, context}) сообщения пачки
+    рендерятся одним проходом по скомпилированному шаблону из кеша воркера
+    с персональными переменными contexts.
+    Текст сообщения передается хешем body и читается из кеша текстов воркера,
+    message - текст в задачах, опубликованных до хранения текстов по хешу.
+    """
+    outcomes = outcomes or []
+    contexts = contexts or {}
+    attempt = self.request.retries + 1
+    content = content_hash(template) if template is not None else body or content_hash(message)
+    content_key = f"{channel}:{content}"
+    scope = f"{channel}:{delivery_scope}" if delivery_scope else content_key
+    to_send, skipped = claim_recipients(scope, content_key, recipients, attempt)
+    results: dict[str, int | DeliveryError] = {}
+    if to_send:
         try:
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=to_email,
-            )
-            email.send(fail_silently=False)
-            logger.info(f"Email отправлен: {subject} -> {to_email}")
-            return True
+            if template is None:
+                results = get_backend(channel).send_many(get_body(body) if body else message, to_send, scope)
+            else:
+                compiled = get_compiled_template(template["id"], template["version"], channel)
+                messages = compiled.render_many(template["context"], to_send, contexts)
+                results = get_backend(channel).send_rendered(messages, scope)
         except Exception as e:
-            logger.error(f"Ошибка отправки email {subject} -> {to_email}: {e}")
-            raise self.retry(exc=e) from e
+            logger.error(f"Общая ошибка отправки {channel}: {e}")
+            results = {address: DeliveryError(str(e), retryable=True) for address in to_send}
+    sent = []
+    finished = []
+    retryable = []
+    retry_after = []
+    for address, result in results.items():
+        if isinstance(result, DeliveryError):
+            logger.error(f"Ошибка отправки {channel} для {address}: {result}")
+            sent.append(build_outcome(address, attempt, str(result), permanent=result.permanent))
+            if result.retryable and self.request.retries < self.max_retries:
+                retryable.append(address)
+                if result.retry_after:
+                    retry_after.append(result.retry_after)
+            else:
+                finished.append(sent[-1])
+        else:
+            sent.append(build_outcome(address, attempt, "", result))
+            finished.append(sent[-1])
+    settle_recipients(scope, content_key, sent)
+    for outcome in skipped:
+        if outcome["success"] or self.request.retries >= self.max_retries:
+            finished.append(outcome)
+        else:
+            retryable.append(outcome["address"])
+    logger.info(f"{channel}: отправлено {len(recipients) - len(retryable)} из {len(recipients)} без повтора")
+    extend_lease(notification_id, run_token)
+    if retryable:
+        raise self.retry(
+            kwargs={
+                "channel": channel,
+                "recipients": retryable,
+                "message": message,
+                "body": body,
+                "delivery_scope": delivery_scope,
+                "outcomes": outcomes + finished,
+                "notification_id": notification_id,
+                "template": template,
+                "contexts": {address: contexts[address] for address in retryable if address in contexts},
+                "run_token": run_token,
+            },
+            countdown=max(retry_after) if retry_after else None,
+        )
+    if notification_id is not None:
+        update_counters(notification_id, [delivery_status(outcome) for outcome in outcomes + finished])
+    return build_chunk_result(channel, outcomes + finished)
 
 
 @shared_task(
     bind=True,
-    queue="notify",
     autoretry_for=(Exception,),
     retry_backoff=settings.EMAIL_TASK_RETRY_DELAY,
+    retry_backoff_max=settings.EMAIL_TASK_STATE_TIMEOUT,
     max_retries=settings.EMAIL_TASK_MAX_RETRIES,
 )
-def send_telegram_task(self: Any, message: str, chat_ids: list[str]) -> bool:
-    """Задача для отправки Telegram сообщений."""
-    from telebot import TeleBot
-    from telebot.apihelper import ApiException
-
-    bot_token = getattr(settings, "TELEGRAM_BOT_TOKEN", "")
-    if not bot_token:
-        logger.error("Telegram bot token не настроен")
+def send_notification_task(self: Any, notification_id: int) -> bool:
+    """
+    Основная задача: захват уведомления, разбиение получателей на пачки и запуск доставки.
+
+    Уведомление захватывается условным UPDATE из статуса ожидания или очереди
+    в статус обработки с арендой на NOTIFY_LEASE_TIMEOUT секунд и новым токеном
+    запуска. Пачки доставки продлевают аренду по токену, финализация записывает
+    результаты, только пока захват принадлежит этому запуску. Если строку
+    уже захватил другой воркер, задача завершается без отправки.
+    """
+    now = timezone.now()
+    run_token = str(uuid.uuid4())
+    claimed = Notification.objects.filter(
+        id=notification_id,
+        status__in=[StatusChoices.PENDING, StatusChoices.QUEUED],
+        scheduled_for__lte=now,
+    ).update(
+        status=StatusChoices.PROCESSING,
+        locked_until=now + timedelta(seconds=settings.NOTIFY_LEASE_TIMEOUT),
+        run_token=run_token,
+    )
+    if not claimed:
+        logger.info(f"Уведомление {notification_id} уже обрабатывается или не готово к отправке")
         return False
-    lock_key = f"telegram_lock:{hash(message)}:{hash(frozenset(chat_ids))}"
-    with task_lock(lock_key) as is_locked:
-        if not is_locked:
-            logger.info(f"Telegram задача пропущена (блокировка): {chat_ids}")
+
+    try:
+        notification = (
+            Notification.objects.select_related("template")
+            .only(
+                "id",
+                "message",
+                "body_id",
+                "scheduled_for",
+                "priority",
+                "context",
+                "template__id",
+                "template__version",
+            )
+            .get(id=notification_id)
+        )
+        body = notification.body_id or ""
+        if not body and notification.message:
+            body = store_bodies([notification.message])[notification.message]
+        options = priority_options(notification.priority)
+        template = None
+        if notification.template is not None:
+            template = {
+                "id": notification.template.id,
+                "version": notification.template.version,
+                "context": notification.context,
+            }
+        recipients_data: dict[str, list[str]] = defaultdict(list)
+        contexts = {}
+        recipients = (
+            Recipient.objects.filter(notification_id=notification_id)
+            .order_by("id")
+            .values_list("recipient_type", "address", "context")
+            .iterator(chunk_size=settings.NOTIFY_CHUNK_SIZE)
+        )
+        for recipient_type, address, context in recipients:
+            recipients_data[recipient_type].append(address)
+            if context:
+                contexts[address] = context
+        suppressed_results = []
+        for recipient_type, addresses in list(recipients_data.items()):
+            recipients_data[recipient_type], suppressed = suppression_list.split(recipient_type, addresses)
+            if suppressed:
+                logger.info(
+                    f"Уведомление {notification_id}: пропущено адресов из списка подавления: {len(suppressed)}"
+                )
+                suppressed_results.append(
+                    build_chunk_result(
+                        recipient_type,
+                        [
+                            build_outcome(address, 1, "Адрес в списке подавления", suppressed=True)
+                            for address in suppressed
+                        ],
+                    )
+                )
+
+        delivery_tasks = NotificationService().build_delivery_tasks(
+            body,
+            recipients_data,
+            settings.NOTIFY_CHUNK_SIZE,
+            content_hash(notification_id, notification.scheduled_for.isoformat()),
+            notification_id,
+            template,
+            contexts,
+            run_token,
+        )
+        Notification.objects.filter(id=notification_id).update(
+            pending_count=sum(len(addresses) for addresses in recipients_data.values()),
+            skipped_count=F("skipped_count") + sum(len(result["outcomes"]) for result in suppressed_results),
+        )
+        if not delivery_tasks and suppressed_results:
+            finalize_notification_task(suppressed_results, notification_id, run_token=run_token)
             return False
-        try:
-            bot = TeleBot(bot_token)
-            success_count = 0
-            for chat_id in chat_ids:
-                try:
-                    bot.send_message(chat_id=chat_id, text=message, parse_mode="HTML")
-                    success_count += 1
-                    logger.info(f"Telegram отправлено: {chat_id}")
-                except ApiException as e:
-                    error_description = str(e)
-                    logger.error(f"Telegram ошибка для {chat_id}: {error_description}")
-                except Exception as e:
-                    logger.error(f"Ошибка отправки Telegram для {chat_id}: {e}")
-            return success_count > 0
-        except Exception as e:
-            logger.error(f"Общая ошибка отправки telegram: {e}")
-            raise self.retry(exc=e) from e
+        if not delivery_tasks:
+            Notification.objects.filter(id=notification_id).update(status=StatusChoices.FAILED, locked_until=None)
+            logger.warning(f"Уведомление {notification_id} не содержит получателей для отправки")
+            return False
+        chord([task.set(**options) for task in delivery_tasks])(
+            finalize_notification_task.s(notification_id, extra_results=suppressed_results, run_token=run_token).set(
+                **options
+            )
+        )
+        logger.info(f"Уведомление {notification_id} разбито на {len(delivery_tasks)} пачек доставки")
+        return True
+    except Exception as e:
+        logger.error(f"Ошибка отправки уведомления {notification_id}: {e}")
+        Notification.objects.filter(id=notification_id, status=StatusChoices.PROCESSING, run_token=run_token).update(
+            status=StatusChoices.QUEUED,
+            locked_until=timezone.now() + timedelta(seconds=settings.NOTIFY_QUEUED_TIMEOUT),
+        )
+        raise self.retry(exc=e) from e
 
 
 @shared_task(
     bind=True,
-    queue="notify",
     autoretry_for=(Exception,),
     retry_backoff=settings.EMAIL_TASK_RETRY_DELAY,
-    retry_backoff_max=settings.EMAIL_TASK_STATE_TIMEOUT,
     max_retries=settings.EMAIL_TASK_MAX_RETRIES,
 )
-def send_notification_task(self: Any, notification_id: int) -> bool:
-    """Основная задача для отправки уведомления."""
-    lock_key = f"notification_lock:{notification_id}"
-    with task_lock(lock_key) as is_locked:
-        if not is_locked:
-            logger.info(f"Уведомление {notification_id} пропущено (блокировка)")
+def finalize_notification_task(
+    self: Any,
+    results: list[dict],
+    notification_id: int,
+    extra_results: list[dict] | None = None,
+    run_token: str | None = None,
+) -> bool:
+    """
+    Запись фактических результатов доставки пачек в DeliveryLog и статус уведомления.
+
+    Получатели читаются потоком одним запросом, логи вставляются пачками
+    по BULK_CREATE_BATCH_SIZE строк и добавляются в поминутную статистику DeliveryStats.
+    extra_results - результаты получателей, пропущенных без отправки.
+    Адреса с постоянной ошибкой добавляются в список подавления.
+    Получатели без результата (потерянная пачка) учитываются в счетчике ошибок.
+
+    Все записи выполняются в одной транзакции, которая начинается с продления
+    аренды по условию status=processing и токену запуска run_token: строка
+    остается заблокированной до фиксации, поэтому сборщик зависших уведомлений
+    не вернет ее в ожидание посреди записи. Если захват уже потерян (аренда истекла
+    и уведомление запущено повторно), результаты не записываются. При ошибке
+    транзакция откатывается и задача повторяется.
+    """
+    outcomes = {}
+    for result in results + (extra_results or []):
+        for outcome in result["outcomes"]:
+            outcomes[(result["channel"], outcome["address"])] = outcome
+    with transaction.atomic():
+        if not extend_lease(notification_id, run_token):
+            logger.warning(f"Уведомление {notification_id}: захват запуска потерян, результаты пачек не записаны")
             return False
+        logs = []
+        stats = []
+        to_suppress = []
+        missing = 0
+        all_success = True
+        recipients = (
+            Recipient.objects.filter(notification_id=notification_id)
+            .values_list("id", "recipient_type", "address")
+            .iterator(chunk_size=BULK_CREATE_BATCH_SIZE)
+        )
+        for recipient_id, recipient_type, address in recipients:
+            outcome = outcomes.get((recipient_type, address))
+            if outcome is None:
+                outcome = build_outcome(address, 1, f"Нет результата отправки через {recipient_type}")
+                missing += 1
+            all_success = all_success and outcome["success"]
+            if outcome.get("permanent"):
+                to_suppress.append((recipient_type, address, outcome["error"]))
+            status = delivery_status(outcome)
+            sent_at = datetime.fromisoformat(outcome["sent_at"])
+            logs.append(
+                DeliveryLog(
+                    recipient_id=recipient_id,
+                    status=status,
+                    error_message=outcome["error"],
+                    attempt=outcome["attempt"],
+                    latency_ms=outcome["latency_ms"],
+                    sent_at=sent_at,
+                )
+            )
+            stats.append((sent_at, recipient_type, status, outcome["latency_ms"]))
+            if len(logs) >= BULK_CREATE_BATCH_SIZE:
+                DeliveryLog.objects.bulk_create(logs)
+                logs = []
+        if logs:
+            DeliveryLog.objects.bulk_create(logs)
+        record_delivery_stats(stats)
+        suppression_list.add(to_suppress)
+        counters = {"pending_count": 0, "failed_count": F("failed_count") + missing, "locked_until": None}
+        notification = Notification.objects.only(
+            "scheduled_for", "recurrence_interval", "recurrence_cron", "recurrence_until"
+        ).get(id=notification_id)
+        next_run = next_occurrence(notification, timezone.now())
+        claim = Notification.objects.filter(id=notification_id, status=StatusChoices.PROCESSING, run_token=run_token)
+        if next_run is not None:
+            claim.update(status=StatusChoices.PENDING, scheduled_for=next_run, **counters)
+            logger.info(
+                f"Уведомление {notification_id} обработано. Успех: {all_success}. Следующая отправка: {next_run}"
+            )
+            return all_success
+        claim.update(status=StatusChoices.COMPLETED if all_success else StatusChoices.FAILED, **counters)
+    logger.info(f"Уведомление {notification_id} обработано. Успех: {all_success}")
+    return all_success
 
-        try:
-            notification = Notification.objects.get(id=notification_id)
-            notification_service = NotificationService()
-
-            recipients_data = {}
-            for recipient in notification.recipients.all():
-                if recipient.recipient_type not in recipients_data:
-                    recipients_data[recipient.recipient_type] = []
-                recipients_data[recipient.recipient_type].append(recipient.address)
-
-            results = notification_service.send_notification(
-                notification.message,
-                recipients_data,
+
+@shared_task
+def dispatch_due_notifications_task() -> int:
+    """
+    Периодическая задача запуска отложенных уведомлений.
+
+    Выбирает наступившие уведомления пачками через SELECT ... FOR UPDATE SKIP LOCKED,
+    переводит их в статус очереди и публикует задачи отправки через одно
+    соединение с брокером. Несколько экземпляров не берут одни и те же строки.
+    """
+    dispatched = 0
+    for _ in range(settings.NOTIFY_SCHEDULER_MAX_BATCHES):
+        with transaction.atomic():
+            due = dict(
+                Notification.objects.select_for_update(skip_locked=True)
+                .filter(status=StatusChoices.PENDING, scheduled_for__lte=timezone.now())
+                .order_by("scheduled_for")
+                .values_list("id", "priority")[: settings.NOTIFY_SCHEDULER_BATCH_SIZE]
+            )
+            if not due:
+                break
+            Notification.objects.filter(id__in=due).update(
+                status=StatusChoices.QUEUED,
+                locked_until=timezone.now() + timedelta(seconds=settings.NOTIFY_QUEUED_TIMEOUT),
             )
-            for recipient in notification.recipients.all():
-                success = results.get(recipient.recipient_type, False)
-                DeliveryLog.objects.create(
-                    recipient=recipient,
-                    status=StatusDeliveryChoices.SUCCESS if success else StatusDeliveryChoices.FAILED,
-                    error_message="" if success else f"Ошибка отправки через {recipient.recipient_type}",
+        with send_notification_task.app.producer_or_acquire() as producer:
+            for notification_id, priority in due.items():
+                send_notification_task.apply_async(
+                    args=(notification_id,),
+                    producer=producer,
+                    **priority_options(priority),
                 )
-            all_success = all(results.values())
-            notification.status = StatusChoices.COMPLETED if all_success else StatusChoices.FAILED
-            notification.save()
-            logger.info(f"Уведомление {notification_id} обработано. Успех: {all_success}")
-            return all_success
-        except Notification.DoesNotExist:
-            logger.error(f"Уведомление {notification_id} не найдено")
-            return False
-        except Exception as e:
-            logger.error(f"Ошибка отправки уведомления {notification_id}: {e}")
-            raise self.retry(exc=e) from e
+        dispatched += len(due)
+        if len(due) < settings.NOTIFY_SCHEDULER_BATCH_SIZE:
+            break
+    if dispatched:
+        logger.info(f"Планировщик запустил {dispatched} отложенных уведомлений")
+    return dispatched
+
+
+@shared_task
+def reap_stale_notifications_task() -> int:
+    """
+    Периодическая задача возврата зависших уведомлений.
+
+    Уведомления в очереди или в обработке с истекшей арендой (задача потеряна
+    брокером или воркер упал) возвращаются в статус ожидания и повторно
+    запускаются планировщиком. Аренду уведомления в обработке продлевает
+    каждая завершенная пачка и финализация, поэтому выполняющаяся рассылка
+    не возвращается. Токен запуска сбрасывается, и финализация прежнего запуска
+    не запишет результаты. Получатели, уже получившие сообщение,
+    пропускаются по маркерам доставки.
+    """
+    reaped: int = Notification.objects.filter(
+        status__in=[StatusChoices.QUEUED, StatusChoices.PROCESSING],
+        locked_until__lt=timezone.now(),
+    ).update(status=StatusChoices.PENDING, locked_until=None, run_token=None)
+    if reaped:
+        logger.warning(f"Возвращено в ожидание {reaped} уведомлений с истекшей арендой")
+    return reaped
+
+
+@shared_task
+def maintain_partitions_task() -> dict[str, list[str]]:
+    """
+    Периодическая задача обслуживания секций лога доставки.
+
+    Создает секции на NOTIFY_PARTITIONS_AHEAD месяцев вперед, выгружает
+    в архив и удаляет секции старше NOTIFY_LOG_RETENTION_DAYS дней.
+    """
+    return maintain_partitions(
+        settings.NOTIFY_PARTITIONS_AHEAD,
+        settings.NOTIFY_LOG_RETENTION_DAYS,
+        settings.NOTIFY_LOG_ARCHIVE_DIR,
+    )
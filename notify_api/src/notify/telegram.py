@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import threading
+import time
+
+import httpx
+from django.conf import settings
+
+from .aio import get_event_loop, run_sync
+from .channels import ChannelBackend, DeliveryError
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKED_CHATS = 10000
+
+_local = threading.local()
+
+
+class TelegramDeliveryError(DeliveryError):
+    """Ошибка доставки сообщения в Telegram."""
+
+
+class TokenBucket:
+    """Асинхронный token bucket для ограничения частоты запросов."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Приостановка выдачи токенов (ответ 429 с retry_after)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """Ожидание свободного токена."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncTelegramClient:
+    """
+    Асинхронный клиент Bot API с пулом соединений и ограничением частоты.
+
+    transport - транспорт httpx вместо сетевого (например, httpx.MockTransport в тестах).
+    """
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str,
+        concurrency: int,
+        global_rate: float,
+        per_chat_interval: float,
+        timeout: float,
+        max_throttle_retries: int,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.per_chat_interval = per_chat_interval
+        self.max_throttle_retries = max_throttle_retries
+        self._client = httpx.AsyncClient(
+            base_url=f"{api_url.rstrip('/')}/bot{token}/",
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=timeout,
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self._chat_next_send: dict[str, float] = {}
+
+    async def _wait_for_chat(self, chat_id: str) -> None:
+        """Соблюдение интервала между сообщениями в один чат."""
+        now = time.monotonic()
+        if len(self._chat_next_send) > MAX_TRACKED_CHATS:
+            self._chat_next_send = {key: value for key, value in self._chat_next_send.items() if value > now}
+        next_send = self._chat_next_send.get(chat_id, 0.0)
+        self._chat_next_send[chat_id] = max(now, next_send) + self.per_chat_interval
+        if next_send > now:
+            await asyncio.sleep(next_send - now)
+
+    async def send_message(self, chat_id: str, text: str) -> int:
+        """
+        Отправка сообщения с ожиданием retry_after при ответе 429.
+
+        Возвращает длительность запроса к Bot API в миллисекундах.
+        """
+        throttled = 0
+        async with self._semaphore:
+            while True:
+                await self._wait_for_chat(chat_id)
+                await self._bucket.acquire()
+                started = time.monotonic()
+                try:
+                    response = await self._client.post(
+                        "sendMessage",
+                        json={"chat_id": chat_id, "text": text, "parse_mode": "HTML"},
+                    )
+                except httpx.HTTPError as e:
+                    raise TelegramDeliveryError(f"Ошибка соединения с Telegram: {e}", retryable=True) from e
+                try:
+                    payload = response.json()
+                except ValueError:
+                    payload = {}
+                if payload.get("ok"):
+                    return int((time.monotonic() - started) * 1000)
+                error_code = payload.get("error_code", response.status_code)
+                description = payload.get("description", response.text)
+                retry_after = payload.get("parameters", {}).get("retry_after", 1)
+                if error_code == 429 and throttled < self.max_throttle_retries:
+                    logger.warning(f"Telegram ограничил частоту запросов, ожидание {retry_after} с")
+                    self._bucket.pause(retry_after)
+                    throttled += 1
+                    continue
+                raise TelegramDeliveryError(
+                    f"Error code: {error_code}. Description: {description}",
+                    retryable=error_code == 429 or error_code >= 500,
+                    permanent=error_code == 403 or (error_code == 400 and "chat not found" in description.lower()),
+                    retry_after=retry_after if error_code == 429 else None,
+                )
+
+    async def send_many(self, chat_ids: list[str], text: str) -> dict[str, int | TelegramDeliveryError]:
+        """Конкурентная отправка сообщения списку чатов: длительность или ошибка по каждому чату."""
+        results = await asyncio.gather(
+            *(self.send_message(chat_id, text) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+        outcomes: dict[str, int | TelegramDeliveryError] = {}
+        for chat_id, result in zip(chat_ids, results, strict=True):
+            if isinstance(result, TelegramDeliveryError | int):
+                outcomes[chat_id] = result
+            else:
+                outcomes[chat_id] = TelegramDeliveryError(str(result), retryable=True)
+        return outcomes
+
+    async def aclose(self) -> None:
+        """Закрытие пула соединений."""
+        await self._client.aclose()
+
+
+def get_telegram_client() -> AsyncTelegramClient:
+    """Клиент Telegram, привязанный к event loop текущего потока воркера."""
+    loop = get_event_loop()
+    client = getattr(_local, "client", None)
+    if client is None or getattr(_local, "loop", None) is not loop:
+        client = AsyncTelegramClient(
+            token=settings.TELEGRAM_BOT_TOKEN,
+            api_url=settings.TELEGRAM_API_URL,
+            concurrency=settings.TELEGRAM_CONCURRENCY,
+            global_rate=settings.TELEGRAM_GLOBAL_RATE,
+            per_chat_interval=settings.TELEGRAM_PER_CHAT_INTERVAL,
+            timeout=settings.TELEGRAM_TIMEOUT,
+            max_throttle_retries=settings.TELEGRAM_MAX_THROTTLE_RETRIES,
+        )
+        _local.client = client
+        _local.loop = loop
+    return client
+
+
+class TelegramChannel(ChannelBackend):
+    """Канал Telegram: конкурентная отправка через клиент Bot API потока воркера."""
+
+    def send_many(self, message: str, addresses: list[str], scope: str = "") -> dict[str, int | DeliveryError]:
+        if not settings.TELEGRAM_BOT_TOKEN:
+            logger.error("Telegram bot token не настроен")
+            return {address: DeliveryError("Telegram bot token не настроен") for address in addresses}
+        try:
+            return dict(run_sync(get_telegram_client().send_many(addresses, message)))
+        except Exception as e:
+            logger.error(f"Общая ошибка отправки telegram: {e}")
+            return {address: DeliveryError(str(e), retryable=True) for address in addresses}
@@ -1,11 +1,17 @@
 from django.urls import path
 
-from notify.views import NotifyViewSet
+from notify.views import AsyncNotifyView, MessageTemplateViewSet, NotifyViewSet
 
 from .apps import NotifyConfig
 
 app_name = NotifyConfig.name
 
 urlpatterns = [
-    path("", NotifyViewSet.as_view({"post": "create"}), name="notify"),
+    path("", NotifyViewSet.as_view({"post": "create", "get": "list"}), name="notify"),
+    path("async/", AsyncNotifyView.as_view(), name="notify-async"),
+    path("batch/", NotifyViewSet.as_view({"post": "batch"}), name="notify-batch"),
+    path("templates/", MessageTemplateViewSet.as_view({"post": "create", "get": "list"}), name="notify-templates"),
+    path("stats/", NotifyViewSet.as_view({"get": "stats"}), name="notify-stats"),
+    path("<int:pk>/", NotifyViewSet.as_view({"get": "retrieve"}), name="notify-detail"),
+    path("<int:pk>/logs/", NotifyViewSet.as_view({"get": "logs"}), name="notify-logs"),
 ]
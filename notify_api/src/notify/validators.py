@@ -1,6 +1,51 @@
+import ipaddress
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.http.request import validate_host
+
+from .channels import enabled_channels
+from .constants import EMAIL_REGEX, PHONE_REGEX, WEBHOOK_SCHEMES
+
+URL_VALIDATOR = URLValidator(schemes=list(WEBHOOK_SCHEMES))
+WEBHOOK_PREFIXES = tuple(f"{scheme}://" for scheme in WEBHOOK_SCHEMES)
+LOCAL_HOSTNAMES = ("localhost", "localhost.localdomain")
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Адрес из публичного интернета.
+
+    Частные сети, loopback, link-local (в том числе 169.254.169.254 метаданных
+    облака), зарезервированные и multicast адреса не публичные.
+    """
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
 
-from .constants import EMAIL_REGEX, TELEGRAM_ID_REGEX
+def check_webhook_host(host: str) -> None:
+    """
+    Проверка хоста webhook по WEBHOOK_ALLOWED_HOSTS и по адресу, если хост задан IP.
+
+    Имена хостов разрешаются в адреса и проверяются при отправке (notify.webhook).
+    """
+    host = host.lower().rstrip(".")
+    if not validate_host(host, settings.WEBHOOK_ALLOWED_HOSTS or ["*"]):
+        raise ValidationError(f"Хост webhook не входит в WEBHOOK_ALLOWED_HOSTS: {host}")
+    if settings.WEBHOOK_ALLOW_PRIVATE:
+        return
+    if host in LOCAL_HOSTNAMES or host.endswith(".localhost"):
+        raise ValidationError(f"Локальный хост webhook недопустим: {host}")
+    try:
+        public = is_public_address(host)
+    except ValueError:
+        return
+    if not public:
+        raise ValidationError(f"Адрес webhook из частной или служебной сети недопустим: {host}")
 
 
 class RecipientValidator:
@@ -12,28 +57,62 @@ class RecipientValidator:
         if not isinstance(recipient, str):
             raise ValidationError("Получатель должен быть строкой")
         recipient = recipient.strip()
-        if EMAIL_REGEX.match(recipient):
-            return "email"
-        elif TELEGRAM_ID_REGEX.match(recipient):
+        if recipient.isdecimal():
             return "telegram"
+        elif recipient[:8].lower().startswith(WEBHOOK_PREFIXES):
+            try:
+                URL_VALIDATOR(recipient)
+            except ValidationError:
+                raise ValidationError(f"Некорректный URL webhook: {recipient}") from None
+            check_webhook_host(urlsplit(recipient).hostname or "")
+            return "webhook"
+        elif EMAIL_REGEX.match(recipient):
+            return "email"
+        elif PHONE_REGEX.match(recipient):
+            return "sms"
         else:
             raise ValidationError(
-                f"Некорректный формат получателя: {recipient}. Должен быть email или числовой Telegram ID"
+                f"Некорректный формат получателя: {recipient}. "
+                "Должен быть email, числовой Telegram ID, номер телефона в формате +79991234567 или URL webhook"
+            )
+
+    @classmethod
+    def normalize_recipient(cls, recipient: str, recipient_type: str) -> str:
+        """
+        Каноническая форма адреса: домен email в нижнем регистре, Telegram ID как целое число,
+        схема и хост URL webhook в нижнем регистре без фрагмента. Учетные данные URL webhook
+        передаются как basic auth и сохраняются в исходном регистре.
+        """
+        recipient = recipient.strip()
+        if recipient_type == "telegram":
+            return str(int(recipient))
+        if recipient_type == "webhook":
+            parts = urlsplit(recipient)
+            userinfo, at, host = parts.netloc.rpartition("@")
+            return urlunsplit(
+                (parts.scheme.lower(), f"{userinfo}{at}{host.lower()}", parts.path or "/", parts.query, "")
             )
+        if recipient_type != "email":
+            return recipient
+        local_part, domain = recipient.rsplit("@", 1)
+        return f"{local_part}@{domain.lower()}"
 
     @classmethod
     def validate_recipients(cls, recipients: str | list) -> dict[str, list[str]]:
-        """Валидация одного или нескольких получателей."""
+        """Валидация, нормализация и удаление повторов получателей с сохранением порядка."""
         if isinstance(recipients, str):
             recipients = [recipients]
         if not recipients:
             raise ValidationError("Список получателей не может быть пустым")
         if not isinstance(recipients, list):
             raise ValidationError("Получатели должны быть строкой или списком строк")
-        validated_data: dict[str, list[str]] = {"email": [], "telegram": []}
+        channels = enabled_channels()
+        validated_data: dict[str, dict[str, None]] = {channel: {} for channel in channels}
         for recipient in recipients:
             recipient_type = cls.validate_recipient(recipient)
-            validated_data[recipient_type].append(recipient)
-        if not validated_data["email"] and not validated_data["telegram"]:
+            if recipient_type not in validated_data:
+                raise ValidationError(f"Канал доставки {recipient_type} отключен: {recipient}")
+            validated_data[recipient_type][cls.normalize_recipient(recipient, recipient_type)] = None
+        if not any(validated_data.values()):
             raise ValidationError("Не указано ни одного валидного получателя")
-        return validated_data
+        return {recipient_type: list(addresses) for recipient_type, addresses in validated_data.items()}
@@ -1,27 +1,205 @@
 import logging
+from collections.abc import Callable
 from datetime import timedelta
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.db import connection, transaction
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Max
 from django.http import HttpRequest, JsonResponse
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django_filters.utils import translate_validation
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from redis import Redis
+from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_207_MULTI_STATUS,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
 from rest_framework.viewsets import ViewSet
 
-from .choices import DelayChoices
-from .constants import DELAY_MAPPING
-from .models import Notification, Recipient
-from .openapi_schemas import NOTIFY_201, NOTIFY_400, NOTIFY_500, NOTIFY_EXM, NOTIFY_SETTINGS
-from .serializers import NotificationRequestSerializer, NotificationResponseSerializer
-from .tasks import send_notification_task
+from .bodies import store_bodies
+from .choices import PriorityChoices, StatusChoices
+from .constants import BULK_CREATE_BATCH_SIZE, DELAY_MAPPING, MAX_BATCH_SIZE, MAX_LENGTH_IDEMPOTENCY_KEY
+from .filters import DeliveryLogFilter, NotificationFilter
+from .idempotency import IdempotencyConflictError, content_hash, idempotency_store
+from .models import DeliveryLog, MessageTemplate, Notification, OutboxMessage, Recipient
+from .openapi_schemas import (
+    IDEMPOTENCY_KEY_PARAMETER,
+    NOTIFY_201,
+    NOTIFY_400,
+    NOTIFY_404,
+    NOTIFY_409,
+    NOTIFY_500,
+    NOTIFY_BATCH_201,
+    NOTIFY_BATCH_207,
+    NOTIFY_BATCH_EXM,
+    NOTIFY_DETAIL_200,
+    NOTIFY_EXM,
+    NOTIFY_LIST_200,
+    NOTIFY_LIST_PARAMETERS,
+    NOTIFY_LOGS_200,
+    NOTIFY_LOGS_PARAMETERS,
+    NOTIFY_SETTINGS,
+    NOTIFY_STATS_200,
+    TEMPLATE_201,
+    TEMPLATE_EXM,
+    TEMPLATE_LIST_200,
+    TEMPLATE_LIST_PARAMETERS,
+)
+from .pagination import KeysetPagination
+from .parsers import NDJSONParser, ORJSONParser, loads
+from .schedules import cron_occurrence
+from .serializers import (
+    DeliveryLogSerializer,
+    MessageTemplateRequestSerializer,
+    MessageTemplateSerializer,
+    NotificationBatchResponseSerializer,
+    NotificationRequestSerializer,
+    NotificationResponseSerializer,
+    NotificationStatusSerializer,
+    StatsQuerySerializer,
+    StatsResponseSerializer,
+)
+from .stats import get_delivery_stats
+from .tasks import priority_options, send_notification_task
 
 logger = logging.getLogger(__name__)
 
 
+class NotificationCreateMixin:
+    """Общая логика сохранения уведомлений для синхронного и асинхронного API."""
+
+    def _create_notifications(self, validated_items: list[dict]) -> list[Notification]:
+        """
+        Сохранение уведомлений и получателей пакетными вставками.
+
+        Задачи отправки наступивших уведомлений записываются в outbox в той же
+        транзакции и публикуются в брокер процессом relay_outbox после фиксации.
+        Отложенные уведомления запускает периодическая задача dispatch_due_notifications_task.
+        Тексты сообщений пакета сохраняются по хешу одним запросом, одинаковый текст - один раз.
+        """
+        notifications: list[Notification] = []
+        bodies = store_bodies(item["message"] for item in validated_items if item.get("message"))
+        for item in validated_items:
+            scheduled_time = self._calculate_scheduled_time(item["delay"], item.get("send_at"), item.get("cron", ""))
+            now = timezone.now()
+            is_due = scheduled_time <= now
+            interval = item.get("interval")
+            notifications.append(
+                Notification(
+                    body_id=bodies.get(item.get("message", "")),
+                    template=item.get("template"),
+                    context=item.get("context", {}),
+                    delay=item["delay"],
+                    priority=item.get("priority", PriorityChoices.NORMAL),
+                    scheduled_for=scheduled_time,
+                    status=StatusChoices.QUEUED if is_due else StatusChoices.PENDING,
+                    locked_until=now + timedelta(seconds=settings.NOTIFY_QUEUED_TIMEOUT) if is_due else None,
+                    recurrence_interval=timedelta(seconds=interval) if interval else None,
+                    recurrence_cron=item.get("cron", ""),
+                    recurrence_until=item.get("until"),
+                    recipients_count=sum(len(addresses) for addresses in item["recipient"].values()),
+                )
+            )
+        notifications = Notification.objects.bulk_create(notifications, batch_size=BULK_CREATE_BATCH_SIZE)
+        recipients = []
+        for notification, item in zip(notifications, validated_items, strict=True):
+            contexts = item.get("recipient_context", {})
+            for recipient_type, addresses in item["recipient"].items():
+                for address in addresses:
+                    recipients.append(
+                        Recipient(
+                            notification=notification,
+                            address=address,
+                            recipient_type=recipient_type,
+                            context=contexts.get(address),
+                        )
+                    )
+        Recipient.objects.bulk_create(recipients, batch_size=BULK_CREATE_BATCH_SIZE)
+        OutboxMessage.objects.bulk_create(
+            [
+                OutboxMessage(
+                    task_name=send_notification_task.name,
+                    args=[notification.id],
+                    options=priority_options(notification.priority),
+                )
+                for notification in notifications
+                if notification.status == StatusChoices.QUEUED
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+        )
+        return notifications
+
+    def _resolve_templates(self, validated_items: list[dict]) -> dict[int, dict]:
+        """
+        Замена имен шаблонов в данных уведомлений на версии шаблонов одним запросом.
+
+        Без template_version берется последняя версия шаблона.
+        Возвращает ошибки по индексам элементов с неизвестным шаблоном.
+        """
+        names = {item["template"] for item in validated_items if item.get("template")}
+        if not names:
+            return {}
+        versions: dict[tuple[str, int], MessageTemplate] = {}
+        latest: dict[str, MessageTemplate] = {}
+        for template in MessageTemplate.objects.filter(name__in=names).only("id", "name", "version"):
+            versions[(template.name, template.version)] = template
+            if template.name not in latest or template.version > latest[template.name].version:
+                latest[template.name] = template
+        errors = {}
+        for index, item in enumerate(validated_items):
+            name = item.get("template")
+            if not name:
+                continue
+            version = item.get("template_version")
+            resolved = latest.get(name) if version is None else versions.get((name, version))
+            if resolved is None:
+                suffix = f" версии {version}" if version is not None else ""
+                errors[index] = {"template": [f"Шаблон {name}{suffix} не найден"]}
+            else:
+                item["template"] = resolved
+        return errors
+
+    def _build_response_data(self, notification: Notification, recipients_data: dict[str, list[str]]) -> dict:
+        """Формирование данных ответа по созданному уведомлению."""
+        return {
+            "id": notification.id,
+            "status": "scheduled",
+            "scheduled_for": notification.scheduled_for,
+            "recipients_count": sum(len(addrs) for addrs in recipients_data.values()),
+        }
+
+    def _calculate_scheduled_time(
+        self,
+        delay: int,
+        send_at: timezone.datetime | None = None,
+        cron: str = "",
+    ) -> timezone.datetime:
+        """
+        Расчет времени отправки: точное время или задержка через маппинг.
+
+        Первая отправка уведомления по cron без send_at - ближайшее время
+        расписания после задержки, а не момент создания.
+        """
+        if send_at is not None:
+            return send_at
+        time_delta = DELAY_MAPPING.get(delay, timedelta(0))
+        if cron:
+            return cron_occurrence(cron, timezone.now() + time_delta)
+        return timezone.now() + time_delta
+
+
 @extend_schema(tags=[NOTIFY_SETTINGS["name"]])
 @extend_schema_view(
     create=extend_schema(
@@ -30,23 +208,188 @@ logger = logging.getLogger(__name__)
             "Создание и планирование уведомления для отправки по email и/или Telegram.\n\n"
             "**Поддерживаемые типы получателей:**\n"
             "- Email адреса (user@example.com)\n"
-            "- Telegram ID (числовые идентификаторы)\n\n"
+            "- Telegram ID (числовые идентификаторы)\n"
+            "- Номера телефонов для SMS (+79991234567), если канал sms включен\n"
+            "- URL webhook (https://example.com/hook), если канал webhook включен\n\n"
             "**Задержки отправки:**\n"
             "- 0: Немедленная отправка\n"
             "- 1: Отправка через 1 час\n"
-            "- 2: Отправка через 1 день"
+            "- 2: Отправка через 1 день\n\n"
+            "**Расписание:**\n"
+            "- `send_at`: точное время отправки (вместо `delay`)\n"
+            "- `interval`: повтор каждые N секунд\n"
+            "- `cron`: повтор по cron выражению (`минута час день месяц день_недели`)\n"
+            "- `until`: время окончания повторов\n\n"
+            "Отложенные и повторяющиеся уведомления запускаются планировщиком по полю `scheduled_for`.\n\n"
+            "**Идемпотентность:** заголовок `Idempotency-Key` защищает от повторного создания "
+            "уведомления при повторе запроса клиентом. Повтор с тем же ключом и телом возвращает "
+            "сохраненный ответ с заголовком `Idempotent-Replayed: true`."
         ),
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request=NotificationRequestSerializer,
-        responses={201: NOTIFY_201, 400: NOTIFY_400, 500: NOTIFY_500},
+        responses={201: NOTIFY_201, 400: NOTIFY_400, 409: NOTIFY_409, 500: NOTIFY_500},
         examples=NOTIFY_EXM,
-    )
+    ),
+    batch=extend_schema(
+        summary="Пакетное создание и отправка уведомлений",
+        description=(
+            "Создание пакета уведомлений одним запросом. Тело запроса - JSON массив "
+            "или NDJSON поток (`application/x-ndjson`) объектов в формате одиночного уведомления.\n\n"
+            "Каждый элемент валидируется отдельно, все валидные уведомления и их получатели "
+            "сохраняются в одной транзакции вместе с задачами отправки в outbox.\n\n"
+            f"Максимальный размер пакета: {MAX_BATCH_SIZE}.\n\n"
+            "Поддерживается заголовок `Idempotency-Key`, как при создании одного уведомления."
+        ),
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        request=NotificationRequestSerializer(many=True),
+        responses={
+            201: NOTIFY_BATCH_201,
+            207: NOTIFY_BATCH_207,
+            400: NOTIFY_400,
+            409: NOTIFY_409,
+            500: NOTIFY_500,
+        },
+        examples=NOTIFY_BATCH_EXM,
+    ),
+    list=extend_schema(
+        summary="Список уведомлений",
+        description=(
+            "Уведомления от новых к старым с фильтрами по статусу, приоритету, времени создания "
+            "и адресу получателя.\n\n"
+            "Пагинация курсорная: ссылка на следующую страницу возвращается в поле `next`, "
+            "время ответа не зависит от глубины страницы."
+        ),
+        parameters=NOTIFY_LIST_PARAMETERS,
+        responses={200: NOTIFY_LIST_200, 400: NOTIFY_400},
+    ),
+    retrieve=extend_schema(
+        summary="Статус уведомления",
+        description="Статус уведомления, количество получателей и счетчики доставки.",
+        responses={200: NOTIFY_DETAIL_200, 404: NOTIFY_404},
+    ),
+    logs=extend_schema(
+        summary="Лог доставки уведомления",
+        description="Записи лога доставки уведомления от новых к старым с курсорной пагинацией.",
+        parameters=NOTIFY_LOGS_PARAMETERS,
+        responses={200: NOTIFY_LOGS_200, 400: NOTIFY_400, 404: NOTIFY_404},
+    ),
+    stats=extend_schema(
+        summary="Статистика доставки",
+        description=(
+            "Количество доставок по статусам, доля успешных и средняя длительность отправки "
+            "по интервалам (`minute`, `hour`, `day`) и каналам за период.\n\n"
+            "Данные читаются из поминутной таблицы статистики, которая пополняется при финализации "
+            "уведомлений, а не из лога доставки. По умолчанию - последний час с шагом в минуту."
+        ),
+        parameters=[StatsQuerySerializer],
+        responses={200: NOTIFY_STATS_200, 400: NOTIFY_400},
+    ),
 )
-class NotifyViewSet(ViewSet):
+class NotifyViewSet(NotificationCreateMixin, ViewSet):
     """ViewSet для обработки уведомлений."""
 
+    parser_classes = [ORJSONParser, NDJSONParser]
+
     @transaction.atomic
     def create(self, request: Request) -> Response:
         """Создание и отправка уведомления."""
+        return self._idempotent(request, self._create)
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request: Request) -> Response:
+        """Пакетное создание и отправка уведомлений."""
+        return self._idempotent(request, self._batch)
+
+    def list(self, request: Request) -> Response:
+        """Список уведомлений с фильтрами и курсорной пагинацией."""
+        filterset = NotificationFilter(request.query_params, queryset=Notification.objects.select_related("body"))
+        if not filterset.is_valid():
+            return Response(
+                {"error": "Validation error", "details": translate_validation(filterset.errors).detail},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        paginator = KeysetPagination(ordering=("created_at", "id"))
+        notifications = paginator.paginate_queryset(filterset.qs, request, view=self)
+        serializer = NotificationStatusSerializer(notifications, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def retrieve(self, request: Request, pk: int) -> Response:
+        """Статус уведомления со счетчиками доставки."""
+        notification = Notification.objects.select_related("body").filter(id=pk).first()
+        if notification is None:
+            return Response({"error": "Not found"}, status=HTTP_404_NOT_FOUND)
+        return Response(NotificationStatusSerializer(notification).data, status=HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def logs(self, request: Request, pk: int) -> Response:
+        """Лог доставки уведомления с курсорной пагинацией."""
+        if not Notification.objects.filter(id=pk).exists():
+            return Response({"error": "Not found"}, status=HTTP_404_NOT_FOUND)
+        filterset = DeliveryLogFilter(
+            request.query_params,
+            queryset=DeliveryLog.objects.filter(recipient__notification_id=pk).select_related("recipient"),
+        )
+        if not filterset.is_valid():
+            return Response(
+                {"error": "Validation error", "details": translate_validation(filterset.errors).detail},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        paginator = KeysetPagination(ordering=("id",))
+        logs = paginator.paginate_queryset(filterset.qs, request, view=self)
+        return paginator.get_paginated_response(DeliveryLogSerializer(logs, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def stats(self, request: Request) -> Response:
+        """Статистика доставки по интервалам и каналам из таблицы DeliveryStats."""
+        serializer = StatsQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Validation error", "details": serializer.errors},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        stats = get_delivery_stats(**serializer.validated_data)
+        return Response(StatsResponseSerializer(stats).data, status=HTTP_200_OK)
+
+    def _idempotent(self, request: Request, handler: Callable[[Request], Response]) -> Response:
+        """
+        Обработка запроса с учетом заголовка Idempotency-Key.
+
+        Успешный ответ сохраняется после фиксации транзакции и возвращается
+        на повторные запросы с тем же ключом и телом.
+        """
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if not idempotency_key:
+            return handler(request)
+        if len(idempotency_key) > MAX_LENGTH_IDEMPOTENCY_KEY:
+            return Response(
+                {
+                    "error": "Validation error",
+                    "details": {"Idempotency-Key": [f"Длина ключа превышает {MAX_LENGTH_IDEMPOTENCY_KEY} символов"]},
+                },
+                status=HTTP_400_BAD_REQUEST,
+            )
+        fingerprint = content_hash(request.path, request.data)
+        try:
+            stored = idempotency_store.begin(idempotency_key, fingerprint)
+        except IdempotencyConflictError as e:
+            return Response({"error": "Idempotency conflict", "details": str(e)}, status=HTTP_409_CONFLICT)
+        if stored is not None:
+            logger.info(f"Повторный запрос с ключом идемпотентности {idempotency_key}")
+            return Response(stored["data"], status=stored["status"], headers={"Idempotent-Replayed": "true"})
+        try:
+            response = handler(request)
+        except Exception:
+            idempotency_store.release(idempotency_key)
+            raise
+        if response.status_code >= HTTP_400_BAD_REQUEST:
+            idempotency_store.release(idempotency_key)
+            return response
+        stored = {"status": response.status_code, "data": response.data}
+        transaction.on_commit(lambda: idempotency_store.complete(idempotency_key, fingerprint, stored))
+        return response
+
+    def _create(self, request: Request) -> Response:
+        """Создание одного уведомления."""
         serializer = NotificationRequestSerializer(data=request.data)
 
         if not serializer.is_valid():
@@ -54,36 +397,20 @@ class NotifyViewSet(ViewSet):
                 {"error": "Validation error", "details": serializer.errors},
                 status=HTTP_400_BAD_REQUEST,
             )
+        template_errors = self._resolve_templates([serializer.validated_data])
+        if template_errors:
+            return Response(
+                {"error": "Validation error", "details": template_errors[0]},
+                status=HTTP_400_BAD_REQUEST,
+            )
         try:
             validated_data = serializer.validated_data
             recipients_data = validated_data["recipient"]
-            delay = validated_data["delay"]
-            scheduled_time = self._calculate_scheduled_time(delay)
-            notification = Notification.objects.create(
-                message=validated_data["message"],
-                delay=delay,
-                scheduled_for=scheduled_time,
-            )
-            recipients = []
-            for recipient_type, addresses in recipients_data.items():
-                for address in addresses:
-                    recipients.append(
-                        Recipient(
-                            notification=notification,
-                            address=address,
-                            recipient_type=recipient_type,
-                        )
-                    )
-            Recipient.objects.bulk_create(recipients)
-            self._schedule_notification_task(notification.id, delay, scheduled_time)
+            (notification,) = self._create_notifications([validated_data])
             logger.info(f"Уведомление {notification.id} создано. Получатели: {recipients_data}")
-            response_data = {
-                "id": notification.id,
-                "status": "scheduled",
-                "scheduled_for": scheduled_time,
-                "recipients_count": sum(len(addrs) for addrs in recipients_data.values()),
-            }
-            response_serializer = NotificationResponseSerializer(response_data)
+            response_serializer = NotificationResponseSerializer(
+                self._build_response_data(notification, recipients_data)
+            )
             return Response(response_serializer.data, status=HTTP_201_CREATED)
         except Exception as e:
             logger.error(f"Ошибка создания уведомления: {e}")
@@ -92,20 +419,211 @@ class NotifyViewSet(ViewSet):
                 status=HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _calculate_scheduled_time(self, delay: int) -> timezone.datetime:
-        """Расчет времени отправки через маппинг."""
-        time_delta = DELAY_MAPPING.get(delay, timedelta(0))
-        return timezone.now() + time_delta
+    def _batch(self, request: Request) -> Response:
+        """Создание пакета уведомлений."""
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {
+                    "error": "Validation error",
+                    "details": {"non_field_errors": ["Ожидается непустой список уведомлений"]},
+                },
+                status=HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > MAX_BATCH_SIZE:
+            return Response(
+                {
+                    "error": "Validation error",
+                    "details": {"non_field_errors": [f"Размер пакета превышает {MAX_BATCH_SIZE} уведомлений"]},
+                },
+                status=HTTP_400_BAD_REQUEST,
+            )
+        results: list[dict] = [{} for _ in items]
+        valid_indexes = []
+        valid_items = []
+        for index, item in enumerate(items):
+            serializer = NotificationRequestSerializer(data=item)
+            if serializer.is_valid():
+                valid_indexes.append(index)
+                valid_items.append(serializer.validated_data)
+            else:
+                results[index] = {"index": index, "status": "rejected", "errors": serializer.errors}
+        template_errors = self._resolve_templates(valid_items)
+        for position, errors in template_errors.items():
+            index = valid_indexes[position]
+            results[index] = {"index": index, "status": "rejected", "errors": errors}
+        valid_indexes = [index for position, index in enumerate(valid_indexes) if position not in template_errors]
+        valid_items = [item for position, item in enumerate(valid_items) if position not in template_errors]
+        if not valid_items:
+            return Response(
+                {
+                    "error": "Validation error",
+                    "details": {str(result["index"]): result["errors"] for result in results},
+                },
+                status=HTTP_400_BAD_REQUEST,
+            )
+        try:
+            with transaction.atomic():
+                notifications = self._create_notifications(valid_items)
+        except Exception as e:
+            logger.error(f"Ошибка пакетного создания уведомлений: {e}")
+            return Response(
+                {"error": "Internal server error"},
+                status=HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        for index, item, notification in zip(valid_indexes, valid_items, notifications, strict=True):
+            results[index] = {"index": index, **self._build_response_data(notification, item["recipient"])}
+        logger.info(f"Пакет уведомлений создан: принято {len(valid_items)}, отклонено {len(items) - len(valid_items)}")
+        response_serializer = NotificationBatchResponseSerializer(
+            {
+                "accepted": len(valid_items),
+                "rejected": len(items) - len(valid_items),
+                "results": results,
+            }
+        )
+        return Response(
+            response_serializer.data,
+            status=HTTP_201_CREATED if len(valid_items) == len(items) else HTTP_207_MULTI_STATUS,
+        )
+
+
+@extend_schema(tags=[NOTIFY_SETTINGS["name"]])
+@extend_schema_view(
+    create=extend_schema(
+        summary="Создание версии шаблона сообщения",
+        description=(
+            "Шаблоны используют синтаксис шаблонов Django (`{{ name }}`, `{% if %}`). "
+            "Тема и текст задаются для всех каналов, `variants` переопределяет их для канала, "
+            "`html` - HTML версия письма.\n\n"
+            "Версии неизменяемы: запрос с существующим именем создает следующую версию. "
+            "Уведомление по шаблону без `template_version` использует последнюю версию."
+        ),
+        request=MessageTemplateRequestSerializer,
+        responses={201: TEMPLATE_201, 400: NOTIFY_400, 409: NOTIFY_409},
+        examples=TEMPLATE_EXM,
+    ),
+    list=extend_schema(
+        summary="Список версий шаблонов",
+        description="Версии шаблонов от новых к старым с фильтром по имени и курсорной пагинацией.",
+        parameters=TEMPLATE_LIST_PARAMETERS,
+        responses={200: TEMPLATE_LIST_200},
+    ),
+)
+class MessageTemplateViewSet(ViewSet):
+    """ViewSet для управления шаблонами сообщений."""
 
-    def _schedule_notification_task(self, notification_id: int, delay: int, scheduled_time: timezone.datetime) -> None:
-        """Планирование задачи отправки."""
-        if delay == DelayChoices.IMMEDIATE:
-            send_notification_task.delay(notification_id)
-        else:
-            send_notification_task.apply_async(
-                args=(notification_id,),
-                eta=scheduled_time,
+    parser_classes = [ORJSONParser]
+
+    def create(self, request: Request) -> Response:
+        """Создание следующей версии шаблона."""
+        serializer = MessageTemplateRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Validation error", "details": serializer.errors},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        data = serializer.validated_data
+        try:
+            with transaction.atomic():
+                last = MessageTemplate.objects.filter(name=data["name"]).aggregate(version=Max("version"))["version"]
+                template = MessageTemplate.objects.create(**data, version=(last or 0) + 1)
+        except IntegrityError:
+            return Response(
+                {"error": "Conflict", "details": f"Версия шаблона {data['name']} создана параллельным запросом"},
+                status=HTTP_409_CONFLICT,
+            )
+        logger.info(f"Создана версия шаблона {template}")
+        return Response(MessageTemplateSerializer(template).data, status=HTTP_201_CREATED)
+
+    def list(self, request: Request) -> Response:
+        """Список версий шаблонов с курсорной пагинацией."""
+        templates = MessageTemplate.objects.all()
+        name = request.query_params.get("name")
+        if name:
+            templates = templates.filter(name=name)
+        paginator = KeysetPagination(ordering=("id",))
+        page = paginator.paginate_queryset(templates, request, view=self)
+        return paginator.get_paginated_response(MessageTemplateSerializer(page, many=True).data)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncNotifyView(NotificationCreateMixin, View):
+    """
+    Асинхронное создание уведомления для запуска под ASGI.
+
+    Валидация выполняется в event loop, обращения к Redis и транзакционная
+    запись в БД - через sync_to_async, поэтому ожидание ввода-вывода не занимает
+    воркер сервера. Публикация в брокер вынесена в outbox.
+    """
+
+    http_method_names = ["post"]
+
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        """Создание и отправка уведомления."""
+        try:
+            data = loads(request.body)
+        except ValueError:
+            return JsonResponse(
+                {"error": "Validation error", "details": {"non_field_errors": ["Некорректный JSON"]}},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        serializer = NotificationRequestSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(
+                {"error": "Validation error", "details": serializer.errors},
+                status=HTTP_400_BAD_REQUEST,
             )
+        template_errors = await sync_to_async(self._resolve_templates)([serializer.validated_data])
+        if template_errors:
+            return JsonResponse(
+                {"error": "Validation error", "details": template_errors[0]},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        idempotency_key = request.headers.get("Idempotency-Key", "")
+        fingerprint = content_hash(request.path, data)
+        if idempotency_key:
+            if len(idempotency_key) > MAX_LENGTH_IDEMPOTENCY_KEY:
+                return JsonResponse(
+                    {
+                        "error": "Validation error",
+                        "details": {
+                            "Idempotency-Key": [f"Длина ключа превышает {MAX_LENGTH_IDEMPOTENCY_KEY} символов"]
+                        },
+                    },
+                    status=HTTP_400_BAD_REQUEST,
+                )
+            try:
+                stored = await sync_to_async(idempotency_store.begin, thread_sensitive=False)(
+                    idempotency_key, fingerprint
+                )
+            except IdempotencyConflictError as e:
+                return JsonResponse({"error": "Idempotency conflict", "details": str(e)}, status=HTTP_409_CONFLICT)
+            if stored is not None:
+                logger.info(f"Повторный запрос с ключом идемпотентности {idempotency_key}")
+                return JsonResponse(stored["data"], status=stored["status"], headers={"Idempotent-Replayed": "true"})
+        validated_data = serializer.validated_data
+        try:
+            notification = await sync_to_async(self._save_notification)(validated_data)
+        except Exception as e:
+            logger.error(f"Ошибка создания уведомления: {e}")
+            if idempotency_key:
+                await sync_to_async(idempotency_store.release, thread_sensitive=False)(idempotency_key)
+            return JsonResponse({"error": "Internal server error"}, status=HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.info(f"Уведомление {notification.id} создано. Получатели: {validated_data['recipient']}")
+        response_data = NotificationResponseSerializer(
+            self._build_response_data(notification, validated_data["recipient"])
+        ).data
+        if idempotency_key:
+            await sync_to_async(idempotency_store.complete, thread_sensitive=False)(
+                idempotency_key, fingerprint, {"status": HTTP_201_CREATED, "data": response_data}
+            )
+        return JsonResponse(response_data, status=HTTP_201_CREATED)
+
+    def _save_notification(self, validated_data: dict) -> Notification:
+        """Сохранение уведомления в транзакции."""
+        with transaction.atomic():
+            (notification,) = self._create_notifications([validated_data])
+        return notification
 
 
 def health_check(request: HttpRequest) -> JsonResponse:
@@ -0,0 +1,294 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import socket
+import threading
+import time
+from collections import defaultdict
+from importlib.util import find_spec
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from redis import Redis
+
+from .aio import get_event_loop, run_sync
+from .channels import ChannelBackend, DeliveryError
+from .idempotency import content_hash, redis_client
+from .validators import check_webhook_host, is_public_address
+
+logger = logging.getLogger(__name__)
+
+HAS_H2 = find_spec("h2") is not None
+BACKOFF_KEY_PREFIX = "webhook:backoff"
+SIGNATURE_HEADER = "X-Notify-Signature"
+TIMESTAMP_HEADER = "X-Notify-Timestamp"
+PERMANENT_STATUS_CODE = 410
+RETRYABLE_STATUS_CODES = (408, 425, 429)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_local = threading.local()
+
+
+class WebhookDeliveryError(DeliveryError):
+    """Ошибка доставки события на webhook endpoint."""
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    """Подпись HMAC-SHA256 тела запроса с меткой времени: sha256=<hex>."""
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+class EndpointBackoff:
+    """
+    Экспоненциальная пауза отправки на endpoint после ошибок в Redis.
+
+    Пауза общая для всех воркеров и задач: после ошибки endpoint не получает
+    запросов base * 2^(n-1) секунд (не более max_delay), успешный ответ ее сбрасывает.
+    """
+
+    def __init__(self, client: Redis, base: float, max_delay: float) -> None:
+        self.client = client
+        self.base = base
+        self.max_delay = max_delay
+
+    def _key(self, url: str) -> str:
+        return f"{BACKOFF_KEY_PREFIX}:{content_hash(url)}"
+
+    def blocked(self, urls: list[str]) -> dict[str, float]:
+        """Endpoint'ы на паузе и оставшееся время паузы в секундах."""
+        if not urls:
+            return {}
+        now = time.time()
+        states = self.client.mget([self._key(url) for url in urls])
+        blocked = {}
+        for url, state in zip(urls, states, strict=True):
+            if state is not None:
+                until = json.loads(state)["until"]
+                if until > now:
+                    blocked[url] = until - now
+        return blocked
+
+    def update(self, failed: dict[str, float | None], succeeded: list[str]) -> None:
+        """
+        Учет результатов отправки.
+
+        failed - endpoint'ы с ошибкой и пауза из Retry-After (None - экспоненциальная пауза).
+        """
+        if not failed and not succeeded:
+            return
+        states = self.client.mget([self._key(url) for url in failed]) if failed else []
+        now = time.time()
+        pipeline = self.client.pipeline(transaction=False)
+        for (url, retry_after), state in zip(failed.items(), states, strict=True):
+            failures = json.loads(state)["failures"] + 1 if state is not None else 1
+            delay = min(self.max_delay, retry_after or self.base * 2 ** (failures - 1))
+            record = json.dumps({"failures": failures, "until": now + delay})
+            pipeline.set(self._key(url), record, ex=int(self.max_delay * 2) + 1)
+        if succeeded:
+            pipeline.delete(*(self._key(url) for url in succeeded))
+        pipeline.execute()
+
+
+class AsyncWebhookClient:
+    """
+    Асинхронный клиент webhook с пулом keep-alive соединений.
+
+    При установленном h2 используется HTTP/2: запросы к одному хосту
+    мультиплексируются в одном соединении. Число одновременных запросов
+    к хосту в пачке ограничено per_host_concurrency.
+
+    Хост разрешается в адреса перед отправкой, и запрос идет на проверенный
+    адрес (заголовок Host и SNI - имя хоста): без allow_private хост с
+    адресом из частной или служебной сети не запрашивается, а смена DNS
+    записи после проверки не направит запрос во внутреннюю сеть.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        timeout: float,
+        max_connections: int,
+        per_host_concurrency: int,
+        http2: bool,
+        allow_private: bool = False,
+    ) -> None:
+        self.secret = secret
+        self.per_host_concurrency = per_host_concurrency
+        self.allow_private = allow_private
+        self._client = httpx.AsyncClient(
+            http2=http2 and HAS_H2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+            follow_redirects=False,
+        )
+
+    def _headers(self, body: bytes) -> dict[str, str]:
+        """Заголовки запроса с подписью тела."""
+        timestamp = str(int(time.time()))
+        headers = {"Content-Type": "application/json", TIMESTAMP_HEADER: timestamp}
+        if self.secret:
+            headers[SIGNATURE_HEADER] = sign_payload(self.secret, timestamp, body)
+        return headers
+
+    async def resolve(self, host: str, port: int) -> str:
+        """Проверенный адрес хоста webhook для подключения."""
+        try:
+            check_webhook_host(host)
+        except ValidationError as e:
+            raise WebhookDeliveryError(e.messages[0]) from None
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as e:
+            raise WebhookDeliveryError(f"Хост {host} не разрешается: {e}", retryable=True) from e
+        addresses = [str(info[4][0]) for info in infos]
+        if not self.allow_private and not all(is_public_address(address) for address in addresses):
+            raise WebhookDeliveryError(f"Хост {host} разрешается в адрес частной или служебной сети")
+        return addresses[0]
+
+    async def send(self, url: str, body: bytes, address: str) -> int:
+        """
+        Отправка события на endpoint по проверенному адресу хоста.
+
+        Возвращает длительность запроса в миллисекундах.
+        """
+        parts = urlsplit(url)
+        host = f"[{address}]" if ":" in address else address
+        target = urlunsplit(
+            (parts.scheme, f"{host}:{parts.port or DEFAULT_PORTS[parts.scheme]}", parts.path, parts.query, "")
+        )
+        headers = {**self._headers(body), "Host": parts.netloc.rpartition("@")[2]}
+        started = time.monotonic()
+        try:
+            response = await self._client.post(
+                target,
+                content=body,
+                headers=headers,
+                auth=(parts.username, parts.password or "") if parts.username else None,
+                extensions={"sni_hostname": parts.hostname} if parts.scheme == "https" else None,
+            )
+        except httpx.HTTPError as e:
+            raise WebhookDeliveryError(f"Ошибка соединения с {url}: {e}", retryable=True) from e
+        if response.is_success:
+            return int((time.monotonic() - started) * 1000)
+        status = response.status_code
+        retry_after = response.headers.get("Retry-After", "")
+        raise WebhookDeliveryError(
+            f"HTTP {status}: {response.text[:200]}",
+            retryable=status >= 500 or status in RETRYABLE_STATUS_CODES,
+            permanent=status == PERMANENT_STATUS_CODE,
+            retry_after=float(retry_after) if retry_after.isdecimal() else None,
+        )
+
+    async def _send_host(self, urls: list[str], bodies: dict[str, bytes]) -> list[int | BaseException]:
+        """
+        Отправка пачки событий на endpoint'ы одного хоста через общее соединение.
+
+        Семафор живет в пределах пачки: клиент привязан к event loop потока
+        воркера, и пачки одного клиента выполняются последовательно.
+        """
+        parts = urlsplit(urls[0])
+        try:
+            address = await self.resolve(parts.hostname or "", parts.port or DEFAULT_PORTS[parts.scheme])
+        except WebhookDeliveryError as e:
+            return [e] * len(urls)
+        semaphore = asyncio.Semaphore(self.per_host_concurrency)
+
+        async def send(url: str) -> int:
+            async with semaphore:
+                return await self.send(url, bodies[url], address)
+
+        return await asyncio.gather(*(send(url) for url in urls), return_exceptions=True)
+
+    async def send_many(self, bodies: dict[str, bytes]) -> dict[str, int | WebhookDeliveryError]:
+        """Отправка событий endpoint'ам (URL -> тело), сгруппированным по хостам."""
+        by_host: dict[str, list[str]] = defaultdict(list)
+        for url in bodies:
+            by_host[urlsplit(url).netloc].append(url)
+        host_results = await asyncio.gather(*(self._send_host(host_urls, bodies) for host_urls in by_host.values()))
+        outcomes: dict[str, int | WebhookDeliveryError] = {}
+        for host_urls, results in zip(by_host.values(), host_results, strict=True):
+            for url, result in zip(host_urls, results, strict=True):
+                if isinstance(result, WebhookDeliveryError | int):
+                    outcomes[url] = result
+                else:
+                    outcomes[url] = WebhookDeliveryError(str(result), retryable=True)
+        return outcomes
+
+    async def aclose(self) -> None:
+        """Закрытие пула соединений."""
+        await self._client.aclose()
+
+
+def get_webhook_client() -> AsyncWebhookClient:
+    """Клиент webhook, привязанный к event loop текущего потока воркера."""
+    loop = get_event_loop()
+    client = getattr(_local, "client", None)
+    if client is None or getattr(_local, "loop", None) is not loop:
+        client = AsyncWebhookClient(
+            secret=settings.WEBHOOK_SECRET,
+            timeout=settings.WEBHOOK_TIMEOUT,
+            max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+            per_host_concurrency=settings.WEBHOOK_PER_HOST_CONCURRENCY,
+            http2=settings.WEBHOOK_HTTP2,
+            allow_private=settings.WEBHOOK_ALLOW_PRIVATE,
+        )
+        _local.client = client
+        _local.loop = loop
+    return client
+
+
+class WebhookChannel(ChannelBackend):
+    """
+    Канал HTTP webhook: POST события с подписью HMAC на адрес получателя.
+
+    Событие получает идентификатор из области доставки и URL, одинаковый
+    при повторах, по нему получатель отбрасывает дубликаты. Endpoint'ы на
+    паузе после ошибок не запрашиваются, задача повторяет их после паузы.
+    """
+
+    def __init__(self) -> None:
+        if settings.WEBHOOK_HTTP2 and not HAS_H2:
+            logger.warning("Пакет h2 не установлен, webhook отправляются по HTTP/1.1")
+        self.backoff = EndpointBackoff(redis_client, settings.WEBHOOK_BACKOFF_BASE, settings.WEBHOOK_BACKOFF_MAX)
+
+    def send_many(self, message: str, addresses: list[str], scope: str = "") -> dict[str, int | DeliveryError]:
+        results: dict[str, int | DeliveryError] = {
+            url: DeliveryError(
+                f"Endpoint на паузе после ошибок еще {remaining:.0f} с",
+                retryable=True,
+                retry_after=remaining,
+            )
+            for url, remaining in self.backoff.blocked(addresses).items()
+        }
+        to_send = [url for url in addresses if url not in results]
+        if not to_send:
+            return results
+        sent_at = timezone.now().isoformat()
+        bodies = {
+            url: json.dumps(
+                {"id": content_hash(scope, url), "message": message, "sent_at": sent_at},
+                ensure_ascii=False,
+            ).encode()
+            for url in to_send
+        }
+        try:
+            sent = run_sync(get_webhook_client().send_many(bodies))
+        except Exception as e:
+            logger.error(f"Общая ошибка отправки webhook: {e}")
+            sent = {url: WebhookDeliveryError(str(e), retryable=True) for url in to_send}
+        self.backoff.update(
+            {
+                url: result.retry_after
+                for url, result in sent.items()
+                if isinstance(result, WebhookDeliveryError) and result.retryable
+            },
+            [url for url, result in sent.items() if not isinstance(result, DeliveryError)],
+        )
+        results.update(sent)
+        return results
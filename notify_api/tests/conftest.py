@@ -0,0 +1,43 @@
+from collections.abc import Iterator
+
+import fakeredis
+import pytest
+from rest_framework.test import APIClient
+
+from config.celery import app
+from notify import idempotency, suppression
+from notify.bodies import get_body
+from notify.rendering import get_compiled_template
+
+
+@pytest.fixture(autouse=True)
+def redis_client(monkeypatch: pytest.MonkeyPatch) -> fakeredis.FakeRedis:
+    """Redis в памяти вместо брокера для ключей идемпотентности и индекса подавления."""
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(idempotency.idempotency_store, "client", client)
+    monkeypatch.setattr(idempotency.delivery_markers, "client", client)
+    monkeypatch.setattr(idempotency.suppression_window, "client", client)
+    monkeypatch.setattr(suppression.suppression_list, "client", client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def celery_eager() -> Iterator[None]:
+    """Синхронное выполнение задач Celery в процессе теста."""
+    app.conf.task_always_eager = True
+    app.conf.task_eager_propagates = True
+    yield
+    app.conf.task_always_eager = False
+    app.conf.task_eager_propagates = False
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Сброс кешей процесса: id записей повторяются между тестами."""
+    get_body.cache_clear()
+    get_compiled_template.cache_clear()
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    return APIClient()
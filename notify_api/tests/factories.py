@@ -0,0 +1,28 @@
+import factory
+
+from notify.choices import RecipientTypeChoices, StatusDeliveryChoices
+from notify.models import DeliveryLog, Notification, Recipient
+
+
+class NotificationFactory(factory.django.DjangoModelFactory):
+    message = factory.Sequence(lambda number: f"Сообщение {number}")
+
+    class Meta:
+        model = Notification
+
+
+class RecipientFactory(factory.django.DjangoModelFactory):
+    notification = factory.SubFactory(NotificationFactory)
+    address = factory.Sequence(lambda number: f"user{number}@example.com")
+    recipient_type = RecipientTypeChoices.EMAIL
+
+    class Meta:
+        model = Recipient
+
+
+class DeliveryLogFactory(factory.django.DjangoModelFactory):
+    recipient = factory.SubFactory(RecipientFactory)
+    status = StatusDeliveryChoices.SUCCESS
+
+    class Meta:
+        model = DeliveryLog
@@ -0,0 +1,65 @@
+import pytest
+
+from notify.bodies import get_body, store_bodies
+from notify.idempotency import content_hash
+from notify.models import MessageBody, Notification
+from notify.services import NotificationService
+
+BATCH_URL = "/api/notify/batch/"
+
+
+@pytest.mark.django_db
+def test_store_bodies_keeps_one_row_per_text(django_assert_num_queries) -> None:
+    with django_assert_num_queries(1):
+        digests = store_bodies(["Первый", "Второй", "Первый"])
+    assert digests == {"Первый": content_hash("Первый"), "Второй": content_hash("Второй")}
+    assert store_bodies(["Второй"]) == {"Второй": digests["Второй"]}
+    assert MessageBody.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_store_bodies_compresses_large_texts(settings) -> None:
+    settings.NOTIFY_BODY_COMPRESS_MIN_SIZE = 256
+    large, small = "Длинный текст рассылки. " * 100, "Короткий текст"
+    digests = store_bodies([large, small])
+    stored = MessageBody.objects.get(digest=digests[large])
+    assert stored.compressed
+    assert len(bytes(stored.content)) < stored.size == len(large.encode())
+    assert stored.text == large
+    assert not MessageBody.objects.get(digest=digests[small]).compressed
+
+
+@pytest.mark.django_db
+def test_compression_disabled(settings) -> None:
+    settings.NOTIFY_BODY_COMPRESS_MIN_SIZE = 0
+    text = "Длинный текст рассылки. " * 100
+    stored = MessageBody.objects.get(digest=store_bodies([text])[text])
+    assert not stored.compressed
+    assert bytes(stored.content) == text.encode()
+
+
+@pytest.mark.django_db
+def test_get_body_reads_database_once(django_assert_num_queries) -> None:
+    text = "Длинный текст рассылки. " * 100
+    digest = store_bodies([text])[text]
+    with django_assert_num_queries(1):
+        assert get_body(digest) == text
+        assert get_body(digest) == text
+
+
+@pytest.mark.django_db
+def test_batch_stores_shared_text_once(api_client) -> None:
+    items = [{"message": "Акция недели", "recipient": [f"user{index}@example.com"]} for index in range(5)]
+    response = api_client.post(BATCH_URL, items)
+    assert response.status_code == 201
+    assert MessageBody.objects.count() == 1
+    assert set(Notification.objects.values_list("body_id", "message")) == {(content_hash("Акция недели"), "")}
+
+
+def test_delivery_tasks_carry_only_digest() -> None:
+    text = "Длинный текст рассылки. " * 100
+    digest = content_hash(text)
+    tasks = NotificationService().build_delivery_tasks(digest, {"email": ["user@example.com"]}, 100, "scope")
+    [task] = tasks
+    assert task.kwargs["body"] == digest
+    assert text not in repr(task)
@@ -0,0 +1,93 @@
+import math
+from collections.abc import Callable
+
+import pytest
+from django.utils import timezone
+from factories import NotificationFactory
+
+from notify import tasks
+from notify.choices import RecipientTypeChoices, StatusChoices
+from notify.constants import BULK_CREATE_BATCH_SIZE
+from notify.models import DeliveryLog, MessageBody, Notification, OutboxMessage, Recipient
+
+URL = "/api/notify/"
+BATCH_URL = "/api/notify/batch/"
+
+
+def notification_item(index: int) -> dict:
+    return {
+        "message": f"Сообщение {index % 3}",
+        "recipient": [f"user{index}@example.com", str(1000 + index), f"user{index}@Example.com"],
+    }
+
+
+@pytest.mark.django_db
+def test_create_queries(api_client, django_assert_num_queries) -> None:
+    # Текст, уведомление, получатели, outbox и savepoint транзакции запроса
+    with django_assert_num_queries(6):
+        response = api_client.post(URL, notification_item(0))
+    assert response.status_code == 201
+    assert Recipient.objects.count() == 2
+    assert OutboxMessage.objects.count() == 1
+
+
+@pytest.mark.parametrize("size", [1, 50])
+@pytest.mark.django_db
+def test_batch_create_queries_do_not_grow_with_size(api_client, django_assert_num_queries, size) -> None:
+    with django_assert_num_queries(6):
+        response = api_client.post(BATCH_URL, [notification_item(index) for index in range(size)])
+    assert response.status_code == 201
+    assert response.data["accepted"] == size
+    assert Notification.objects.count() == size
+    assert Recipient.objects.count() == size * 2
+    assert MessageBody.objects.count() == min(size, 3)
+    assert OutboxMessage.objects.count() == size
+
+
+class RecordingChord:
+    """Chord без запуска пачек и финализации: подписи пачек только запоминаются."""
+
+    def __init__(self) -> None:
+        self.header: list = []
+
+    def __call__(self, header: list) -> Callable:
+        self.header = list(header)
+        return lambda callback: None
+
+
+def notification_with_recipients(size: int) -> Notification:
+    notification = NotificationFactory(scheduled_for=timezone.now())
+    Recipient.objects.bulk_create(
+        Recipient(notification=notification, address=f"+7999{index:07d}", recipient_type=RecipientTypeChoices.SMS)
+        for index in range(size)
+    )
+    return notification
+
+
+@pytest.mark.parametrize("size", [10, 2500])
+@pytest.mark.django_db
+def test_dispatch_queries_do_not_grow_with_recipients(
+    django_assert_num_queries, monkeypatch: pytest.MonkeyPatch, settings, size
+) -> None:
+    notification = notification_with_recipients(size)
+    recording = RecordingChord()
+    monkeypatch.setattr(tasks, "chord", recording)
+    # Захват, уведомление, текст, получатели одним потоком, индекс подавления, счетчики
+    with django_assert_num_queries(7):
+        assert tasks.send_notification_task(notification.id) is True
+    assert len(recording.header) == math.ceil(size / settings.NOTIFY_CHUNK_SIZE)
+
+
+@pytest.mark.parametrize("size", [10, 2500])
+@pytest.mark.django_db
+def test_finalize_queries_grow_only_with_insert_batches(django_assert_num_queries, size) -> None:
+    notification = notification_with_recipients(size)
+    run_token = "00000000-0000-0000-0000-000000000001"
+    Notification.objects.filter(id=notification.id).update(status=StatusChoices.PROCESSING, run_token=run_token)
+    outcomes = [tasks.build_outcome(f"+7999{index:07d}", 1, "", 10) for index in range(size)]
+    # Savepoint, аренда, получатели, статистика, расписание, статус, release и INSERT логов на пачку
+    with django_assert_num_queries(7 + math.ceil(size / BULK_CREATE_BATCH_SIZE)):
+        assert tasks.finalize_notification_task(
+            [tasks.build_chunk_result("sms", outcomes)], notification.id, run_token=run_token
+        )
+    assert DeliveryLog.objects.count() == size
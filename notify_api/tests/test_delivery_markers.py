@@ -0,0 +1,107 @@
+import multiprocessing
+import threading
+from collections import Counter
+
+import pytest
+
+from notify import channels
+from notify.channels import ChannelBackend, DeliveryError
+from notify.idempotency import DeliveryMarkers, content_hash, delivery_markers
+from notify.tasks import send_channel_task
+
+ADDRESSES = [f"+7999000{index:04d}" for index in range(20)]
+
+
+class RecordingChannel(ChannelBackend):
+    """Канал, запоминающий адреса отправок."""
+
+    def __init__(self, failing: set[str] | None = None) -> None:
+        self.sent: Counter[str] = Counter()
+        self.failing = failing or set()
+
+    def send_many(self, message: str, addresses: list[str], scope: str = "") -> dict[str, int | DeliveryError]:
+        self.sent.update(address for address in addresses if address not in self.failing)
+        return {
+            address: DeliveryError("Ошибка", retryable=False) if address in self.failing else 1
+            for address in addresses
+        }
+
+
+@pytest.fixture
+def recording_channel(monkeypatch: pytest.MonkeyPatch) -> RecordingChannel:
+    channel = RecordingChannel()
+    monkeypatch.setattr(channels, "_backends", {"sms": channel})
+    return channel
+
+
+def test_concurrent_claim_grants_each_address_once() -> None:
+    workers = 8
+    barrier = threading.Barrier(workers)
+    claimed: list[list[str]] = []
+
+    def claim() -> None:
+        barrier.wait()
+        claimed.append(delivery_markers.claim("scope", ADDRESSES)[0])
+
+    threads = [threading.Thread(target=claim) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert Counter(address for addresses in claimed for address in addresses) == Counter(ADDRESSES)
+
+
+def keys_in_new_process(markers: DeliveryMarkers) -> list[str]:
+    """Хеш области отправки и ключи маркеров, вычисленные в отдельном процессе."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        scope = pool.apply(content_hash, (42, "2026-01-01T09:00:00+00:00"))
+        return [scope, *pool.starmap(markers._key, [(f"sms:{scope}", address) for address in ADDRESSES[:3]])]
+
+
+def test_keys_match_across_processes(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Встроенный hash() строк солится в каждом процессе, ключи не должны от него зависеть
+    monkeypatch.delenv("PYTHONHASHSEED", raising=False)
+    # Без клиента Redis: объект передается в процесс, вычисляются только ключи
+    markers = DeliveryMarkers(None, ttl=60, claim_ttl=60)
+    first, second = keys_in_new_process(markers), keys_in_new_process(markers)
+    scope = content_hash(42, "2026-01-01T09:00:00+00:00")
+    assert first == second == [scope, *(markers._key(f"sms:{scope}", address) for address in ADDRESSES[:3])]
+
+
+def test_claim_reports_sent_and_in_flight() -> None:
+    delivery_markers.claim("scope", ADDRESSES[:4])
+    delivery_markers.confirm("scope", ADDRESSES[:2])
+    claimed, sent, in_flight = delivery_markers.claim("scope", ADDRESSES[:6])
+    assert claimed == ADDRESSES[4:6]
+    assert sent == ADDRESSES[:2]
+    assert in_flight == ADDRESSES[2:4]
+
+
+def test_released_addresses_can_be_claimed_again() -> None:
+    delivery_markers.claim("scope", ADDRESSES[:2])
+    delivery_markers.release("scope", ADDRESSES[:1])
+    assert delivery_markers.claim("scope", ADDRESSES[:2])[0] == ADDRESSES[:1]
+
+
+def test_task_redelivery_sends_once(recording_channel) -> None:
+    kwargs = {"channel": "sms", "recipients": ADDRESSES, "message": "Код 1234", "delivery_scope": "run-1"}
+    first = send_channel_task.apply(kwargs=kwargs).get()
+    second = send_channel_task.apply(kwargs=kwargs).get()
+    assert recording_channel.sent == Counter(ADDRESSES)
+    assert all(outcome["success"] for outcome in first["outcomes"] + second["outcomes"])
+
+
+def test_task_other_scope_sends_again(recording_channel) -> None:
+    kwargs = {"channel": "sms", "recipients": ADDRESSES[:3], "message": "Код 1234"}
+    send_channel_task.apply(kwargs={**kwargs, "delivery_scope": "run-1"}).get()
+    send_channel_task.apply(kwargs={**kwargs, "delivery_scope": "run-2"}).get()
+    assert recording_channel.sent == Counter(dict.fromkeys(ADDRESSES[:3], 2))
+
+
+def test_task_failed_address_is_sent_by_redelivery(recording_channel) -> None:
+    recording_channel.failing = {ADDRESSES[0]}
+    kwargs = {"channel": "sms", "recipients": ADDRESSES[:3], "message": "Код 1234", "delivery_scope": "run-1"}
+    send_channel_task.apply(kwargs=kwargs).get()
+    recording_channel.failing = set()
+    send_channel_task.apply(kwargs=kwargs).get()
+    assert recording_channel.sent == Counter(ADDRESSES[:3])
@@ -0,0 +1,93 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from factories import NotificationFactory, RecipientFactory
+
+from notify import channels, tasks
+from notify.channels import ChannelBackend, DeliveryError
+from notify.choices import RecipientTypeChoices, StatusChoices
+from notify.models import DeliveryLog, DeliveryStats, Notification
+from notify.tasks import (
+    build_chunk_result,
+    build_outcome,
+    finalize_notification_task,
+    reap_stale_notifications_task,
+    send_channel_task,
+)
+
+ADDRESSES = ["+79990000001", "+79990000002"]
+
+
+class SentChannel(ChannelBackend):
+    """Канал, успешно доставляющий все сообщения."""
+
+    def send_many(self, message: str, addresses: list[str], scope: str = "") -> dict[str, int | DeliveryError]:
+        return dict.fromkeys(addresses, 1)
+
+
+@pytest.fixture
+def processing() -> Notification:
+    """Уведомление в обработке, аренда которого скоро истечет."""
+    notification = NotificationFactory(
+        status=StatusChoices.PROCESSING,
+        run_token=uuid.uuid4(),
+        locked_until=timezone.now() + timedelta(seconds=1),
+    )
+    for address in ADDRESSES:
+        RecipientFactory(notification=notification, address=address, recipient_type=RecipientTypeChoices.SMS)
+    return notification
+
+
+def chunk_results() -> list[dict]:
+    return [build_chunk_result("sms", [build_outcome(address, 1, "", 10) for address in ADDRESSES])]
+
+
+@pytest.mark.django_db
+def test_chunk_extends_lease_of_its_run(processing: Notification, monkeypatch: pytest.MonkeyPatch, settings) -> None:
+    monkeypatch.setattr(channels, "_backends", {"sms": SentChannel()})
+    send_channel_task(
+        "sms", ADDRESSES, "Текст", "scope", notification_id=processing.id, run_token=str(processing.run_token)
+    )
+    processing.refresh_from_db()
+    assert processing.locked_until > timezone.now() + timedelta(seconds=settings.NOTIFY_LEASE_TIMEOUT - 60)
+
+    # Пачка чужого запуска не продлевает аренду
+    Notification.objects.filter(id=processing.id).update(locked_until=timezone.now() - timedelta(seconds=1))
+    send_channel_task("sms", ADDRESSES, "Текст", "scope", notification_id=processing.id, run_token=str(uuid.uuid4()))
+    assert reap_stale_notifications_task() == 1
+
+
+@pytest.mark.django_db
+def test_finalize_of_lost_run_writes_nothing(processing: Notification) -> None:
+    stale_token = str(processing.run_token)
+    Notification.objects.filter(id=processing.id).update(locked_until=timezone.now() - timedelta(seconds=1))
+    assert reap_stale_notifications_task() == 1
+    # Планировщик запустил уведомление повторно с новым токеном
+    Notification.objects.filter(id=processing.id).update(status=StatusChoices.PROCESSING, run_token=uuid.uuid4())
+
+    assert finalize_notification_task(chunk_results(), processing.id, run_token=stale_token) is False
+    assert not DeliveryLog.objects.exists()
+    assert not DeliveryStats.objects.exists()
+    assert Notification.objects.get(id=processing.id).status == StatusChoices.PROCESSING
+
+
+@pytest.mark.django_db
+def test_failed_finalize_rolls_back_and_retries(processing: Notification, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(entries: list) -> None:
+        raise RuntimeError("Статистика недоступна")
+
+    token = str(processing.run_token)
+    with monkeypatch.context() as patch:
+        patch.setattr(tasks, "record_delivery_stats", fail)
+        with pytest.raises(RuntimeError):
+            finalize_notification_task(chunk_results(), processing.id, run_token=token)
+    assert not DeliveryLog.objects.exists()
+    processing.refresh_from_db()
+    assert processing.status == StatusChoices.PROCESSING
+
+    assert finalize_notification_task(chunk_results(), processing.id, run_token=token) is True
+    assert DeliveryLog.objects.count() == len(ADDRESSES)
+    processing.refresh_from_db()
+    assert (processing.status, processing.locked_until) == (StatusChoices.COMPLETED, None)
@@ -0,0 +1,157 @@
+import smtplib
+import socket
+import ssl
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+from django.core.mail import EmailMessage
+from django.core.mail.backends.smtp import EmailBackend
+
+from notify.channels import DeliveryError
+from notify.mail import EmailChannel, SMTPConnectionPool
+
+
+class RecordingHandler:
+    """SMTP сервер: запоминает письма, отклоняет адреса bad*, может оборвать соединение перед письмом."""
+
+    def __init__(self) -> None:
+        self.messages: list[tuple[list[str], bytes]] = []
+        self.disconnect_before: set[int] = set()
+        self.mail_commands = 0
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options) -> str:  # noqa: N802
+        self.mail_commands += 1
+        if self.mail_commands in self.disconnect_before:
+            server.transport.close()
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options) -> str:  # noqa: N802
+        if address.startswith("bad"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope) -> str:  # noqa: N802
+        self.messages.append((list(envelope.rcpt_tos), envelope.content))
+        return "250 OK"
+
+    def subjects(self) -> list[str]:
+        return [message_from_bytes(content)["Subject"] for _, content in self.messages]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@pytest.fixture
+def smtp_server(settings):
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST = controller.hostname
+    settings.EMAIL_PORT = controller.port
+    settings.EMAIL_USE_SSL = False
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = ""
+    settings.EMAIL_HOST_PASSWORD = ""
+    settings.DEFAULT_FROM_EMAIL = "notify@example.com"
+    yield handler
+    controller.stop()
+
+
+@pytest.fixture
+def pool() -> SMTPConnectionPool:
+    pool = SMTPConnectionPool(max_connections=2, healthcheck_interval=30, max_idle=240)
+    yield pool
+    pool.close_all()
+
+
+def emails(count: int) -> list[EmailMessage]:
+    return [EmailMessage(f"Message {index}", "Текст", to=[f"user{index}@example.com"]) for index in range(count)]
+
+
+def test_send_messages_in_one_session(smtp_server, pool) -> None:
+    assert pool.send_messages(emails(3)) == 3
+    assert pool.send_messages(emails(2)) == 2
+    assert smtp_server.subjects() == ["Message 0", "Message 1", "Message 2", "Message 0", "Message 1"]
+
+
+def test_send_messages_resends_only_unaccepted_after_disconnect(smtp_server, pool) -> None:
+    smtp_server.disconnect_before = {3}
+    assert pool.send_messages(emails(5)) == 5
+    assert smtp_server.subjects() == [f"Message {index}" for index in range(5)]
+
+
+def test_send_messages_reconnects_stale_pooled_connection(smtp_server, pool) -> None:
+    pool.send_messages(emails(1))
+    smtp_server.disconnect_before = {2}
+    assert pool.send_messages(emails(2)) == 2
+    assert smtp_server.subjects() == ["Message 0", "Message 0", "Message 1"]
+
+
+def test_send_each_outcomes(smtp_server, pool) -> None:
+    messages = [
+        EmailMessage("a", "Текст", to=["ok@example.com"]),
+        EmailMessage("b", "Текст", to=["bad@example.com"]),
+        EmailMessage("c", "Текст", to=["next@example.com"]),
+    ]
+    (ok, refused, after) = pool.send_each(messages)
+    assert ok[0] == "" and after[0] == ""
+    assert refused[0] and refused[2]
+    assert [recipients for recipients, _ in smtp_server.messages] == [["ok@example.com"], ["next@example.com"]]
+
+
+def test_send_each_marks_rest_after_disconnect(smtp_server, pool) -> None:
+    smtp_server.disconnect_before = {2}
+    results = pool.send_each(emails(3))
+    assert results[0][0] == ""
+    assert results[1][0] and not results[1][2]
+    assert results[2] == ("SMTP соединение оборвано", 0, False)
+    assert smtp_server.subjects() == ["Message 0"]
+
+
+def test_send_each_closes_connection_after_socket_error(smtp_server, pool, monkeypatch: pytest.MonkeyPatch) -> None:
+    send_messages = EmailBackend.send_messages
+
+    def fail_second(self: EmailBackend, messages: list[EmailMessage]) -> int:
+        if messages[0].subject == "Message 1":
+            raise ssl.SSLError("decryption failed or bad record mac")
+        return send_messages(self, messages)
+
+    monkeypatch.setattr(EmailBackend, "send_messages", fail_second)
+    results = pool.send_each(emails(3))
+    assert results[0][0] == ""
+    assert "bad record mac" in results[1][0]
+    assert results[2] == ("SMTP соединение оборвано", 0, False)
+    assert not pool._idle
+
+
+@pytest.mark.parametrize(
+    "error, reused",
+    [
+        (smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"No such user")}), True),
+        (smtplib.SMTPServerDisconnected("Connection unexpectedly closed"), False),
+        (ssl.SSLError("decryption failed or bad record mac"), False),
+        (ValueError("Ошибка сборки письма"), False),
+    ],
+)
+def test_connection_closed_after_unexpected_error(smtp_server, pool, error, reused) -> None:
+    with pytest.raises(type(error)), pool.connection():
+        raise error
+    assert bool(pool._idle) is reused
+
+
+def test_email_channel_per_recipient(smtp_server, pool, settings) -> None:
+    settings.EMAIL_PER_RECIPIENT = True
+    channel = EmailChannel()
+    channel.pool = pool
+    results = channel.send_many("Текст", ["a@example.com", "bad@example.com"])
+    assert isinstance(results["a@example.com"], int)
+    assert isinstance(results["bad@example.com"], DeliveryError)
+    assert results["bad@example.com"].permanent
+    assert [recipients for recipients, _ in smtp_server.messages] == [["a@example.com"]]
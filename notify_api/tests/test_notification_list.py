@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from factories import DeliveryLogFactory, NotificationFactory, RecipientFactory
+
+from notify.choices import RecipientTypeChoices, StatusChoices, StatusDeliveryChoices
+from notify.models import Notification
+
+URL = "/api/notify/"
+
+
+def collect_pages(api_client, url: str, params: dict) -> list[list[int]]:
+    """Идентификаторы всех страниц списка по ссылкам next."""
+    pages = []
+    response = api_client.get(url, params)
+    while True:
+        assert response.status_code == 200
+        pages.append([item.get("notification_id", item.get("id")) for item in response.data["results"]])
+        if response.data["next"] is None:
+            return pages
+        response = api_client.get(response.data["next"])
+
+
+@pytest.mark.django_db
+def test_list_pages_cover_all_rows_once(api_client) -> None:
+    notifications = NotificationFactory.create_batch(7)
+    # Одинаковое created_at у части строк: порядок и курсор уточняются по id
+    created_at = timezone.now() - timedelta(hours=1)
+    Notification.objects.filter(id__in=[notification.id for notification in notifications[:4]]).update(
+        created_at=created_at
+    )
+    pages = collect_pages(api_client, URL, {"limit": 3})
+    assert [len(page) for page in pages] == [3, 3, 1]
+    expected = sorted(
+        Notification.objects.values_list("created_at", "id"),
+        reverse=True,
+    )
+    assert [notification_id for page in pages for notification_id in page] == [id_ for _, id_ in expected]
+
+
+@pytest.mark.django_db
+def test_list_query_count_does_not_grow_with_page_size(api_client, django_assert_num_queries) -> None:
+    for notification in NotificationFactory.create_batch(20):
+        RecipientFactory.create_batch(2, notification=notification)
+    with django_assert_num_queries(1):
+        response = api_client.get(URL, {"limit": 20})
+    assert len(response.data["results"]) == 20
+
+
+@pytest.mark.django_db
+def test_list_rejects_invalid_cursor(api_client) -> None:
+    NotificationFactory()
+    assert api_client.get(URL, {"cursor": "not-a-cursor"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_list_filters(api_client) -> None:
+    old, completed, high = NotificationFactory.create_batch(3)
+    Notification.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=2))
+    Notification.objects.filter(id=completed.id).update(status=StatusChoices.COMPLETED)
+    Notification.objects.filter(id=high.id).update(priority="high")
+    RecipientFactory.create_batch(2, notification=completed, address="client@example.com")
+    RecipientFactory(notification=high, address="client@example.com")
+    RecipientFactory(notification=old, address="123", recipient_type=RecipientTypeChoices.TELEGRAM)
+
+    def ids(params: dict) -> set[int]:
+        response = api_client.get(URL, params)
+        assert response.status_code == 200
+        return {item["notification_id"] for item in response.data["results"]}
+
+    assert ids({"status": "completed"}) == {completed.id}
+    assert ids({"priority": "high"}) == {high.id}
+    assert ids({"created_before": (timezone.now() - timedelta(days=1)).isoformat()}) == {old.id}
+    assert ids({"created_after": (timezone.now() - timedelta(days=1)).isoformat()}) == {completed.id, high.id}
+    assert ids({"recipient": "client@example.com"}) == {completed.id, high.id}
+    # Адрес нормализуется так же, как при создании уведомления
+    assert ids({"recipient": " client@EXAMPLE.com "}) == {completed.id, high.id}
+    assert ids({"recipient": "0123"}) == {old.id}
+    assert ids({"recipient": "not an address"}) == set()
+    response = api_client.get(URL, {"recipient": "client@example.com", "limit": 1})
+    assert len(response.data["results"]) == 1
+    assert response.data["next"] is not None
+
+
+@pytest.mark.django_db
+def test_list_rejects_invalid_filter(api_client) -> None:
+    response = api_client.get(URL, {"status": "unknown"})
+    assert response.status_code == 400
+    assert "status" in response.data["details"]
+
+
+@pytest.mark.django_db
+def test_retrieve(api_client) -> None:
+    notification = NotificationFactory()
+    response = api_client.get(f"{URL}{notification.id}/")
+    assert response.status_code == 200
+    assert response.data["notification_id"] == notification.id
+    assert response.data["message"] == notification.message
+    assert api_client.get(f"{URL}{notification.id + 1}/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_logs_pages_and_filters(api_client) -> None:
+    notification = NotificationFactory()
+    email = RecipientFactory(notification=notification)
+    sms = RecipientFactory(notification=notification, address="+79990000000", recipient_type=RecipientTypeChoices.SMS)
+    logs = DeliveryLogFactory.create_batch(3, recipient=email)
+    failed = DeliveryLogFactory(recipient=sms, status=StatusDeliveryChoices.FAILED)
+    DeliveryLogFactory()
+    url = f"{URL}{notification.id}/logs/"
+
+    pages = collect_pages(api_client, url, {"limit": 2})
+    assert pages == [[failed.id, logs[2].id], [logs[1].id, logs[0].id]]
+    response = api_client.get(url, {"status": "failed"})
+    assert [item["id"] for item in response.data["results"]] == [failed.id]
+    response = api_client.get(url, {"recipient_type": "email"})
+    assert [item["id"] for item in response.data["results"]] == [log.id for log in reversed(logs)]
+    assert api_client.get(f"{URL}{notification.id + 100}/logs/").status_code == 404
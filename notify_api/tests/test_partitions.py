@@ -0,0 +1,137 @@
+import gzip
+import json
+from datetime import timedelta
+from itertools import pairwise
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from notify import partitions
+from notify.choices import StatusDeliveryChoices
+from notify.models import DeliveryLog, Notification, Recipient
+from notify.partitions import (
+    build_partition_key_indexes,
+    convert_to_partitioned,
+    create_partitions,
+    drop_expired_partitions,
+    is_partitioned,
+    list_partitions,
+)
+
+pytestmark = [
+    pytest.mark.skipif(connection.vendor != "postgresql", reason="Секционирование работает только на PostgreSQL"),
+    pytest.mark.django_db,
+]
+
+TABLE = DeliveryLog._meta.db_table
+
+
+@pytest.fixture
+def logs() -> list[DeliveryLog]:
+    notification = Notification.objects.create()
+    recipient = Recipient.objects.create(notification=notification, address="user@example.com", recipient_type="email")
+    now = timezone.now()
+    created = [
+        DeliveryLog.objects.create(recipient=recipient, status=StatusDeliveryChoices.SUCCESS, sent_at=sent_at)
+        for sent_at in (now - timedelta(days=40), now)
+    ]
+    with connection.cursor() as cursor:
+        # Отложенные проверки внешних ключей не дают менять таблицу в той же транзакции
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    return created
+
+
+def constraint_names(table: str) -> set[str]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s)", [table])
+        return {name for (name,) in cursor.fetchall()}
+
+
+def test_convert_attaches_table_as_legacy_partition(logs) -> None:
+    legacy = convert_to_partitioned(TABLE)
+    assert is_partitioned(TABLE)
+    [partition] = list_partitions(TABLE)
+    assert partition.name == legacy
+    assert partition.lower is None
+    assert partition.upper > timezone.now()
+    assert DeliveryLog.objects.count() == len(logs)
+    # Ограничение границы нужно только для ATTACH и после него удаляется
+    assert not any(name.endswith("_sent_at_upper") for name in constraint_names(TABLE) | constraint_names(legacy))
+    log = DeliveryLog.objects.create(recipient=logs[0].recipient, status=StatusDeliveryChoices.FAILED)
+    assert log.id > max(existing.id for existing in logs)
+
+
+def relation_oid(name: str) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)::oid", [name])
+        return cursor.fetchone()[0]
+
+
+def primary_key_columns(table: str) -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT a.attname FROM pg_constraint c JOIN pg_attribute a "
+            "ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey) "
+            "WHERE c.conrelid = to_regclass(%s) AND c.contype = 'p'",
+            [table],
+        )
+        return [column for (column,) in cursor.fetchall()]
+
+
+def test_attach_reuses_prebuilt_key_index(logs) -> None:
+    [(name, kind, index)] = build_partition_key_indexes(TABLE)
+    assert (name, kind) == (f"{TABLE}_pkey", "PRIMARY KEY")
+    prebuilt = relation_oid(index)
+    assert build_partition_key_indexes(TABLE) == [(name, kind, index)]
+    assert relation_oid(index) == prebuilt
+    legacy = convert_to_partitioned(TABLE)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT i.inhrelid FROM pg_inherits i JOIN pg_constraint c ON c.conindid = i.inhparent "
+            "WHERE c.conrelid = to_regclass(%s) AND c.contype = 'p'",
+            [TABLE],
+        )
+        [(partition_key_index,)] = cursor.fetchall()
+    # Индекс первичного ключа секции построен до блокировки, ATTACH его не перестраивал
+    assert partition_key_index == prebuilt
+    assert sorted(primary_key_columns(legacy)) == ["id", "sent_at"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_key_indexes_are_built_concurrently(logs) -> None:
+    [(_, _, index)] = build_partition_key_indexes(TABLE)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indisvalid, indisunique FROM pg_index WHERE indexrelid = to_regclass(%s)", [index])
+            assert cursor.fetchone() == (True, True)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {connection.ops.quote_name(index)}")
+
+
+def test_create_partitions_continue_after_legacy(logs) -> None:
+    legacy = convert_to_partitioned(TABLE)
+    created = create_partitions(TABLE, ahead=2)
+    names = [partition.name for partition in list_partitions(TABLE)]
+    assert names[0] == legacy
+    assert names[1:] == created
+    assert created
+    assert create_partitions(TABLE, ahead=2) == []
+    bounds = list_partitions(TABLE)
+    assert all(previous.upper == current.lower for previous, current in pairwise(bounds))
+
+
+def test_expired_partitions_are_archived_and_dropped(logs, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    legacy = convert_to_partitioned(TABLE)
+    create_partitions(TABLE, ahead=1)
+    later = timezone.now() + timedelta(days=40)
+    monkeypatch.setattr(partitions.timezone, "now", lambda: later)
+    dropped = drop_expired_partitions(TABLE, retention_days=1, archive_dir=str(tmp_path))
+    assert legacy in dropped
+    assert legacy not in [partition.name for partition in list_partitions(TABLE)]
+    with gzip.open(tmp_path / f"{legacy}.jsonl.gz", "rt", encoding="utf-8") as archive:
+        rows = [json.loads(line) for line in archive]
+    assert sorted(row["id"] for row in rows) == sorted(log.id for log in logs)
+    assert {row["address"] for row in rows} == {"user@example.com"}
+    assert DeliveryLog.objects.count() == 0
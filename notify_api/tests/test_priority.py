@@ -0,0 +1,37 @@
+import pytest
+
+from config.celery import QUEUE_HIGH
+from notify.models import Notification, OutboxMessage
+
+URL = "/api/notify/"
+BATCH_URL = "/api/notify/batch/"
+
+
+@pytest.mark.django_db
+def test_high_priority_is_published_to_high_queue(api_client) -> None:
+    response = api_client.post(URL, {"message": "Код входа", "recipient": ["user@example.com"], "priority": "high"})
+    assert response.status_code == 201
+    notification = Notification.objects.get()
+    assert notification.priority == "high"
+    assert OutboxMessage.objects.get().options == {"queue": QUEUE_HIGH, "routing_key": QUEUE_HIGH}
+
+
+@pytest.mark.django_db
+def test_batch_keeps_priority_per_item(api_client) -> None:
+    response = api_client.post(
+        BATCH_URL,
+        [
+            {"message": "Рассылка", "recipient": ["bulk@example.com"]},
+            {"message": "Код входа", "recipient": ["user@example.com"], "priority": "high"},
+        ],
+    )
+    assert response.status_code == 201
+    options = [message.options for message in OutboxMessage.objects.order_by("id")]
+    assert options == [{}, {"queue": QUEUE_HIGH, "routing_key": QUEUE_HIGH}]
+
+
+@pytest.mark.django_db
+def test_unknown_priority_is_rejected(api_client) -> None:
+    response = api_client.post(URL, {"message": "Сообщение", "recipient": ["user@example.com"], "priority": "urgent"})
+    assert response.status_code == 400
+    assert "priority" in response.data["details"]
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from notify.choices import StatusChoices
+from notify.models import Notification
+from notify.schedules import cron_occurrence
+
+URL = "/api/notify/"
+
+
+@pytest.mark.django_db
+def test_cron_first_send_is_next_occurrence(api_client) -> None:
+    before = timezone.now()
+    response = api_client.post(URL, {"message": "Отчет", "recipient": ["a@example.com"], "cron": "0 9 * * 1"})
+    assert response.status_code == 201
+    notification = Notification.objects.get(id=response.data["notification_id"])
+    assert notification.status == StatusChoices.PENDING
+    assert notification.scheduled_for > before
+    assert notification.scheduled_for == cron_occurrence("0 9 * * 1", before)
+    assert notification.scheduled_for - before <= timedelta(days=7)
+    assert notification.scheduled_for.second == 0
+
+
+@pytest.mark.django_db
+def test_cron_first_send_respects_delay(api_client) -> None:
+    response = api_client.post(
+        URL, {"message": "Отчет", "recipient": ["a@example.com"], "cron": "*/5 * * * *", "delay": 2}
+    )
+    assert response.status_code == 201
+    notification = Notification.objects.get(id=response.data["notification_id"])
+    assert notification.scheduled_for > timezone.now() + timedelta(days=1) - timedelta(minutes=1)
+
+
+@pytest.mark.django_db
+def test_cron_with_send_at_keeps_send_at(api_client) -> None:
+    send_at = timezone.now() + timedelta(hours=2)
+    response = api_client.post(
+        URL,
+        {"message": "Отчет", "recipient": ["a@example.com"], "cron": "0 9 * * *", "send_at": send_at.isoformat()},
+    )
+    assert response.status_code == 201
+    assert Notification.objects.get(id=response.data["notification_id"]).scheduled_for == send_at
+
+
+@pytest.mark.parametrize(
+    "until, send_at",
+    [
+        (timedelta(hours=-1), None),
+        (timedelta(hours=1), timedelta(hours=2)),
+        (timedelta(hours=2), timedelta(hours=2)),
+    ],
+)
+@pytest.mark.django_db
+def test_until_before_first_send_rejected(api_client, until, send_at) -> None:
+    now = timezone.now()
+    data = {"message": "Отчет", "recipient": ["a@example.com"], "interval": 3600, "until": (now + until).isoformat()}
+    if send_at is not None:
+        data["send_at"] = (now + send_at).isoformat()
+    response = api_client.post(URL, data)
+    assert response.status_code == 400
+    assert "until" in response.data["details"]
+    assert not Notification.objects.exists()
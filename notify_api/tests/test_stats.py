@@ -0,0 +1,128 @@
+from collections import Counter
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from factories import NotificationFactory
+
+from notify import channels
+from notify.channels import ChannelBackend, DeliveryError
+from notify.models import DeliveryStats, Notification
+from notify.stats import get_delivery_stats, record_delivery_stats, update_counters
+from notify.tasks import send_notification_task
+
+URL = "/api/notify/"
+STATS_URL = "/api/notify/stats/"
+
+
+class FailingChannel(ChannelBackend):
+    """Канал, отклоняющий адреса из failing."""
+
+    def __init__(self, failing: set[str]) -> None:
+        self.failing = failing
+        self.sent: Counter[str] = Counter()
+
+    def send_many(self, message: str, addresses: list[str], scope: str = "") -> dict[str, int | DeliveryError]:
+        self.sent.update(address for address in addresses if address not in self.failing)
+        return {
+            address: DeliveryError("Номер не обслуживается", retryable=False) if address in self.failing else 1
+            for address in addresses
+        }
+
+
+@pytest.mark.django_db
+def test_update_counters_increments_and_keeps_pending_non_negative() -> None:
+    notification = NotificationFactory(recipients_count=4, pending_count=4)
+    update_counters(notification.id, ["success", "success", "failed", "skipped", "suppressed"])
+    notification.refresh_from_db()
+    assert (notification.sent_count, notification.failed_count, notification.skipped_count) == (2, 1, 2)
+    assert notification.pending_count == 0
+    update_counters(notification.id, ["success"])
+    notification.refresh_from_db()
+    assert notification.sent_count == 3
+    assert notification.pending_count == 0
+
+
+@pytest.mark.django_db
+def test_delivery_updates_counters_and_stats(api_client, monkeypatch: pytest.MonkeyPatch) -> None:
+    channel = FailingChannel(failing={"+79990000002"})
+    monkeypatch.setattr(channels, "_backends", {"sms": channel})
+    response = api_client.post(URL, {"message": "Сообщение", "recipient": ["+79990000001", "+79990000002"]})
+    assert response.status_code == 201
+    notification_id = response.data["notification_id"]
+    send_notification_task.delay(notification_id)
+
+    response = api_client.get(f"{URL}{notification_id}/")
+    assert response.data["status"] == "failed"
+    assert (response.data["sent_count"], response.data["failed_count"], response.data["pending_count"]) == (1, 1, 0)
+    assert channel.sent == Counter({"+79990000001": 1})
+    assert {(row.channel, row.status, row.deliveries) for row in DeliveryStats.objects.all()} == {
+        ("sms", "success", 1),
+        ("sms", "failed", 1),
+    }
+
+
+@pytest.mark.django_db
+def test_record_delivery_stats_accumulates_per_minute() -> None:
+    minute = timezone.now().replace(second=0, microsecond=0) - timedelta(minutes=10)
+    record_delivery_stats(
+        [
+            (minute + timedelta(seconds=5), "email", "success", 100),
+            (minute + timedelta(seconds=50), "email", "success", 300),
+            (minute + timedelta(minutes=1), "email", "failed", None),
+        ]
+    )
+    record_delivery_stats([(minute + timedelta(seconds=30), "email", "success", 200)])
+    rows = {(row.bucket, row.status): (row.deliveries, row.latency_sum_ms) for row in DeliveryStats.objects.all()}
+    assert rows == {
+        (minute, "success"): (3, 600),
+        (minute + timedelta(minutes=1), "failed"): (1, 0),
+    }
+    stats = get_delivery_stats(minute - timedelta(hours=1), minute + timedelta(hours=1), "minute", "email")
+    assert [bucket["total"] for bucket in stats["buckets"]] == [3, 1]
+
+
+@pytest.mark.django_db
+def test_stats_endpoint(api_client) -> None:
+    now = timezone.now()
+    record_delivery_stats(
+        [
+            (now - timedelta(minutes=5), "email", "success", 100),
+            (now - timedelta(minutes=5), "email", "success", 300),
+            (now - timedelta(minutes=5), "email", "failed", None),
+            (now - timedelta(minutes=4), "telegram", "skipped", None),
+            (now - timedelta(days=2), "email", "success", 100),
+        ]
+    )
+    response = api_client.get(STATS_URL, {"interval": "hour"})
+    assert response.status_code == 200
+    assert response.data["totals"] == {"success": 2, "failed": 1, "skipped": 1}
+    buckets = {bucket["channel"]: bucket for bucket in response.data["buckets"]}
+    assert buckets["email"]["total"] == 3
+    assert buckets["email"]["success_rate"] == pytest.approx(0.6667)
+    assert buckets["email"]["avg_latency_ms"] == 200
+    assert buckets["telegram"]["success_rate"] is None
+
+    response = api_client.get(STATS_URL, {"interval": "hour", "channel": "telegram"})
+    assert [bucket["channel"] for bucket in response.data["buckets"]] == ["telegram"]
+
+
+@pytest.mark.django_db
+def test_stats_endpoint_validates_period(api_client) -> None:
+    now = timezone.now()
+    response = api_client.get(STATS_URL, {"since": now.isoformat(), "until": (now - timedelta(hours=1)).isoformat()})
+    assert response.status_code == 400
+    assert "since" in response.data["details"]
+    response = api_client.get(STATS_URL, {"since": (now - timedelta(days=30)).isoformat(), "interval": "minute"})
+    assert response.status_code == 400
+    assert "interval" in response.data["details"]
+
+
+@pytest.mark.django_db
+def test_notification_counters_in_list(api_client) -> None:
+    notification = NotificationFactory(recipients_count=3, pending_count=3)
+    update_counters(notification.id, ["success", "failed"])
+    response = api_client.get(URL)
+    [item] = response.data["results"]
+    assert (item["sent_count"], item["failed_count"], item["pending_count"]) == (1, 1, 1)
+    assert Notification.objects.get().recipients_count == 3
@@ -0,0 +1,41 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from django.db.models import QuerySet
+
+from notify.models import SuppressedRecipient
+from notify.suppression import suppression_list
+
+
+@pytest.mark.django_db
+def test_split_uses_index_loaded_from_database() -> None:
+    SuppressedRecipient.objects.create(recipient_type="email", address="bounced@example.com", reason="550")
+    allowed, suppressed = suppression_list.split("email", ["user@example.com", "bounced@example.com"])
+    assert allowed == ["user@example.com"]
+    assert suppressed == ["bounced@example.com"]
+
+
+@pytest.mark.django_db
+def test_add_updates_database_and_index() -> None:
+    suppression_list.reload()
+    suppression_list.add([("sms", "+79990000001", "Номер не существует")])
+    assert SuppressedRecipient.objects.filter(recipient_type="sms", address="+79990000001").exists()
+    assert suppression_list.split("sms", ["+79990000001"]) == ([], ["+79990000001"])
+
+
+@pytest.mark.django_db
+def test_reload_keeps_addresses_added_during_rebuild(monkeypatch: pytest.MonkeyPatch, redis_client) -> None:
+    SuppressedRecipient.objects.create(recipient_type="email", address="old@example.com", reason="550")
+    iterator = QuerySet.iterator
+
+    def snapshot_then_add(self: QuerySet, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        rows = list(iterator(self, *args, **kwargs))
+        # Финализация уведомления добавляет адрес после чтения БД, до замены множеств
+        suppression_list.add([("email", "new@example.com", "550"), ("telegram", "42", "403")])
+        return iter(rows)
+
+    monkeypatch.setattr(QuerySet, "iterator", snapshot_then_add)
+    assert suppression_list.reload() == 1
+    assert redis_client.smembers("suppression:recipients:email") == {b"old@example.com", b"new@example.com"}
+    assert redis_client.smembers("suppression:recipients:telegram") == {b"42"}
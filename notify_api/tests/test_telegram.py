@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from notify.telegram import AsyncTelegramClient, TelegramDeliveryError
+
+
+def make_client(handler, max_throttle_retries: int = 3) -> AsyncTelegramClient:
+    return AsyncTelegramClient(
+        token="1:token",
+        api_url="https://api.telegram.test",
+        concurrency=5,
+        global_rate=1000,
+        per_chat_interval=0,
+        timeout=1,
+        max_throttle_retries=max_throttle_retries,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def error(code: int, description: str, **parameters) -> httpx.Response:
+    payload = {"ok": False, "error_code": code, "description": description}
+    if parameters:
+        payload["parameters"] = parameters
+    return httpx.Response(code, json=payload)
+
+
+def send(client: AsyncTelegramClient, chat_ids: list[str]) -> dict:
+    return asyncio.run(client.send_many(chat_ids, "<b>Текст</b>"))
+
+
+def test_send_message_request() -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    results = send(make_client(handler), ["1", "2"])
+    assert all(isinstance(result, int) for result in results.values())
+    assert {request.url.path for request in requests} == {"/bot1:token/sendMessage"}
+    assert sorted(json.loads(request.content)["chat_id"] for request in requests) == ["1", "2"]
+    assert json.loads(requests[0].content)["parse_mode"] == "HTML"
+
+
+def test_throttled_request_waits_retry_after() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return error(429, "Too Many Requests: retry after 1", retry_after=1)
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    results = send(make_client(handler), ["1"])
+    assert isinstance(results["1"], int)
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.9
+
+
+def test_throttle_pause_is_shared_by_chats() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((json.loads(request.content)["chat_id"], time.monotonic()))
+        if len(calls) == 1:
+            return error(429, "Too Many Requests: retry after 1", retry_after=1)
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    client = make_client(handler)
+
+    async def scenario() -> dict:
+        first = asyncio.ensure_future(client.send_many(["1"], "Текст"))
+        await asyncio.sleep(0.1)
+        second = await client.send_many(["2"], "Текст")
+        return {**(await first), **second}
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, int) for result in results.values())
+    throttled_at = calls[0][1]
+    assert all(sent_at - throttled_at >= 0.9 for _, sent_at in calls[1:])
+
+
+def test_throttle_retries_are_limited() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return error(429, "Too Many Requests: retry after 0", retry_after=0)
+
+    result = send(make_client(handler, max_throttle_retries=2), ["1"])["1"]
+    assert isinstance(result, TelegramDeliveryError)
+    assert result.retryable
+    assert not result.permanent
+    assert result.retry_after == 0
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        error(403, "Forbidden: bot was blocked by the user"),
+        error(400, "Bad Request: chat not found"),
+    ],
+)
+def test_permanent_errors(response) -> None:
+    result = send(make_client(lambda request: response), ["1"])["1"]
+    assert isinstance(result, TelegramDeliveryError)
+    assert result.permanent
+    assert not result.retryable
+
+
+@pytest.mark.parametrize(
+    "response, retryable",
+    [
+        (error(400, "Bad Request: can't parse entities"), False),
+        (error(502, "Bad Gateway"), True),
+        (httpx.Response(502, text="<html>Bad Gateway</html>"), True),
+    ],
+)
+def test_other_errors(response, retryable) -> None:
+    result = send(make_client(lambda request: response), ["1"])["1"]
+    assert isinstance(result, TelegramDeliveryError)
+    assert not result.permanent
+    assert result.retryable is retryable
+
+
+def test_connection_error_is_retryable() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    result = send(make_client(handler), ["1"])["1"]
+    assert isinstance(result, TelegramDeliveryError)
+    assert result.retryable
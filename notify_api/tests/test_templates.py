@@ -0,0 +1,40 @@
+import pytest
+
+from notify.models import MessageTemplate, Recipient
+
+URL = "/api/notify/"
+
+
+@pytest.fixture
+def template() -> MessageTemplate:
+    return MessageTemplate.objects.create(name="welcome", body="Здравствуйте, {{ name }}")
+
+
+@pytest.mark.django_db
+def test_recipient_context_keys_are_normalized(api_client, template) -> None:
+    response = api_client.post(
+        URL,
+        {
+            "template": template.name,
+            "recipient": ["anna@Example.COM", "0123456789"],
+            "recipient_context": {"anna@EXAMPLE.com": {"name": "Анна"}, " 123456789": {"name": "Иван"}},
+        },
+    )
+    assert response.status_code == 201
+    contexts = dict(Recipient.objects.values_list("address", "context"))
+    assert contexts == {"anna@example.com": {"name": "Анна"}, "123456789": {"name": "Иван"}}
+
+
+@pytest.mark.django_db
+def test_recipient_context_unknown_address(api_client, template) -> None:
+    response = api_client.post(
+        URL,
+        {
+            "template": template.name,
+            "recipient": ["anna@example.com"],
+            "recipient_context": {"ivan@example.com": {"name": "Иван"}, "not an address": {}},
+        },
+    )
+    assert response.status_code == 400
+    assert "ivan@example.com" in str(response.data)
+    assert "not an address" in str(response.data)